@@ -0,0 +1,214 @@
+import argparse
+import hashlib
+import numpy as np
+from pathlib import Path
+from time import perf_counter
+from ever_crisis_gacha_simulator.classes.compiled_banner import CompiledBanner
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+from ever_crisis_gacha_simulator.constants import *
+from ever_crisis_gacha_simulator.exact_solver import exact_parts_distributions
+
+
+# The atlas shipped with the package, built by `python -m ever_crisis_gacha_simulator.atlas`
+ATLAS_PATH = Path(__file__).parent / "data" / "answer_atlas.npz"
+
+ATLAS_BANNERS = [
+    ZACK_FF9_CROSSOVER_BANNER,
+    AERITH_LUCIA_EASTER_BANNER,
+    CLOUD_GLENN_LIMIT_BREAK_BANNER,
+    ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+]
+ATLAS_TARGET_WEAPON_TYPES = ["featured", "wishlisted"]
+ATLAS_MAX_OVERBOOST = 10
+ATLAS_MAX_CRYSTALS = 300_000
+
+# Loaded atlases, keyed by path, so each file is read once per process
+_loaded_atlases = {}
+
+
+def generate_banner_hash(banner_info):
+    """
+    Hash a banner's rates and stamp cards, so an atlas only answers for the exact banner it was built from.
+    """
+
+    return hashlib.sha256(repr(banner_info).encode()).hexdigest()
+
+
+def build_atlas(
+    path=ATLAS_PATH,
+    banners=ATLAS_BANNERS,
+    target_weapon_types=ATLAS_TARGET_WEAPON_TYPES,
+    max_overboost=ATLAS_MAX_OVERBOOST,
+    max_crystals=ATLAS_MAX_CRYSTALS,
+):
+    """
+    Compute the exact probability of reaching every overboost level from 0 to `max_overboost` with every
+    budget from 0 to `max_crystals` crystals (in steps of one ten draw), for every banner and target weapon
+    type, starting from 0 weapon parts, and save them to one compressed NumPy file. One exact solver run per
+    banner and target weapon type (see `exact_solver.exact_parts_distributions`) covers the whole grid of
+    overboost levels and budgets, as its weapon parts are capped at the highest overboost level.
+
+    Args:
+        path (str): File to save the atlas to. Default value of `ATLAS_PATH`.
+        banners (list): Banner info dicts. Default value of `ATLAS_BANNERS`.
+        target_weapon_types (list): Target weapon types. Default value of ['featured', 'wishlisted'].
+        max_overboost (int): Highest overboost level. Default value of 10.
+        max_crystals (int): Largest budget. Default value of 300,000.
+
+    Returns:
+        dict: The atlas's arrays, as `load_atlas` returns them.
+    """
+
+    num_ten_draws = max_crystals // TEN_DRAW_CRYSTAL_COST
+    overboost_levels = np.arange(max_overboost + 1)
+    required_weapon_parts = (overboost_levels + 1) * WEAPON_PARTS_PER_OVERBOOST
+
+    probabilities = np.zeros(
+        (len(banners), len(target_weapon_types), num_ten_draws + 1, max_overboost + 1)
+    )
+    for banner_index, banner_info in enumerate(banners):
+        for target_index, target_weapon_type in enumerate(target_weapon_types):
+            distributions = exact_parts_distributions(
+                CompiledBanner(banner_info, target_weapon_type),
+                num_ten_draws,
+                required_weapon_parts[-1],
+            )
+            # P(parts >= k) for every k, from the upper tail of each distribution
+            tails = np.cumsum(distributions[:, ::-1], axis=1)[:, ::-1]
+            probabilities[banner_index, target_index] = np.clip(tails[:, required_weapon_parts], 0, 1)
+
+    atlas = {
+        "banner_names": np.array([banner_info["metadata"]["name"] for banner_info in banners]),
+        "banner_hashes": np.array([generate_banner_hash(banner_info) for banner_info in banners]),
+        "target_weapon_types": np.array(target_weapon_types),
+        "probabilities": probabilities,
+    }
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, **atlas)
+
+    return atlas
+
+
+def load_atlas(path=ATLAS_PATH):
+    """
+    Load an atlas file the first time it is needed, and keep it for later lookups.
+
+    Returns:
+        dict: The atlas's `probabilities` array, of shape (banner, target weapon type, ten draws, overboost
+            level), and `banners` and `target_weapon_types` dicts mapping names to their indices along the
+            first two axes, with `banner_hashes` by banner name. None when the file does not exist.
+    """
+
+    path = str(path)
+    if path not in _loaded_atlases:
+        if not Path(path).exists():
+            return None
+
+        with np.load(path) as arrays:
+            banner_names = arrays["banner_names"].tolist()
+            _loaded_atlases[path] = {
+                "probabilities": arrays["probabilities"],
+                "banners": {name: index for index, name in enumerate(banner_names)},
+                "banner_hashes": dict(zip(banner_names, arrays["banner_hashes"].tolist())),
+                "target_weapon_types": {
+                    target_weapon_type: index
+                    for index, target_weapon_type in enumerate(arrays["target_weapon_types"].tolist())
+                },
+            }
+
+    return _loaded_atlases[path]
+
+
+def atlas_probability(banner_name, target_weapon_type, overboost, crystals, path=ATLAS_PATH):
+    """
+    Look up the exact probability of reaching `overboost` within `crystals` crystals (rounded down to whole
+    ten draws), starting from 0 weapon parts.
+
+    Returns:
+        float: The probability, between 0 and 1, or None when the atlas does not cover the question.
+    """
+
+    atlas = load_atlas(path)
+    if atlas is None:
+        return None
+
+    banner_index = atlas["banners"].get(banner_name)
+    target_index = atlas["target_weapon_types"].get(target_weapon_type)
+    num_ten_draws = crystals // TEN_DRAW_CRYSTAL_COST
+    probabilities = atlas["probabilities"]
+
+    if (
+        banner_index is None
+        or target_index is None
+        or not 0 <= overboost < probabilities.shape[3]
+        or not 0 <= num_ten_draws < probabilities.shape[2]
+    ):
+        return None
+
+    return float(probabilities[banner_index, target_index, num_ten_draws, overboost])
+
+
+def atlas_answer(metadata, value, path=ATLAS_PATH):
+    """
+    Answer a `GachaSim.success_probability` question from the atlas: the probability of reaching OB `value`
+    for a 'crystals_spent' configuration, or of reaching its overboost level within `value` crystals for an
+    'overboost' configuration.
+
+    Args:
+        metadata (dict): The `metadata` of a `GachaSim`.
+        value (int): The overboost level or crystal budget.
+        path (str): The atlas file. Default value of `ATLAS_PATH`.
+
+    Returns:
+        float: The probability, between 0 and 1, or None when the atlas does not cover the configuration
+            (another banner or a changed one, starting weapon parts, a crystal cap, or the 'stamps_earned'
+            criterion).
+    """
+
+    if (
+        metadata["starting_weapon_parts"] != 0
+        or metadata.get("max_crystals_spent") is not None
+        or metadata["session_criterion"] == "stamps_earned"
+    ):
+        return None
+
+    atlas = load_atlas(path)
+    banner_name = metadata["banner_info"]["metadata"]["name"]
+    if atlas is None or atlas["banner_hashes"].get(banner_name) != generate_banner_hash(metadata["banner_info"]):
+        return None
+
+    if metadata["session_criterion"] == "crystals_spent":
+        overboost, crystals = value, metadata["criterion_value"]
+    else:
+        overboost, crystals = metadata["criterion_value"], value
+
+    return atlas_probability(banner_name, metadata["target_weapon_type"], overboost, crystals, path=path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build the answer atlas of exact overboost probabilities for every banner and budget."
+    )
+    parser.add_argument("--path", default=str(ATLAS_PATH))
+    parser.add_argument("--max-overboost", type=int, default=ATLAS_MAX_OVERBOOST)
+    parser.add_argument("--max-crystals", type=int, default=ATLAS_MAX_CRYSTALS)
+
+    arguments = parser.parse_args(argv)
+
+    start_time = perf_counter()
+    atlas = build_atlas(
+        path=arguments.path,
+        max_overboost=arguments.max_overboost,
+        max_crystals=arguments.max_crystals,
+    )
+    print(
+        f"Built {atlas['probabilities'].size:,} probabilities in {perf_counter() - start_time:.1f} seconds: "
+        f"{arguments.path} ({Path(arguments.path).stat().st_size:,} bytes)"
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
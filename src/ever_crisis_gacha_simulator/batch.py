@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.classes.compiled_banner import CompiledBanner, SESSION_DATA_COLUMNS
+from ever_crisis_gacha_simulator.executors import generate_executor
+from ever_crisis_gacha_simulator.progress import iterate_chunks
+from ever_crisis_gacha_simulator.sampling import validate_sampling
+from ever_crisis_gacha_simulator.scheduling import estimate_session_cost
+from ever_crisis_gacha_simulator.session_kernels import generate_session_key, simulate_sessions
+from time import perf_counter
+
+
+def run_many(
+    configs,
+    n_jobs=2,
+    engine="numpy",
+    sampling="plain",
+    progress=True,
+    executor="joblib",
+):
+    """
+    Run many `GachaSim` configurations on one shared pool of workers, rather than one after another. The
+    chunks of every configuration are submitted together, the most expensive first (by `estimate_session_cost`
+    times their number of sessions), so the long chunks of e.g. 'overboost' targets on wishlisted weapons
+    start straight away and the cheap chunks fill in the remaining workers at the end, without the idle tail
+    of each sequential run. Each configuration's `GachaSim` is yielded as soon as its last chunk finishes.
+
+    Every configuration's sessions are the same as its own `GachaSim.run_sims` would give for its seed value,
+    engine and sampling mode.
+
+    Args:
+        configs (dict): Configuration names mapped to the `GachaSim` arguments of each configuration
+            (session_criterion, criterion_value, target_weapon_type, banner_info, and optionally seed_value,
+            starting_weapon_parts and num_simulations).
+        n_jobs (int): Number of CPU cores to utilize for simulations. Default value of 2.
+        engine (str): One of 'numpy', 'jit', or 'multinomial'. Default value of 'numpy'.
+        sampling (str): One of 'plain', 'antithetic', 'stratified', or 'sobol'. Default value of 'plain'.
+        progress: Progress bar or callbacks over the chunks of every configuration, as in `GachaSim.run_sims`.
+            Default value of True.
+        executor: Executor backend, as in `GachaSim.run_sims`. Default value of 'joblib'.
+
+    Yields:
+        tuple: A configuration's name and its `GachaSim` with results, in the order they finish. Each
+            `run_seconds` is the time from the start of the batch until the configuration finished.
+    """
+
+    if engine not in ["numpy", "jit", "multinomial"]:
+        raise ValueError(
+            "`engine` must be a str of either 'numpy', 'jit', or 'multinomial'. Provided: ",
+            engine,
+        )
+
+    validate_sampling(sampling, engine)
+
+    start_time = perf_counter()
+    executor = generate_executor(executor, n_jobs=n_jobs)
+
+    gacha_sims = {name: GachaSim(**config) for name, config in configs.items()}
+
+    # Configurations on the same banner and target weapon type share one compiled banner
+    compiled_banners = {}
+    chunks = []
+    for name, gacha_sim in gacha_sims.items():
+        metadata = gacha_sim.metadata
+        banner_key = (id(metadata["banner_info"]), metadata["target_weapon_type"])
+        if banner_key not in compiled_banners:
+            compiled_banners[banner_key] = CompiledBanner(
+                banner_info=metadata["banner_info"],
+                target_weapon_type=metadata["target_weapon_type"],
+            )
+            if engine == "multinomial":
+                compiled_banners[banner_key].generate_ten_draw_tables()
+        compiled_banner = compiled_banners[banner_key]
+
+        session_cost = estimate_session_cost(
+            compiled_banner,
+            metadata["session_criterion"],
+            metadata["criterion_value"],
+            starting_weapon_parts=metadata["starting_weapon_parts"],
+            max_crystals_spent=metadata["max_crystals_spent"],
+        )
+        key, _ = generate_session_key(metadata["seed_value"])
+        gacha_sim.session_stream = {"key": key, "engine": engine, "sampling": sampling}
+
+        for chunk_start, chunk_stop in gacha_sim.scheduled_chunk_bounds(compiled_banner, executor.num_workers):
+            chunks.append(
+                {
+                    "name": name,
+                    "cost": session_cost * (chunk_stop - chunk_start),
+                    "kwargs": {
+                        "compiled_banner": compiled_banner,
+                        "session_criterion": metadata["session_criterion"],
+                        "criterion_value": metadata["criterion_value"],
+                        "starting_weapon_parts": metadata["starting_weapon_parts"],
+                        "session_start": chunk_start,
+                        "session_stop": chunk_stop,
+                        "key": key,
+                        "engine": engine,
+                        "sampling": sampling,
+                        "max_crystals_spent": metadata["max_crystals_spent"],
+                    },
+                }
+            )
+
+    # Longest chunks first; the sort is stable, so ties keep the order of `configs`
+    chunks.sort(key=lambda chunk: -chunk["cost"])
+
+    pending_chunks = {name: 0 for name in gacha_sims}
+    for chunk in chunks:
+        pending_chunks[chunk["name"]] += 1
+    finished_chunks = {name: [] for name in gacha_sims}
+
+    # Configurations without sessions have nothing to wait for
+    for name in [name for name, count in pending_chunks.items() if count == 0]:
+        yield name, finish_gacha_sim(gacha_sims[name], [], sampling, perf_counter() - start_time)
+
+    for chunk_index, result in iterate_chunks(
+        simulate_sessions,
+        [chunk["kwargs"] for chunk in chunks],
+        [chunk["kwargs"]["session_stop"] - chunk["kwargs"]["session_start"] for chunk in chunks],
+        n_jobs=n_jobs,
+        progress=progress,
+        executor=executor,
+    ):
+        name = chunks[chunk_index]["name"]
+        finished_chunks[name].append((chunks[chunk_index]["kwargs"]["session_start"], result))
+        pending_chunks[name] -= 1
+
+        if pending_chunks[name] == 0:
+            yield name, finish_gacha_sim(
+                gacha_sims[name],
+                [result for _, result in sorted(finished_chunks.pop(name), key=lambda chunk: chunk[0])],
+                sampling,
+                perf_counter() - start_time,
+            )
+
+
+def finish_gacha_sim(gacha_sim, chunk_results, sampling, seconds):
+    """
+    Store the session chunks of a `run_many` configuration, in session order, as its results.
+    """
+
+    gacha_sim.sim_results = pd.DataFrame(
+        np.concatenate(chunk_results)
+        if chunk_results
+        else np.zeros((0, len(SESSION_DATA_COLUMNS)), dtype=np.int64),
+        columns=SESSION_DATA_COLUMNS,
+    )
+    gacha_sim.run_seconds = seconds
+    if sampling != "plain":
+        gacha_sim.sampling_report = gacha_sim.generate_sampling_report(sampling=sampling, seconds=seconds)
+
+    return gacha_sim
@@ -0,0 +1,198 @@
+import numpy as np
+from ever_crisis_gacha_simulator.classes.compiled_banner import CompiledBanner
+from ever_crisis_gacha_simulator.exact_solver import exact_parts_distributions
+from ever_crisis_gacha_simulator.constants import *
+
+
+OBJECTIVES = ["expected_utility", "all_goals"]
+
+
+def generate_goal_curve(
+    banner_info,
+    overboost_target,
+    num_ten_draws,
+    target_weapon_type="featured",
+    starting_weapon_parts=0,
+):
+    """
+    Budget-to-outcome curve of one banner: the exact probability of reaching `overboost_target` on the targeted
+    weapon after spending 0, 3,000, ..., `num_ten_draws` * 3,000 crystals on the banner.
+
+    Returns:
+        numpy.ndarray: Goal probability for each number of ten draws, of length num_ten_draws + 1.
+    """
+
+    compiled_banner = CompiledBanner(
+        banner_info=banner_info,
+        target_weapon_type=target_weapon_type,
+    )
+    distributions = exact_parts_distributions(
+        compiled_banner,
+        num_ten_draws,
+        (overboost_target + 1) * WEAPON_PARTS_PER_OVERBOOST,
+        starting_weapon_parts=starting_weapon_parts,
+    )
+
+    return distributions[:, -1]
+
+
+def simulated_goal_curve(num_crystals_spent, num_ten_draws, censored=None):
+    """
+    Budget-to-outcome curve estimated from the `num_crystals_spent` column of an 'overboost' simulation. A
+    session stops as soon as it reaches its goal, so it reaches the goal within a budget exactly when it spent
+    no more than that budget, unless it was censored by a crystal cap and never reached it.
+
+    Args:
+        num_crystals_spent (numpy.ndarray): Crystals spent by each session.
+        num_ten_draws (int): Largest number of ten draws on the curve.
+        censored (numpy.ndarray): Boolean mask of the sessions censored by a crystal cap (see
+            `GachaSim.censored_sessions`). Default value of None (no censored sessions).
+
+    Returns:
+        numpy.ndarray: Estimated goal probability for each number of ten draws, of length num_ten_draws + 1.
+    """
+
+    ten_draws_spent = np.asarray(num_crystals_spent) // TEN_DRAW_CRYSTAL_COST
+    if censored is not None:
+        ten_draws_spent = np.where(np.asarray(censored), num_ten_draws + 1, ten_draws_spent)
+    counts = np.bincount(np.minimum(ten_draws_spent, num_ten_draws + 1), minlength=num_ten_draws + 2)
+
+    return np.cumsum(counts)[: num_ten_draws + 1] / len(ten_draws_spent)
+
+
+def evaluate_allocation(goal_curves, ten_draws, weights=None):
+    """
+    Evaluate one allocation of ten draws across banners from their goal curves. Banners are drawn on
+    independently, so the probability of meeting every goal is the product of the banners' goal probabilities.
+
+    Args:
+        goal_curves (list): One goal curve per banner (see `generate_goal_curve`).
+        ten_draws (list): Number of ten draws to spend on each banner.
+        weights (list): Utility of meeting each banner's goal. Default value of None (all 1).
+
+    Returns:
+        dict: The `goal_probabilities` of each banner, the `expected_utility` (the weighted sum of the goal
+            probabilities), and the `probability_all_goals`.
+    """
+
+    weights = np.ones(len(goal_curves)) if weights is None else np.asarray(weights, dtype=float)
+    goal_probabilities = np.array(
+        [goal_curve[num_ten_draws] for goal_curve, num_ten_draws in zip(goal_curves, ten_draws)]
+    )
+
+    return {
+        "goal_probabilities": goal_probabilities,
+        "expected_utility": float(weights @ goal_probabilities),
+        "probability_all_goals": float(goal_probabilities.prod()),
+    }
+
+
+def optimize_ten_draw_allocation(goal_curves, num_ten_draws, weights=None, objective="expected_utility"):
+    """
+    Find the allocation of at most `num_ten_draws` ten draws across banners that maximizes the objective, by
+    dynamic programming over banners. Each step combines the best allocations of the banners so far with every
+    split of the budget to the next banner, so all allocations are compared without listing them one by one.
+
+    Args:
+        goal_curves (list): One goal curve per banner, each with at least num_ten_draws + 1 values.
+        num_ten_draws (int): Total ten draws available.
+        weights (list): Utility of meeting each banner's goal, used by the 'expected_utility' objective.
+            Default value of None (all 1).
+        objective (str): One of 'expected_utility' (maximize the weighted sum of goal probabilities) or
+            'all_goals' (maximize the probability of meeting every goal).
+
+    Returns:
+        numpy.ndarray: Number of ten draws to spend on each banner.
+    """
+
+    if objective not in OBJECTIVES:
+        raise ValueError(
+            "`objective` must be a str of either 'expected_utility' or 'all_goals'. Provided: ", objective
+        )
+
+    if any(len(goal_curve) < num_ten_draws + 1 for goal_curve in goal_curves):
+        raise ValueError(
+            "Every goal curve needs a value for each budget up to `num_ten_draws`. Provided: ", num_ten_draws
+        )
+
+    weights = np.ones(len(goal_curves)) if weights is None else np.asarray(weights, dtype=float)
+    budgets = np.arange(num_ten_draws + 1)
+
+    # splits[t, s]: spend s of the first t ten draws on the next banner and t - s on the banners before it
+    valid_splits = budgets[None, :] <= budgets[:, None]
+    previous_budgets = np.where(valid_splits, budgets[:, None] - budgets[None, :], 0)
+
+    best_values = np.zeros(num_ten_draws + 1)
+    best_splits = []
+
+    for goal_curve, weight in zip(goal_curves, weights):
+        goal_curve = np.asarray(goal_curve[: num_ten_draws + 1], dtype=float)
+        if objective == "expected_utility":
+            banner_values = weight * goal_curve
+        else:
+            # Sums of log probabilities, so the best sum is the best product
+            with np.errstate(divide="ignore"):
+                banner_values = np.log(goal_curve)
+
+        split_values = np.where(
+            valid_splits, best_values[previous_budgets] + banner_values[None, :], -np.inf
+        )
+        best_split = split_values.argmax(axis=1)
+        best_values = split_values[budgets, best_split]
+        best_splits.append(best_split)
+
+    # Walk back from the full budget to recover each banner's share
+    allocation = np.zeros(len(goal_curves), dtype=np.int64)
+    remaining = num_ten_draws
+    for banner_index in reversed(range(len(goal_curves))):
+        allocation[banner_index] = best_splits[banner_index][remaining]
+        remaining -= allocation[banner_index]
+
+    return allocation
+
+
+def optimize_budget_allocation(goals, crystal_budget, objective="expected_utility"):
+    """
+    Decide how many crystals to spend on each upcoming banner to maximize the expected utility of the goals
+    met, or the probability of meeting all of them. Each banner's budget-to-outcome curve is computed once
+    from its exact weapon parts distribution, and allocations are then compared from the curves alone.
+
+    Args:
+        goals (list): One dict per banner, with keys:
+            banner_info (dict): Banner information (see `banner_info_and_stamp_cards`).
+            overboost_target (int): The targeted weapon's overboost goal.
+            weight (float): Utility of meeting the goal. Optional, default value of 1.
+            target_weapon_type (str): One of 'featured' or 'wishlisted'. Optional, default value of 'featured'.
+            starting_weapon_parts (int): Weapon parts already held. Optional, default value of 0.
+        crystal_budget (int): Crystals available. Only whole ten draws (3,000 crystals) are spent.
+        objective (str): One of 'expected_utility' or 'all_goals'. Default value of 'expected_utility'.
+
+    Returns:
+        dict: The `crystals` to spend on each banner, plus the `goal_probabilities`, `expected_utility`, and
+            `probability_all_goals` of that allocation (see `evaluate_allocation`).
+    """
+
+    if crystal_budget < 0:
+        raise ValueError("`crystal_budget` must not be negative. Provided: ", crystal_budget)
+
+    num_ten_draws = crystal_budget // TEN_DRAW_CRYSTAL_COST
+    goal_curves = [
+        generate_goal_curve(
+            goal["banner_info"],
+            goal["overboost_target"],
+            num_ten_draws,
+            target_weapon_type=goal.get("target_weapon_type", "featured"),
+            starting_weapon_parts=goal.get("starting_weapon_parts", 0),
+        )
+        for goal in goals
+    ]
+    weights = [goal.get("weight", 1) for goal in goals]
+
+    allocation = optimize_ten_draw_allocation(
+        goal_curves, num_ten_draws, weights=weights, objective=objective
+    )
+
+    return {
+        "crystals": allocation * TEN_DRAW_CRYSTAL_COST,
+        **evaluate_allocation(goal_curves, allocation, weights=weights),
+    }
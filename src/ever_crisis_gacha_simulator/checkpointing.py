@@ -0,0 +1,106 @@
+import json
+import os
+import numpy as np
+from pathlib import Path
+from ever_crisis_gacha_simulator.session_kernels import (
+    generate_session_key,
+    simulate_sessions,
+)
+from ever_crisis_gacha_simulator.sharding import generate_config_hash
+
+
+MANIFEST_FILE_NAME = "manifest.json"
+
+
+def block_path(checkpoint_dir, session_start, session_stop):
+    """
+    Path of the checkpoint file holding sessions [session_start, session_stop). The session range is also the
+    block's position in the run's random stream, so a block can be recomputed or skipped on its own.
+    """
+
+    return Path(checkpoint_dir) / f"block_{session_start:012d}_{session_stop:012d}.npy"
+
+
+def prepare_checkpoint_dir(checkpoint_dir, metadata, sampling="plain", engine="numpy", resume=False):
+    """
+    Prepare a checkpoint directory for a run and return the session key the run must use.
+
+    When resuming, the run's seed stream is taken from the directory's manifest, so unseeded runs continue
+    with the same random numbers they started with, and a manifest from a different configuration raises an
+    error. Without resuming, any blocks from an earlier run in the directory are removed.
+
+    Returns:
+        int: The session key for the run.
+    """
+
+    checkpoint_dir = Path(checkpoint_dir)
+    manifest_path = checkpoint_dir / MANIFEST_FILE_NAME
+
+    if resume and manifest_path.exists():
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+
+        seed_value = metadata["seed_value"]
+        if seed_value is None:
+            seed_value = manifest["entropy"]
+        key, _ = generate_session_key(seed_value)
+
+        if generate_config_hash(metadata, key, sampling=sampling, engine=engine) != manifest["config_hash"]:
+            raise ValueError(
+                "The checkpoint directory holds a run with a different configuration. Provided: ",
+                str(checkpoint_dir),
+            )
+
+        return key
+
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    for stale_block in checkpoint_dir.glob("block_*.npy"):
+        stale_block.unlink()
+
+    key, entropy = generate_session_key(metadata["seed_value"])
+    manifest = {
+        "config_hash": generate_config_hash(metadata, key, sampling=sampling, engine=engine),
+        "entropy": entropy,
+        "sampling": sampling,
+        "engine": engine,
+    }
+
+    temporary_path = manifest_path.with_suffix(".tmp")
+    with open(temporary_path, "w") as file:
+        json.dump(manifest, file, indent=4)
+    os.replace(temporary_path, manifest_path)
+
+    return key
+
+
+def completed_blocks(checkpoint_dir, chunk_bounds):
+    """
+    Return the subset of `chunk_bounds` whose blocks are already saved in the checkpoint directory.
+    """
+
+    return [
+        (session_start, session_stop)
+        for session_start, session_stop in chunk_bounds
+        if block_path(checkpoint_dir, session_start, session_stop).exists()
+    ]
+
+
+def simulate_checkpointed_sessions(checkpoint_dir, session_start, session_stop, **kwargs):
+    """
+    Run `simulate_sessions` for one block of sessions and save the block as soon as it finishes. The block is
+    written to a temporary file first, so an interrupted write never leaves a corrupt block behind.
+    """
+
+    data = simulate_sessions(session_start=session_start, session_stop=session_stop, **kwargs)
+
+    path = block_path(checkpoint_dir, session_start, session_stop)
+    temporary_path = path.with_suffix(".tmp")
+    with open(temporary_path, "wb") as file:
+        np.save(file, data)
+    os.replace(temporary_path, path)
+
+    return data
+
+
+def load_block(checkpoint_dir, session_start, session_stop):
+    return np.load(block_path(checkpoint_dir, session_start, session_stop))
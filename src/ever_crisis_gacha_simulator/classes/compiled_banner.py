@@ -0,0 +1,488 @@
+import numpy as np
+from decimal import Decimal, getcontext
+from .crystal_pull_session import generate_target_probabilities
+from ever_crisis_gacha_simulator.constants import *
+from ever_crisis_gacha_simulator.stamp_rules import compile_rule_probabilities, validate_rule_specs
+
+
+getcontext().prec = 16  # Set Decimal to continue to a max of 16 decimal places
+
+
+# Order matches the pull outcome columns of `CrystalPullSession.data`
+OUTCOME_NAMES = [
+    "targeted_five_star",
+    "targeted_four_star",
+    "targeted_three_star",
+    "nontargeted_featured_five_star",
+    "nontargeted_featured_four_star",
+    "nontargeted_featured_three_star",
+    "nontargeted_five_star",
+    "nontargeted_four_star",
+    "nontargeted_three_star",
+]
+
+SESSION_DATA_COLUMNS = [
+    "targeted_weapon_parts",
+    "total_stamps_earned",
+    "num_crystals_spent",
+] + [outcome + "s_drawn" for outcome in OUTCOME_NAMES]
+
+
+class CompiledBanner:
+    """
+    Class holding the numeric rate, stamp and stamp card tables for one banner and target weapon type.
+    The tables mirror the behavior of `CrystalPullSession` and `TenDraw`, and are what the fast session
+    engines consume instead of the string-based classes.
+    """
+
+    def __init__(self, banner_info, target_weapon_type):
+
+        if target_weapon_type not in ["featured", "wishlisted"]:
+            raise ValueError(
+                "`target_weapon_type` must be a str of either 'featured' or 'wishlisted'. Provided: ",
+                target_weapon_type,
+            )
+
+        self.banner_name = banner_info["metadata"]["name"]
+        self.target_weapon_type = target_weapon_type
+        self.num_featured_weapons = len(banner_info["metadata"]["weapons"])
+
+        self.target_weapon_rates_dict = generate_target_probabilities(
+            num_featured_weapons=self.num_featured_weapons,
+            target_weapon_type=self.target_weapon_type,
+            non_featured_five_star_percent_rate=banner_info["metadata"][
+                "non_featured_five_star_percent_rate"
+            ],
+        )
+
+        self.weapon_parts_per_outcome = np.array(
+            [200, 10, 1, 0, 0, 0, 0, 0, 0], dtype=np.int64
+        )
+
+        # Outcome probabilities for a standard draw, followed by one row per stamp card rule
+        self.standard_probabilities = self.outcome_probabilities(0, 1)
+        self.rule_probabilities = np.array(
+            [self.rule_outcome_probabilities(rule) for rule in STAMP_CARD_RULES]
+        )
+        self.slot_cdfs = generate_cdfs(
+            np.vstack([self.rule_probabilities, self.standard_probabilities])
+        )
+
+        self.stamp_value_lookup = generate_stamp_value_lookup()
+        self.stamp_values, self.stamp_probabilities = generate_stamp_probabilities()
+
+        self.stamp_card_names = list(banner_info["stamp_cards_list"].keys())
+        self.num_stamp_cards = len(self.stamp_card_names)
+        self.card_rule_prefix = generate_card_rule_prefix(
+            banner_info["stamp_cards_list"]
+        )
+
+        # Joint outcome count distributions of whole ten draws, built on demand by `generate_ten_draw_tables()`
+        self.ten_draw_tables = None
+
+    def outcome_intervals(self, guaranteed_four_star=False):
+        """
+        Return the [low, high) interval of the unit range that `TenDraw.determine_pull_result()` maps to each outcome.
+        """
+
+        rates = self.target_weapon_rates_dict
+        five_star = OVERALL_RARITY_RATES_DICT["five_star"]
+        four_star = OVERALL_RARITY_RATES_DICT["four_star"]
+        two_featured = (
+            self.num_featured_weapons == 2 and self.target_weapon_type == "featured"
+        )
+        featured_copies = 2 if two_featured else 1
+
+        intervals = {outcome: [] for outcome in OUTCOME_NAMES}
+
+        intervals["targeted_five_star"].append((Decimal(0), rates["five_star"]))
+        if two_featured:
+            intervals["nontargeted_featured_five_star"].append(
+                (rates["five_star"], 2 * rates["five_star"])
+            )
+        intervals["nontargeted_five_star"].append(
+            (featured_copies * rates["five_star"], five_star)
+        )
+
+        four_star_rate = (
+            rates["guaranteed_four_star"] if guaranteed_four_star else rates["four_star"]
+        )
+        four_star_end = Decimal(1) if guaranteed_four_star else five_star + four_star
+
+        intervals["targeted_four_star"].append((five_star, five_star + four_star_rate))
+        if two_featured:
+            intervals["nontargeted_featured_four_star"].append(
+                (five_star + four_star_rate, five_star + 2 * four_star_rate)
+            )
+        intervals["nontargeted_four_star"].append(
+            (five_star + featured_copies * four_star_rate, four_star_end)
+        )
+
+        if not guaranteed_four_star:
+            three_star_start = five_star + four_star
+            intervals["targeted_three_star"].append(
+                (three_star_start, three_star_start + rates["three_star"])
+            )
+            if two_featured:
+                intervals["nontargeted_featured_three_star"].append(
+                    (
+                        three_star_start + rates["three_star"],
+                        three_star_start + 2 * rates["three_star"],
+                    )
+                )
+            intervals["nontargeted_three_star"].append(
+                (
+                    three_star_start + featured_copies * rates["three_star"],
+                    Decimal(1),
+                )
+            )
+
+        return intervals
+
+    def outcome_probabilities(self, low, high, guaranteed_four_star=False):
+        """
+        Return the probability of each outcome when a draw's float is uniform on [low, high).
+        """
+
+        low = Decimal(str(low))
+        high = Decimal(str(high))
+        intervals = self.outcome_intervals(guaranteed_four_star=guaranteed_four_star)
+
+        probabilities = []
+        for outcome in OUTCOME_NAMES:
+            overlap = sum(
+                (
+                    max(Decimal(0), min(high, end) - max(low, start))
+                    for start, end in intervals[outcome]
+                ),
+                Decimal(0),
+            )
+            probabilities.append(float(overlap / (high - low)))
+
+        return np.array(probabilities)
+
+    def rule_outcome_probabilities(self, rule):
+        """
+        Return the outcome probabilities for a draw made under a stamp card rule, compiled from its declarative
+        spec in `STAMP_CARD_RULE_SPECS`.
+        """
+
+        if rule not in STAMP_CARD_RULE_SPECS:
+            raise ValueError("Unsupported stamp card rule. Provided: ", rule)
+
+        validate_rule_specs({rule: STAMP_CARD_RULE_SPECS[rule]})
+
+        return compile_rule_probabilities(
+            STAMP_CARD_RULE_SPECS[rule],
+            OUTCOME_NAMES,
+            self.standard_probabilities,
+            target_weapon_type=self.target_weapon_type,
+            num_featured_weapons=self.num_featured_weapons,
+        )
+
+    def importance_proposal(self, five_star_tilt=1.0, stamp_tilt=0.0):
+        """
+        Generate tilted sampling tables for importance sampling, along with the log likelihood ratios
+        (nominal over tilted) needed to weight each sampled outcome back to the banner's true rates.
+
+        Args:
+            five_star_tilt (float): Multiplier on the odds of drawing the targeted 5* weapon in every draw
+                where it is possible but not certain. Values above 1 push sessions toward high weapon parts.
+            stamp_tilt (float): Exponential tilt on the stamp values, so each stamp value's probability is
+                multiplied by exp(stamp_tilt * stamp value) and renormalized. Positive values complete stamp
+                cards (and their guaranteed draws) faster.
+
+        Returns:
+            dict: Tilted `slot_cdfs` and `stamp_cdf`, plus `slot_log_likelihood_ratios` and
+                `stamp_log_likelihood_ratios` aligned with them.
+        """
+
+        if five_star_tilt <= 0:
+            raise ValueError(
+                "`five_star_tilt` must be a positive number. Provided: ", five_star_tilt
+            )
+
+        slot_probabilities = np.vstack(
+            [self.rule_probabilities, self.standard_probabilities]
+        )
+        targeted_five_star = slot_probabilities[:, :1]
+        odds_normalizer = five_star_tilt * targeted_five_star + (1 - targeted_five_star)
+        tilted_slot_probabilities = np.hstack(
+            [five_star_tilt * targeted_five_star, slot_probabilities[:, 1:]]
+        ) / odds_normalizer
+
+        tilted_stamp_probabilities = self.stamp_probabilities * np.exp(
+            stamp_tilt * self.stamp_values
+        )
+        tilted_stamp_probabilities /= tilted_stamp_probabilities.sum()
+
+        return {
+            "slot_cdfs": generate_cdfs(tilted_slot_probabilities),
+            "slot_log_likelihood_ratios": log_likelihood_ratios(
+                slot_probabilities, tilted_slot_probabilities
+            ),
+            "stamp_cdf": generate_cdfs(tilted_stamp_probabilities),
+            "stamp_log_likelihood_ratios": log_likelihood_ratios(
+                self.stamp_probabilities, tilted_stamp_probabilities
+            ),
+        }
+
+    def reachable_rule_multisets(self):
+        """
+        Enumerate every combination of stamp card rule counts (in `STAMP_CARD_RULES` order) that a single ten
+        draw can receive on this banner, from every stamp card position and stamp value.
+
+        Returns:
+            list: Sorted tuples of rule counts, always including the all-standard ten draw.
+        """
+
+        card_indices, card_values, stamp_values = np.meshgrid(
+            np.arange(self.num_stamp_cards),
+            np.arange(MAX_STAMP_CARD_VALUE),
+            self.stamp_values,
+            indexing="ij",
+        )
+        rule_counts, _, _ = self.stamp_transition(
+            card_indices.ravel(), card_values.ravel(), stamp_values.ravel()
+        )
+
+        rule_multisets = {tuple(counts) for counts in rule_counts.tolist()}
+        rule_multisets.add((0,) * len(STAMP_CARD_RULES))
+
+        return sorted(rule_multisets)
+
+    def ten_draw_distribution(self, rule_counts):
+        """
+        Compute the exact joint distribution of the outcome counts of one ten draw that receives the given
+        number of draws under each stamp card rule, with standard draws in the remaining slots.
+
+        Returns:
+            tuple: An array of the possible outcome count vectors (one row each, in `OUTCOME_NAMES` order) and
+                an array of their probabilities.
+        """
+
+        slot_probabilities = [
+            rule_probabilities
+            for rule_probabilities, count in zip(self.rule_probabilities, rule_counts)
+            for _ in range(count)
+        ]
+        slot_probabilities += [self.standard_probabilities] * (
+            DRAWS_PER_TEN_DRAW - len(slot_probabilities)
+        )
+
+        # Count vectors are encoded as base-(DRAWS_PER_TEN_DRAW + 1) integers, so adding a draw of outcome k
+        # adds (DRAWS_PER_TEN_DRAW + 1) ** k to the code
+        outcome_codes = (DRAWS_PER_TEN_DRAW + 1) ** np.arange(len(OUTCOME_NAMES), dtype=np.int64)
+        codes = np.zeros(1, dtype=np.int64)
+        probabilities = np.ones(1)
+
+        for slot in slot_probabilities:
+            possible = slot > 0
+            codes, inverse = np.unique(
+                (codes[:, None] + outcome_codes[possible]).ravel(), return_inverse=True
+            )
+            probabilities = np.bincount(
+                inverse, weights=(probabilities[:, None] * slot[possible]).ravel()
+            )
+
+        outcome_counts = (codes[:, None] // outcome_codes) % (DRAWS_PER_TEN_DRAW + 1)
+
+        return outcome_counts, probabilities
+
+    def generate_ten_draw_tables(self):
+        """
+        Precompute the joint outcome count distribution of every rule combination in
+        `reachable_rule_multisets()`, so a whole ten draw can be sampled from a single float. The tables are
+        stored in self.ten_draw_tables:
+            multiset_codes: Sorted codes (see `rule_multiset_codes()`) of the rule count combinations, so that
+                searching a combination's code gives the index of its table.
+            outcome_counts: Possible outcome count vectors of every table, concatenated.
+            offset_cdfs: Cumulative probabilities of every table, with table m shifted to (m, m + 1], so that
+                one sorted search over all tables samples from whichever table a session needs.
+            weapon_parts: Targeted weapon parts of each outcome count vector.
+
+        Returns:
+            dict: self.ten_draw_tables.
+        """
+
+        if self.ten_draw_tables is not None:
+            return self.ten_draw_tables
+
+        # A dense lookup over every possible code would grow as 11 ** len(STAMP_CARD_RULES), so the tables are
+        # ordered by code and found with a sorted search instead
+        rule_multisets = sorted(
+            self.reachable_rule_multisets(), key=lambda rule_counts: rule_multiset_codes(np.array(rule_counts))
+        )
+        outcome_counts = []
+        offset_cdfs = []
+
+        for table_index, rule_counts in enumerate(rule_multisets):
+            table_outcome_counts, probabilities = self.ten_draw_distribution(rule_counts)
+            outcome_counts.append(table_outcome_counts)
+            offset_cdfs.append(table_index + generate_cdfs(probabilities))
+
+        # At most 10 of any outcome, so int8 keeps the tables small when sent to worker processes
+        outcome_counts = np.concatenate(outcome_counts).astype(np.int8)
+
+        self.ten_draw_tables = {
+            "multiset_codes": rule_multiset_codes(np.array(rule_multisets)),
+            "outcome_counts": outcome_counts,
+            "offset_cdfs": np.concatenate(offset_cdfs),
+            "weapon_parts": outcome_counts @ self.weapon_parts_per_outcome,
+        }
+
+        return self.ten_draw_tables
+
+    def absolute_rule_codes(self, stamp_totals):
+        """
+        Encode (see `rule_multiset_codes()`) the stamp card rules at absolute positions up to each stamp total,
+        where absolute position 12 * k + p is position p of the k-th card (the final EX card repeating once the
+        others are completed). The encoding is linear, so the difference of the codes before and after a ten
+        draw's stamps is the code of the rules that ten draw triggers, in agreement with `stamp_transition()`.
+
+        Returns:
+            numpy.ndarray: Integer codes with the shape of `stamp_totals`.
+        """
+
+        completed_cards = stamp_totals // MAX_STAMP_CARD_VALUE
+        last_card = self.num_stamp_cards - 1
+        card_indices = np.minimum(completed_cards, last_card)
+
+        card_code_prefix = rule_multiset_codes(self.card_rule_prefix)
+        card_total_codes = card_code_prefix[:, MAX_STAMP_CARD_VALUE]
+        completed_card_codes = np.concatenate([[0], np.cumsum(card_total_codes)])
+
+        return (
+            completed_card_codes[card_indices]
+            + np.maximum(completed_cards - last_card, 0) * card_total_codes[last_card]
+            + card_code_prefix[card_indices, stamp_totals % MAX_STAMP_CARD_VALUE]
+        )
+
+    def stamp_transition(self, card_indices, card_values, stamp_values):
+        """
+        Vectorized equivalent of `CrystalPullSession.pre_draw_stamp_card_operations()`.
+
+        Returns:
+            tuple: Per-session counts of each rule in `STAMP_CARD_RULES` for the next ten draw, followed by the
+                new stamp card indices and values.
+        """
+
+        new_values = card_values + stamp_values
+        completed = new_values >= MAX_STAMP_CARD_VALUE
+        next_indices = np.minimum(card_indices + 1, self.num_stamp_cards - 1)
+        carried_values = np.where(completed, new_values - MAX_STAMP_CARD_VALUE, 0)
+
+        rule_counts = (
+            self.card_rule_prefix[
+                card_indices, np.minimum(new_values, MAX_STAMP_CARD_VALUE)
+            ]
+            - self.card_rule_prefix[card_indices, card_values]
+            + self.card_rule_prefix[next_indices, carried_values]
+        )
+
+        return (
+            rule_counts,
+            np.where(completed, next_indices, card_indices),
+            np.where(completed, carried_values, new_values),
+        )
+
+
+def rule_multiset_codes(rule_counts):
+    """
+    Encode rule counts (last axis in `STAMP_CARD_RULES` order) as integers, as in `ten_draw_tables["multiset_codes"]`.
+    """
+
+    return rule_counts @ (DRAWS_PER_TEN_DRAW + 1) ** np.arange(
+        len(STAMP_CARD_RULES), dtype=np.int64
+    )
+
+
+def decode_rule_multiset_codes(codes):
+    """
+    Inverse of `rule_multiset_codes()`, returning rule counts with a last axis in `STAMP_CARD_RULES` order.
+    """
+
+    return (np.asarray(codes)[..., None] // (DRAWS_PER_TEN_DRAW + 1) ** np.arange(
+        len(STAMP_CARD_RULES), dtype=np.int64
+    )) % (DRAWS_PER_TEN_DRAW + 1)
+
+
+def generate_cdfs(probabilities):
+    """
+    Convert rows of outcome probabilities into cumulative distributions whose final entries are exactly 1.
+    """
+
+    cdfs = np.cumsum(probabilities, axis=-1)
+
+    return cdfs / cdfs[..., -1:]
+
+
+def log_likelihood_ratios(nominal_probabilities, tilted_probabilities):
+    """
+    Element-wise log(nominal / tilted), set to 0 wherever the outcome is impossible.
+    """
+
+    possible = tilted_probabilities > 0
+
+    return np.where(
+        possible,
+        np.log(
+            np.where(possible, nominal_probabilities, 1)
+            / np.where(possible, tilted_probabilities, 1)
+        ),
+        0.0,
+    )
+
+
+def generate_stamp_probabilities():
+    """
+    Generate the possible stamp values for a ten draw and their probabilities.
+    """
+
+    stamp_values = np.array(list(STAMP_VALUE_ROLL_THRESHOLDS.keys()), dtype=np.int64)
+    roll_thresholds = np.array(list(STAMP_VALUE_ROLL_THRESHOLDS.values()))
+
+    return stamp_values, np.diff(roll_thresholds, prepend=0) / STAMP_ROLL_MAX
+
+
+def generate_stamp_value_lookup():
+    """
+    Generate an array mapping (stamp roll - 1) to the stamp value given by
+    `CrystalPullSession.determine_stamp_value_for_ten_draw()`.
+    """
+
+    stamp_value_lookup = np.zeros(STAMP_ROLL_MAX, dtype=np.int64)
+
+    previous_threshold = 0
+    for stamp_value, threshold in STAMP_VALUE_ROLL_THRESHOLDS.items():
+        stamp_value_lookup[previous_threshold:threshold] = stamp_value
+        previous_threshold = threshold
+
+    return stamp_value_lookup
+
+
+def generate_card_rule_prefix(stamp_cards_list):
+    """
+    Generate an array where [card index, stamp value, rule index] holds the number of times the rule appears
+    on that stamp card at positions less than or equal to the stamp value.
+    """
+
+    card_rule_prefix = np.zeros(
+        (len(stamp_cards_list), MAX_STAMP_CARD_VALUE + 1, len(STAMP_CARD_RULES)),
+        dtype=np.int64,
+    )
+
+    for card_index, position_dicts in enumerate(stamp_cards_list.values()):
+        for position_dict in position_dicts:
+            if position_dict["rule"] not in STAMP_CARD_RULES:
+                raise ValueError(
+                    "One or more unsupported rules in stamp cards",
+                    [position_dict["rule"]],
+                )
+            card_rule_prefix[
+                card_index,
+                position_dict["position"],
+                STAMP_CARD_RULES.index(position_dict["rule"]),
+            ] += 1
+
+    return np.cumsum(card_rule_prefix, axis=1)
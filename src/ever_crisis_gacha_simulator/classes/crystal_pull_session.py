@@ -2,11 +2,15 @@ import numpy as np
 from .stamp_card import StampCard
 from .ten_draw import TenDraw
 from ever_crisis_gacha_simulator.constants import *
+from ever_crisis_gacha_simulator.population import stamp_card_index, validate_stamp_card_positions
 from decimal import Decimal, getcontext
 
 
 getcontext().prec = 16  # Set Decimal to continue to a max of 16 decimal places
 
+STAMP_VALUES = list(STAMP_VALUE_ROLL_THRESHOLDS.keys())
+STAMP_VALUE_THRESHOLDS = np.array(list(STAMP_VALUE_ROLL_THRESHOLDS.values()))
+
 
 class CrystalPullSession:
     """
@@ -20,7 +24,18 @@ class CrystalPullSession:
         banner_info,
         target_weapon_type,
         starting_weapon_parts=0,
+        max_crystals_spent=None,
+        starting_stamp_card=0,
+        starting_stamp_value=0,
+        starting_crystals_spent=0,
     ):
+        """
+        A pull session starts at the first stamp card with no stamps, unless it resumes from the middle of a
+        banner: `starting_stamp_card` (an index or a name of `banner_info["stamp_cards_list"]`, e.g.
+        'page_two') and `starting_stamp_value` give its stamp card position, and `starting_crystals_spent` the
+        crystals already spent, which count towards the 'crystals_spent' criterion and the crystal cap, as
+        the banner's running total. `total_stamps_earned` only counts the stamps earned during the session.
+        """
 
         if target_weapon_type not in ["featured", "wishlisted"]:
             raise ValueError(
@@ -38,6 +53,8 @@ class CrystalPullSession:
 
         self.session_criterion = session_criterion
         self.criterion_value = criterion_value
+        # Optional second stop rule: stop once another ten draw would go over this many crystals
+        self.max_crystals_spent = max_crystals_spent
 
         self.num_featured_weapons = len(banner_info["metadata"]["weapons"])
 
@@ -49,13 +66,18 @@ class CrystalPullSession:
             ],
         )
 
-        self.current_stamp_card_index = 0
         self.stamp_cards_list = banner_info["stamp_cards_list"]
+        self.current_stamp_card_index = stamp_card_index(self.stamp_cards_list, starting_stamp_card)
+        validate_stamp_card_positions(
+            self.current_stamp_card_index, starting_stamp_value, len(self.stamp_cards_list)
+        )
         self.current_stamp_card = StampCard(
             self.stamp_cards_list[
                 list(self.stamp_cards_list.keys())[self.current_stamp_card_index]
             ]
         )
+        # Stamp card rules up to the starting stamp value were already granted
+        self.current_stamp_card.current_stamp_value = starting_stamp_value
 
         self.completed_stamp_cards = []
         self.rules_for_next_ten_draw = []
@@ -63,7 +85,7 @@ class CrystalPullSession:
         self.data = {
             "targeted_weapon_parts": starting_weapon_parts,
             "total_stamps_earned": 0,
-            "num_crystals_spent": 0,
+            "num_crystals_spent": starting_crystals_spent,
             "targeted_five_stars_drawn": 0,
             "targeted_four_stars_drawn": 0,
             "targeted_three_stars_drawn": 0,
@@ -84,7 +106,7 @@ class CrystalPullSession:
 
         required_weapon_parts = (overboost_target + 1) * WEAPON_PARTS_PER_OVERBOOST
 
-        while self.data["targeted_weapon_parts"] < required_weapon_parts:
+        while self.data["targeted_weapon_parts"] < required_weapon_parts and self.within_crystal_cap():
             self.pre_draw_stamp_card_operations()
             self.perform_ten_draw()
 
@@ -97,7 +119,7 @@ class CrystalPullSession:
 
         while (
             num_crystals_to_spend - self.data["num_crystals_spent"]
-        ) >= TEN_DRAW_CRYSTAL_COST:
+        ) >= TEN_DRAW_CRYSTAL_COST and self.within_crystal_cap():
             self.pre_draw_stamp_card_operations()
             self.perform_ten_draw()
 
@@ -108,10 +130,20 @@ class CrystalPullSession:
         earned after we've earned the indicated number of stamps.
         """
 
-        while self.data["total_stamps_earned"] < num_stamps_to_earn:
+        while self.data["total_stamps_earned"] < num_stamps_to_earn and self.within_crystal_cap():
             self.pre_draw_stamp_card_operations()
             self.perform_ten_draw()
 
+    def within_crystal_cap(self):
+        """
+        Whether another ten draw fits within `max_crystals_spent` (always, without a cap).
+        """
+
+        return (
+            self.max_crystals_spent is None
+            or (self.max_crystals_spent - self.data["num_crystals_spent"]) >= TEN_DRAW_CRYSTAL_COST
+        )
+
     def determine_stamp_value_for_ten_draw(self, predetermined_int=None):
         """
         Generates a number of stamps for the beginning of a 10-draw
@@ -124,20 +156,10 @@ class CrystalPullSession:
                 low=1, high=10000, endpoint=True
             )
 
-        if 1 <= stamp_randint <= 4500:
-            stamp_value = 1
-        elif 4501 <= stamp_randint <= 8000:
-            stamp_value = 2
-        elif 8001 <= stamp_randint <= 9592:
-            stamp_value = 3
-        elif 9593 <= stamp_randint <= 9794:
-            stamp_value = 4
-        elif 9795 <= stamp_randint <= 9944:
-            stamp_value = 5
-        elif 9945 <= stamp_randint <= 9999:
-            stamp_value = 6
-        else:
-            stamp_value = 12
+        # Each stamp value covers the rolls up to and including its threshold
+        stamp_value = STAMP_VALUES[
+            np.searchsorted(STAMP_VALUE_THRESHOLDS, stamp_randint, side="left")
+        ]
 
         return stamp_value
 
@@ -233,29 +255,59 @@ class CrystalPullSession:
         """
         Executes a pull session, calling the appropriate function for the provided `session_criterion`.
         """
+        validate_criterion_value(self.session_criterion, self.criterion_value)
+        validate_max_crystals_spent(self.max_crystals_spent)
+
         if self.session_criterion == "overboost":
-            if self.criterion_value > 10 or self.criterion_value < 0:
-                raise ValueError(
-                    "Simulations of criterion 'overboost' only support overboost levels between 0 (OB0) and 10 (OB10).\nEntered: ",
-                    self.criterion_value,
-                )
             self.criterion_overboost(overboost_target=self.criterion_value)
         elif self.session_criterion == "crystals_spent":
-            if self.criterion_value < TEN_DRAW_CRYSTAL_COST:
-                raise ValueError(
-                    "Simulations of criterion 'crystals_spent' require at least 3,000 crystals as input. Provided: ",
-                    self.criterion_value,
-                )
             self.criterion_crystals_spent(num_crystals_to_spend=self.criterion_value)
         elif self.session_criterion == "stamps_earned":
-            if self.criterion_value < 0:
-                raise ValueError(
-                    "Simulations of criterion 'stamps_earned' require a positive value. Provided: ",
-                    self.criterion_value,
-                )
             self.criterion_stamps_earned(num_stamps_to_earn=self.criterion_value)
 
 
+def validate_criterion_value(session_criterion, criterion_value):
+    """
+    Make sure the provided `criterion_value` is supported for the `session_criterion`.
+    """
+
+    if session_criterion == "overboost":
+        if criterion_value > 10 or criterion_value < 0:
+            raise ValueError(
+                "Simulations of criterion 'overboost' only support overboost levels between 0 (OB0) and 10 (OB10).\nEntered: ",
+                criterion_value,
+            )
+    elif session_criterion == "crystals_spent":
+        if criterion_value < TEN_DRAW_CRYSTAL_COST:
+            raise ValueError(
+                "Simulations of criterion 'crystals_spent' require at least 3,000 crystals as input. Provided: ",
+                criterion_value,
+            )
+    elif session_criterion == "stamps_earned":
+        if criterion_value < 0:
+            raise ValueError(
+                "Simulations of criterion 'stamps_earned' require a positive value. Provided: ",
+                criterion_value,
+            )
+    else:
+        raise ValueError(
+            "`session_criterion` must be a str of either 'overboost', 'crystals_spent', or 'stamps_earned'. Provided: ",
+            session_criterion,
+        )
+
+
+def validate_max_crystals_spent(max_crystals_spent):
+    """
+    Make sure the provided crystal cap of a compound stop rule is either None (no cap) or enough for a ten draw.
+    """
+
+    if max_crystals_spent is not None and max_crystals_spent < TEN_DRAW_CRYSTAL_COST:
+        raise ValueError(
+            "`max_crystals_spent` must be None or at least 3,000 crystals. Provided: ",
+            max_crystals_spent,
+        )
+
+
 # Having this as a separate function instead of a method allows for better integration with pytest
 def generate_target_probabilities(
     num_featured_weapons, target_weapon_type, non_featured_five_star_percent_rate
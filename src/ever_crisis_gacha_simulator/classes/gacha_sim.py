@@ -1,10 +1,70 @@
 import pandas as pd
 import numpy as np
 import seaborn as sns
-from ever_crisis_gacha_simulator.classes.crystal_pull_session import CrystalPullSession
+from ever_crisis_gacha_simulator.classes.crystal_pull_session import (
+    CrystalPullSession,
+    validate_criterion_value,
+    validate_max_crystals_spent,
+)
+from ever_crisis_gacha_simulator.classes.compiled_banner import (
+    CompiledBanner,
+    SESSION_DATA_COLUMNS,
+)
+from ever_crisis_gacha_simulator.session_kernels import (
+    ENGINES,
+    continue_sessions,
+    generate_session_key,
+    simulate_population_sessions,
+    simulate_sessions,
+    simulate_traced_sessions,
+    simulate_weighted_sessions,
+)
+from ever_crisis_gacha_simulator.sampling import estimate_variance_reduction, validate_sampling
+from ever_crisis_gacha_simulator.confidence_intervals import (
+    clopper_pearson_interval,
+    normal_interval,
+    quantile_interval,
+    simulations_for_half_width,
+)
+from ever_crisis_gacha_simulator.sharding import (
+    generate_config_hash,
+    generate_shard_specs,
+)
+from ever_crisis_gacha_simulator.checkpointing import (
+    completed_blocks,
+    load_block,
+    prepare_checkpoint_dir,
+    simulate_checkpointed_sessions,
+)
 from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
-from joblib import Parallel, delayed
-from tqdm import tqdm
+from ever_crisis_gacha_simulator.constants import *
+from ever_crisis_gacha_simulator.atlas import ATLAS_PATH, atlas_answer
+from ever_crisis_gacha_simulator.executors import generate_executor
+from ever_crisis_gacha_simulator.population import (
+    generate_population,
+    starting_stamps,
+)
+from ever_crisis_gacha_simulator.progress import run_chunks
+from ever_crisis_gacha_simulator.scheduling import (
+    cost_balanced_chunk_size,
+    estimate_session_cost,
+    guided_chunk_bounds,
+)
+from ever_crisis_gacha_simulator.stamp_stage import simulate_stamp_sessions
+from ever_crisis_gacha_simulator.exact_solver import MAX_SOLVER_TEN_DRAWS, exact_minimum_budget
+from ever_crisis_gacha_simulator.tracing import select_trace_sessions
+from ever_crisis_gacha_simulator.summaries import (
+    MAX_SUMMARY_OVERBOOST,
+    SUMMARY_PERCENTILES,
+    summarize_sim_results,
+)
+from time import perf_counter
+
+
+SESSIONS_PER_CHUNK = 10_000
+
+# The reference engine is far slower per session, so its chunks are smaller to keep progress updates frequent
+REFERENCE_SESSIONS_PER_CHUNK = 500
 
 
 class GachaSim:
@@ -19,10 +79,18 @@ class GachaSim:
             banner_info,
             seed_value=None,
             starting_weapon_parts=0,
-            num_simulations=10_000
+            num_simulations=10_000,
+            max_crystals_spent=None,
             ):
 
         self.sim_results = None
+        self.sampling_report = None
+        # Key, engine and sampling mode of the compiled run behind self.sim_results, used to replay its sessions
+        self.session_stream = None
+        # Tilts of the importance-sampled run behind self.sim_results (see `run_importance_sims`)
+        self.importance_tilts = None
+        # Wall-clock seconds `run_sims` took to produce self.sim_results
+        self.run_seconds = None
 
         self.metadata = {
             "session_criterion": session_criterion,
@@ -32,6 +100,8 @@ class GachaSim:
             "seed_value": seed_value,
             "starting_weapon_parts": starting_weapon_parts,
             "num_simulations": num_simulations,
+            # Optional crystal cap, making the stop rule e.g. "reach OB6, or spend at most 300,000 crystals"
+            "max_crystals_spent": max_crystals_spent,
         }
 
     def set_seed(self, seed_value=None):
@@ -54,6 +124,7 @@ class GachaSim:
         banner_info,
         target_weapon_type,
         starting_weapon_parts,
+        max_crystals_spent=None,
         ):
 
         """
@@ -70,6 +141,8 @@ class GachaSim:
             starting_weapon_parts (int): The number of weapons parts the pull session should start
                 with (e.g., already having weapon- or character-specific parts for the character to
                 whom the targeted weapon belongs).
+            max_crystals_spent (int): The most crystals the pull session may spend, even if it has not met
+                `criterion_value` by then (a censored session). Default value of None (no cap).
 
         Returns:
             dict: Dictionary containing the results of a simulated crystal pull session.
@@ -109,24 +182,109 @@ class GachaSim:
             banner_info=banner_info,
             target_weapon_type=target_weapon_type,
             starting_weapon_parts=starting_weapon_parts,
+            max_crystals_spent=max_crystals_spent,
         )
 
         cps.execute_pull_session()
 
         return cps.data
 
-    def run_sims(self, n_jobs=2):
+    @staticmethod
+    def return_pull_session_data_dicts(num_sessions, **kwargs):
+        """
+        Execute `num_sessions` crystal pull sessions and return a list of their data dictionaries (see
+        `return_pull_session_data_dict`).
+        """
+
+        return [GachaSim.return_pull_session_data_dict(**kwargs) for _ in range(num_sessions)]
+
+    def run_sims(
+            self,
+            n_jobs=2,
+            engine="reference",
+            sampling="plain",
+            checkpoint_dir=None,
+            resume=False,
+            progress=True,
+            executor="joblib",
+            ):
 
         """
         Simulate pull sessions and store them as a pandas DataFrame in self.sim_results.
 
         Args:
-            n_jobs (int): Number of CPU cores to utilize for simulations. This value is passed directly
-                as the `n_jobs` parameter in joblib.Parallel. Passing a value of `-1` will utilize all
-                of your machine's CPU cores. Default value of 2.
+            n_jobs (int): Number of CPU cores (or threads) to utilize for simulations, with joblib's
+                convention for the `n_jobs` parameter of joblib.Parallel. Passing a value of `-1` will utilize
+                all of your machine's CPU cores. Default value of 2.
+            engine (str): One of 'reference', 'numpy', 'jit', or 'multinomial'. 'reference' runs every session
+                through `CrystalPullSession`. 'numpy' and 'jit' run chunks of sessions on the compiled rate and
+                stamp tables of `CompiledBanner`, with per-session random streams derived from the seed
+                value, so their results are reproducible and identical to each other. 'jit' requires Numba
+                (its compiled kernel is cached on disk between runs) and falls back to 'numpy' without it.
+                'multinomial' samples each ten draw's outcome counts at once from cached per-banner
+                distributions (see `CompiledBanner.generate_ten_draw_tables`), which is several times faster
+                than 'numpy' and equally reproducible, but gives different sessions for the same seed.
+                Default value of 'reference'.
+            sampling (str): One of 'plain', 'antithetic', 'stratified', or 'sobol'. The variance-reduced
+                modes ('numpy' and 'multinomial' engines only; 'sobol' requires SciPy) correlate the random floats of groups
+                of sessions while keeping every session unbiased (see `SessionUniforms`). After a
+                variance-reduced run, self.sampling_report holds the variance reduction it achieved
+                against plain sampling for each outcome column. Default value of 'plain'.
+            checkpoint_dir (str): Directory to save each finished block of `SESSIONS_PER_CHUNK` sessions to,
+                along with a manifest of the run's configuration and seed stream ('numpy', 'jit', and
+                'multinomial' engines only). Default value of None (no checkpointing).
+            resume (bool): Skip the blocks already saved in `checkpoint_dir` by an earlier, interrupted run
+                of the same configuration. The results are identical to an uninterrupted run, including
+                for unseeded runs. Default value of False.
+            progress: True for a tqdm progress bar (a widget in notebooks), False for no progress output, or a
+                callable (or list of callables) receiving a `ProgressEvent` each time a chunk of sessions
+                completes, such as `LoggingProgress()`. Default value of True.
+            executor: Executor backend running the chunks of sessions: 'joblib' (loky processes), 'processes'
+                (`concurrent.futures` processes), 'threads' (a thread pool, which avoids process spawn and
+                result pickling for the batched compiled engines, as their NumPy operations release the GIL),
+                'serial', or an `Executor` instance (see `ever_crisis_gacha_simulator.executors`). Results do
+                not depend on the executor. Default value of 'joblib'.
 
         """
 
+        if engine not in ENGINES:
+            raise ValueError(
+                "`engine` must be a str of either 'reference', 'numpy', 'jit', or 'multinomial'. Provided: ",
+                engine,
+            )
+
+        validate_sampling(sampling, engine)
+        validate_max_crystals_spent(self.metadata["max_crystals_spent"])
+
+        if engine == "reference" and checkpoint_dir is not None:
+            raise ValueError(
+                "Checkpointing requires the 'numpy', 'jit', or 'multinomial' engine. Provided: ",
+                engine,
+            )
+
+        self.sampling_report = None
+        self.session_stream = None
+        self.importance_tilts = None
+        self.run_seconds = None
+        start_time = perf_counter()
+
+        if engine != "reference":
+            self.sim_results = self.run_compiled_sims(
+                n_jobs=n_jobs,
+                engine=engine,
+                sampling=sampling,
+                checkpoint_dir=checkpoint_dir,
+                resume=resume,
+                progress=progress,
+                executor=executor,
+            )
+            self.run_seconds = perf_counter() - start_time
+            if sampling != "plain":
+                self.sampling_report = self.generate_sampling_report(
+                    sampling=sampling, seconds=self.run_seconds
+                )
+            return
+
         np.random.seed(self.metadata["seed_value"])
 
         kwargs = {
@@ -135,9 +293,711 @@ class GachaSim:
             "target_weapon_type": self.metadata["target_weapon_type"],
             "banner_info": self.metadata["banner_info"],
             "starting_weapon_parts": self.metadata["starting_weapon_parts"],
+            "max_crystals_spent": self.metadata["max_crystals_spent"],
         }
 
-        self.sim_results = pd.DataFrame(Parallel(n_jobs=n_jobs)(delayed(GachaSim.return_pull_session_data_dict)(**kwargs) for _ in tqdm(range(self.metadata["num_simulations"]))))
+        chunk_sizes = [
+            min(REFERENCE_SESSIONS_PER_CHUNK, self.metadata["num_simulations"] - chunk_start)
+            for chunk_start in range(0, self.metadata["num_simulations"], REFERENCE_SESSIONS_PER_CHUNK)
+        ]
+        chunks = run_chunks(
+            GachaSim.return_pull_session_data_dicts,
+            [{"num_sessions": chunk_size, **kwargs} for chunk_size in chunk_sizes],
+            chunk_sizes,
+            n_jobs=n_jobs,
+            progress=progress,
+            executor=executor,
+        )
+
+        self.sim_results = pd.DataFrame([data for chunk in chunks for data in chunk])
+        self.run_seconds = perf_counter() - start_time
+
+    def run_compiled_sims(
+            self,
+            n_jobs,
+            engine,
+            sampling="plain",
+            checkpoint_dir=None,
+            resume=False,
+            progress=True,
+            executor="joblib",
+            ):
+        """
+        Simulate pull sessions in chunks of `SESSIONS_PER_CHUNK` with a compiled session engine, and return
+        them as a pandas DataFrame. With a `checkpoint_dir`, every chunk is saved as soon as it finishes and,
+        when resuming, chunks that were already saved are loaded instead of simulated.
+        """
+
+        compiled_banner = CompiledBanner(
+            banner_info=self.metadata["banner_info"],
+            target_weapon_type=self.metadata["target_weapon_type"],
+        )
+        if engine == "multinomial":
+            # Build the cached ten draw distributions once, rather than once per chunk
+            compiled_banner.generate_ten_draw_tables()
+
+        kwargs = {
+            "compiled_banner": compiled_banner,
+            "session_criterion": self.metadata["session_criterion"],
+            "criterion_value": self.metadata["criterion_value"],
+            "starting_weapon_parts": self.metadata["starting_weapon_parts"],
+            "engine": engine,
+            "sampling": sampling,
+            "max_crystals_spent": self.metadata["max_crystals_spent"],
+        }
+        executor = generate_executor(executor, n_jobs=n_jobs)
+
+        if checkpoint_dir is None:
+            key, _ = generate_session_key(self.metadata["seed_value"])
+            chunk_bounds = self.scheduled_chunk_bounds(compiled_banner, executor.num_workers)
+            chunks = run_chunks(
+                simulate_sessions,
+                [
+                    {"session_start": chunk_start, "session_stop": chunk_stop, "key": key, **kwargs}
+                    for chunk_start, chunk_stop in chunk_bounds
+                ],
+                [chunk_stop - chunk_start for chunk_start, chunk_stop in chunk_bounds],
+                n_jobs=n_jobs,
+                progress=progress,
+                executor=executor,
+            )
+        else:
+            # Checkpoint blocks keep fixed bounds, so an interrupted run resumes on the same blocks
+            chunk_bounds = self.chunk_bounds()
+            key = prepare_checkpoint_dir(
+                checkpoint_dir, self.metadata, sampling=sampling, engine=engine, resume=resume
+            )
+            saved_chunks = completed_blocks(checkpoint_dir, chunk_bounds)
+            pending_chunks = [bounds for bounds in chunk_bounds if bounds not in saved_chunks]
+
+            chunk_dict = {
+                bounds: load_block(checkpoint_dir, *bounds) for bounds in saved_chunks
+            }
+            chunk_dict.update(
+                zip(
+                    pending_chunks,
+                    run_chunks(
+                        simulate_checkpointed_sessions,
+                        [
+                            {
+                                "checkpoint_dir": checkpoint_dir,
+                                "session_start": chunk_start,
+                                "session_stop": chunk_stop,
+                                "key": key,
+                                **kwargs,
+                            }
+                            for chunk_start, chunk_stop in pending_chunks
+                        ],
+                        [chunk_stop - chunk_start for chunk_start, chunk_stop in pending_chunks],
+                        n_jobs=n_jobs,
+                        progress=progress,
+                        executor=executor,
+                    ),
+                )
+            )
+            chunks = [chunk_dict[bounds] for bounds in chunk_bounds]
+
+        self.session_stream = {"key": key, "engine": engine, "sampling": sampling}
+
+        return pd.DataFrame(
+            np.concatenate(chunks) if chunks else np.zeros((0, len(SESSION_DATA_COLUMNS)), dtype=np.int64),
+            columns=SESSION_DATA_COLUMNS,
+        )
+
+    def run_importance_sims(self, five_star_tilt=1.0, stamp_tilt=0.0, n_jobs=2, progress=True, executor="joblib"):
+        """
+        Simulate pull sessions with importance sampling on the 'numpy' engine, and store them in
+        self.sim_results with an extra `likelihood_ratio` column. Tilting the draws toward a rare event
+        (e.g. OB10 within 21,000 crystals) makes it common in the simulated sessions, and the likelihood
+        ratios weight each session back to the banner's true rates. `return_value_probability` and
+        `weighted_probability` use these weights automatically.
+
+        A good tilt makes the event of interest reasonably common (roughly 10-50% of sessions) without
+        overshooting it; check `weighted_probability(...)["effective_sample_size"]` to confirm the weights
+        are not degenerate.
+
+        Args:
+            five_star_tilt (float): Multiplier on the odds of drawing the targeted 5* weapon. Above 1 for
+                events with many weapon parts (or few crystals), below 1 for the opposite tail.
+            stamp_tilt (float): Exponential tilt on stamp values. Positive values reach guaranteed stamp card
+                draws sooner, negative values later. Default value of 0 (no tilt).
+            n_jobs (int): Number of CPU cores to utilize for simulations.
+            progress: Progress bar or callbacks, as in `run_sims`. Default value of True.
+            executor: Executor backend, as in `run_sims`. Default value of 'joblib'.
+        """
+
+        start_time = perf_counter()
+        compiled_banner = CompiledBanner(
+            banner_info=self.metadata["banner_info"],
+            target_weapon_type=self.metadata["target_weapon_type"],
+        )
+        key, _ = generate_session_key(self.metadata["seed_value"])
+        executor = generate_executor(executor, n_jobs=n_jobs)
+
+        chunk_bounds = self.scheduled_chunk_bounds(compiled_banner, executor.num_workers)
+        chunks = run_chunks(
+            simulate_weighted_sessions,
+            [
+                {
+                    "compiled_banner": compiled_banner,
+                    "session_criterion": self.metadata["session_criterion"],
+                    "criterion_value": self.metadata["criterion_value"],
+                    "starting_weapon_parts": self.metadata["starting_weapon_parts"],
+                    "session_start": chunk_start,
+                    "session_stop": chunk_stop,
+                    "key": key,
+                    "five_star_tilt": five_star_tilt,
+                    "stamp_tilt": stamp_tilt,
+                    "max_crystals_spent": self.metadata["max_crystals_spent"],
+                }
+                for chunk_start, chunk_stop in chunk_bounds
+            ],
+            [chunk_stop - chunk_start for chunk_start, chunk_stop in chunk_bounds],
+            n_jobs=n_jobs,
+            progress=progress,
+            executor=executor,
+        )
+
+        self.sampling_report = None
+        # Weighted sessions cannot be traced or extended, but their key identifies the run
+        self.session_stream = {"key": key, "engine": "numpy", "sampling": "importance"}
+        self.importance_tilts = {"five_star_tilt": five_star_tilt, "stamp_tilt": stamp_tilt}
+        self.sim_results = pd.DataFrame(
+            np.concatenate([data for data, _ in chunks]), columns=SESSION_DATA_COLUMNS
+        )
+        self.sim_results["likelihood_ratio"] = np.concatenate(
+            [likelihood_ratios for _, likelihood_ratios in chunks]
+        )
+        self.run_seconds = perf_counter() - start_time
+
+    def run_population_sims(
+            self,
+            population,
+            n_jobs=2,
+            engine="numpy",
+            sampling="plain",
+            progress=True,
+            executor="joblib",
+            ):
+        """
+        Simulate a population of players in one batched run, where every session has its own criterion value
+        (e.g. budget), starting weapon parts, and starting stamp card position, given per session or drawn
+        from distributions. self.sim_results holds each session's outcome followed by its parameters (the
+        `POPULATION_PARAMETERS` columns), so population-level statistics come from the whole table and
+        segments from grouping it, e.g. `sim_results.groupby("starting_weapon_parts")`.
+
+        Population runs have no single configuration, so they cannot be extended, continued, or traced.
+
+        Args:
+            population (dict): Per-session parameters, see `population.generate_population`. For example,
+                {"criterion_value": lambda rng, size: 3_000 * rng.integers(5, 50, size),
+                "starting_stamp_card": 1} for budgets between 15,000 and 147,000 crystals, all starting on the
+                second stamp card.
+            n_jobs (int): Number of CPU cores to utilize for simulations. Default value of 2.
+            engine (str): One of 'numpy', 'jit', or 'multinomial'. Default value of 'numpy'.
+            sampling (str): One of 'plain', 'antithetic', 'stratified', or 'sobol'. Default value of 'plain'.
+            progress: Progress bar or callbacks, as in `run_sims`. Default value of True.
+            executor: Executor backend, as in `run_sims`. Default value of 'joblib'.
+        """
+
+        start_time = perf_counter()
+        compiled_banner = CompiledBanner(
+            banner_info=self.metadata["banner_info"],
+            target_weapon_type=self.metadata["target_weapon_type"],
+        )
+        if engine == "multinomial":
+            compiled_banner.generate_ten_draw_tables()
+
+        parameters = generate_population(population, self.metadata, compiled_banner.num_stamp_cards)
+        session_starting_stamps = starting_stamps(
+            parameters["starting_stamp_card"].to_numpy(), parameters["starting_stamp_value"].to_numpy()
+        )
+        key, _ = generate_session_key(self.metadata["seed_value"])
+        executor = generate_executor(executor, n_jobs=n_jobs)
+
+        # Chunks are sized for the most demanding criterion value in the population
+        chunk_bounds = self.scheduled_chunk_bounds(
+            compiled_banner,
+            executor.num_workers,
+            criterion_value=int(parameters["criterion_value"].max()) if len(parameters) else None,
+        )
+        chunks = run_chunks(
+            simulate_population_sessions,
+            [
+                {
+                    "compiled_banner": compiled_banner,
+                    "session_criterion": self.metadata["session_criterion"],
+                    "criterion_values": parameters["criterion_value"].to_numpy()[chunk_start:chunk_stop],
+                    "starting_weapon_parts": parameters["starting_weapon_parts"].to_numpy()[chunk_start:chunk_stop],
+                    "starting_stamps": session_starting_stamps[chunk_start:chunk_stop],
+                    "session_start": chunk_start,
+                    "key": key,
+                    "engine": engine,
+                    "sampling": sampling,
+                    "max_crystals_spent": self.metadata["max_crystals_spent"],
+                }
+                for chunk_start, chunk_stop in chunk_bounds
+            ],
+            [chunk_stop - chunk_start for chunk_start, chunk_stop in chunk_bounds],
+            n_jobs=n_jobs,
+            progress=progress,
+            executor=executor,
+        )
+
+        self.sampling_report = None
+        self.session_stream = None
+        self.importance_tilts = None
+        self.sim_results = pd.concat(
+            [
+                pd.DataFrame(
+                    np.concatenate(chunks) if chunks else np.zeros((0, len(SESSION_DATA_COLUMNS)), dtype=np.int64),
+                    columns=SESSION_DATA_COLUMNS,
+                ),
+                parameters,
+            ],
+            axis=1,
+        )
+        self.run_seconds = perf_counter() - start_time
+
+    def run_stamp_sims(self, n_jobs=2, sampling="plain", progress=True, executor="joblib"):
+        """
+        Simulate 'stamps_earned' sessions from their stamp sequences alone, and store their
+        `total_stamps_earned` and `num_crystals_spent` columns in self.sim_results. Stamps never depend on
+        weapon draws, so no draws are simulated at all; the columns match a 'numpy' or 'jit' `run_sims` with the
+        same seed value, at a fraction of the cost.
+
+        Args:
+            n_jobs (int): Number of CPU cores to utilize for simulations.
+            sampling (str): One of 'plain', 'antithetic', 'stratified', or 'sobol'.
+            progress: Progress bar or callbacks, as in `run_sims`. Default value of True.
+            executor: Executor backend, as in `run_sims`. Default value of 'joblib'.
+        """
+
+        if self.metadata["session_criterion"] != "stamps_earned":
+            raise ValueError(
+                "`run_stamp_sims` only supports the 'stamps_earned' criterion. Provided: ",
+                self.metadata["session_criterion"],
+            )
+
+        validate_criterion_value("stamps_earned", self.metadata["criterion_value"])
+
+        compiled_banner = CompiledBanner(
+            banner_info=self.metadata["banner_info"],
+            target_weapon_type=self.metadata["target_weapon_type"],
+        )
+        key, _ = generate_session_key(self.metadata["seed_value"])
+
+        chunk_bounds = self.chunk_bounds()
+        chunks = run_chunks(
+            simulate_stamp_sessions,
+            [
+                {
+                    "compiled_banner": compiled_banner,
+                    "criterion_value": self.metadata["criterion_value"],
+                    "session_start": chunk_start,
+                    "session_stop": chunk_stop,
+                    "key": key,
+                    "sampling": sampling,
+                    "max_crystals_spent": self.metadata["max_crystals_spent"],
+                }
+                for chunk_start, chunk_stop in chunk_bounds
+            ],
+            [chunk_stop - chunk_start for chunk_start, chunk_stop in chunk_bounds],
+            n_jobs=n_jobs,
+            progress=progress,
+            executor=executor,
+        )
+
+        self.sampling_report = None
+        # The stamp columns are those of the 'numpy' engine, so traces replay its full sessions
+        self.session_stream = {"key": key, "engine": "numpy", "sampling": sampling}
+        self.importance_tilts = None
+        self.run_seconds = None
+        self.sim_results = pd.DataFrame(
+            np.concatenate(chunks) if chunks else np.zeros((0, 2), dtype=np.int64),
+            columns=["total_stamps_earned", "num_crystals_spent"],
+        )
+
+    def generate_shard_specs(self, num_shards, engine="numpy", sampling="plain", keep_data=True):
+        """
+        Split this simulation into independent shards that can run on separate machines (see
+        `ever_crisis_gacha_simulator.sharding`). Set a seed value first if the shards' merged result should
+        be reproducible; unseeded shards still share one seed stream, recorded in each spec's `entropy`.
+
+        Args:
+            num_shards (int): Number of shards to split the sessions into.
+            engine (str): One of 'numpy', 'jit', or 'multinomial'.
+            sampling (str): One of 'plain', 'antithetic', 'stratified', or 'sobol'.
+            keep_data (bool): Whether shards should return their session data, which `load_partial_result`
+                needs to fill self.sim_results. Default value of True.
+
+        Returns:
+            list: One shard spec dict per shard.
+        """
+
+        return generate_shard_specs(
+            self.metadata,
+            num_shards,
+            engine=engine,
+            sampling=sampling,
+            keep_data=keep_data,
+        )
+
+    def load_partial_result(self, partial_result, sampling="plain", engine="numpy"):
+        """
+        Store the merged partial result of all shards in self.sim_results, exactly as a single-machine run
+        with the same seed value would have.
+        """
+
+        self.session_stream = None
+        self.importance_tilts = None
+        self.run_seconds = None
+        if self.metadata["seed_value"] is not None:
+            key, _ = generate_session_key(self.metadata["seed_value"])
+            self.session_stream = {"key": key, "engine": engine, "sampling": sampling}
+            if partial_result.config_hash != generate_config_hash(self.metadata, key, sampling=sampling, engine=engine):
+                raise ValueError(
+                    "The partial result was simulated with a different configuration. Provided: ",
+                    partial_result.config_hash,
+                )
+
+        if not partial_result.is_complete(self.metadata["num_simulations"]):
+            raise ValueError(
+                "The partial result does not cover every simulated session. Provided: ",
+                partial_result.session_ranges,
+            )
+
+        self.sim_results = partial_result.to_dataframe()
+
+    def add_sims(self, num_simulations, n_jobs=2, progress=True, executor="joblib"):
+        """
+        Extend the last run with `num_simulations` more sessions, and append them to self.sim_results. The new
+        sessions continue the run's per-session random streams from where it ended, so a run of 100,000
+        sessions extended by 400,000 is identical to a run of 500,000 sessions, and only the new sessions are
+        simulated. Requires results from the 'numpy', 'jit', or 'multinomial' engine, seeded or not.
+
+        Args:
+            num_simulations (int): Number of sessions to add.
+            n_jobs (int): Number of CPU cores to utilize for simulations. Default value of 2.
+            progress: Progress bar or callbacks, as in `run_sims`. Default value of True.
+            executor: Executor backend, as in `run_sims`. Default value of 'joblib'.
+        """
+
+        if self.session_stream is None or list(self.sim_results.columns) != SESSION_DATA_COLUMNS:
+            raise ValueError(
+                "Only the results of a 'numpy', 'jit', or 'multinomial' `run_sims` can be extended. Provided: ",
+                self.session_stream,
+            )
+
+        if num_simulations < 1:
+            raise ValueError("`num_simulations` must be a positive int. Provided: ", num_simulations)
+
+        start_time = perf_counter()
+        session_start = len(self.sim_results)
+        self.metadata["num_simulations"] = session_start + num_simulations
+
+        compiled_banner = CompiledBanner(
+            banner_info=self.metadata["banner_info"],
+            target_weapon_type=self.metadata["target_weapon_type"],
+        )
+        if self.session_stream["engine"] == "multinomial":
+            compiled_banner.generate_ten_draw_tables()
+
+        executor = generate_executor(executor, n_jobs=n_jobs)
+        chunk_bounds = self.scheduled_chunk_bounds(
+            compiled_banner, executor.num_workers, session_start=session_start
+        )
+        chunks = run_chunks(
+            simulate_sessions,
+            [
+                {
+                    "compiled_banner": compiled_banner,
+                    "session_criterion": self.metadata["session_criterion"],
+                    "criterion_value": self.metadata["criterion_value"],
+                    "starting_weapon_parts": self.metadata["starting_weapon_parts"],
+                    "session_start": chunk_start,
+                    "session_stop": chunk_stop,
+                    "max_crystals_spent": self.metadata["max_crystals_spent"],
+                    **self.session_stream,
+                }
+                for chunk_start, chunk_stop in chunk_bounds
+            ],
+            [chunk_stop - chunk_start for chunk_start, chunk_stop in chunk_bounds],
+            n_jobs=n_jobs,
+            progress=progress,
+            executor=executor,
+        )
+
+        self.sim_results = pd.concat(
+            [self.sim_results, pd.DataFrame(np.concatenate(chunks), columns=SESSION_DATA_COLUMNS)],
+            ignore_index=True,
+        )
+        if self.run_seconds is not None:
+            self.run_seconds += perf_counter() - start_time
+        if self.session_stream["sampling"] != "plain":
+            self.sampling_report = self.generate_sampling_report(
+                sampling=self.session_stream["sampling"], seconds=self.run_seconds
+            )
+
+    def continue_sims(self, criterion_value, n_jobs=2, progress=True, executor="joblib"):
+        """
+        Continue every session of the last run to a higher criterion value of the same criterion (e.g. from
+        21,000 to 30,000 crystals spent, or from OB5 to OB6), and store the continued sessions in
+        self.sim_results. Each session resumes from its end state (its stamp card position and position in its
+        random stream follow from its stamps earned and crystals spent), so only the extra ten draws are
+        simulated, and the results match a fresh run at the higher value with the same seed value. Requires
+        results from the 'numpy', 'jit', or 'multinomial' engine, seeded or not.
+
+        Args:
+            criterion_value (int): The new criterion value, at least the current one.
+            n_jobs (int): Number of CPU cores to utilize for simulations. Default value of 2.
+            progress: Progress bar or callbacks, as in `run_sims`. Default value of True.
+            executor: Executor backend, as in `run_sims`. Default value of 'joblib'.
+        """
+
+        if self.session_stream is None or list(self.sim_results.columns) != SESSION_DATA_COLUMNS:
+            raise ValueError(
+                "Only the results of a 'numpy', 'jit', or 'multinomial' `run_sims` can be continued. Provided: ",
+                self.session_stream,
+            )
+
+        validate_criterion_value(self.metadata["session_criterion"], criterion_value)
+
+        if criterion_value < self.metadata["criterion_value"]:
+            raise ValueError(
+                "Sessions can only be continued to a criterion value at least as high as the current one. "
+                "Provided: ",
+                criterion_value,
+            )
+
+        start_time = perf_counter()
+        compiled_banner = CompiledBanner(
+            banner_info=self.metadata["banner_info"],
+            target_weapon_type=self.metadata["target_weapon_type"],
+        )
+        if self.session_stream["engine"] == "multinomial":
+            compiled_banner.generate_ten_draw_tables()
+
+        end_states = self.sim_results.to_numpy()
+        executor = generate_executor(executor, n_jobs=n_jobs)
+        chunk_bounds = self.scheduled_chunk_bounds(
+            compiled_banner, executor.num_workers, criterion_value=criterion_value
+        )
+        chunks = run_chunks(
+            continue_sessions,
+            [
+                {
+                    "compiled_banner": compiled_banner,
+                    "session_criterion": self.metadata["session_criterion"],
+                    "criterion_value": criterion_value,
+                    "end_states": end_states[chunk_start:chunk_stop],
+                    "session_start": chunk_start,
+                    "max_crystals_spent": self.metadata["max_crystals_spent"],
+                    **self.session_stream,
+                }
+                for chunk_start, chunk_stop in chunk_bounds
+            ],
+            [chunk_stop - chunk_start for chunk_start, chunk_stop in chunk_bounds],
+            n_jobs=n_jobs,
+            progress=progress,
+            executor=executor,
+        )
+
+        self.metadata["criterion_value"] = criterion_value
+        self.sim_results = pd.DataFrame(np.concatenate(chunks), columns=SESSION_DATA_COLUMNS)
+        if self.run_seconds is not None:
+            self.run_seconds += perf_counter() - start_time
+        if self.session_stream["sampling"] != "plain":
+            self.sampling_report = self.generate_sampling_report(
+                sampling=self.session_stream["sampling"], seconds=self.run_seconds
+            )
+
+    def merge_sims(self, other):
+        """
+        Merge the results of another `GachaSim` of the same configuration (session criterion, criterion value,
+        target weapon type, banner, starting weapon parts, and crystal cap) into this one.
+
+        Runs on the same random streams (the same seed value, engine and sampling mode) share their first
+        sessions, so the merged results are those of the longer run, which can still be traced and extended.
+        Runs on different streams are independent samples, so their sessions are concatenated; the merged
+        results no longer belong to a single stream, so they cannot be traced or extended.
+
+        Args:
+            other (GachaSim): A `GachaSim` with results.
+        """
+
+        config_keys = [
+            "session_criterion",
+            "criterion_value",
+            "target_weapon_type",
+            "banner_info",
+            "starting_weapon_parts",
+            "max_crystals_spent",
+        ]
+        if any(self.metadata[key] != other.metadata[key] for key in config_keys):
+            raise ValueError(
+                "Only runs of the same configuration can be merged. Provided: ",
+                {key: (self.metadata[key], other.metadata[key]) for key in config_keys if key != "banner_info"},
+            )
+
+        if self.sim_results is None or other.sim_results is None:
+            raise ValueError("Both runs need results; call `run_sims` first. Provided: ", other.sim_results)
+
+        if list(self.sim_results.columns) != list(other.sim_results.columns):
+            raise ValueError(
+                "Only runs with the same result columns can be merged. Provided: ",
+                list(other.sim_results.columns),
+            )
+
+        if (
+            self.session_stream is not None
+            and self.session_stream == other.session_stream
+            and self.importance_tilts == other.importance_tilts
+        ):
+            if len(other.sim_results) > len(self.sim_results):
+                self.sim_results = other.sim_results.copy()
+                self.sampling_report = other.sampling_report
+                self.run_seconds = other.run_seconds
+        else:
+            self.sim_results = pd.concat([self.sim_results, other.sim_results], ignore_index=True)
+            self.session_stream = None
+            self.importance_tilts = None
+            self.sampling_report = None
+            self.metadata["seed_value"] = None
+            self.run_seconds = (
+                self.run_seconds + other.run_seconds
+                if self.run_seconds is not None and other.run_seconds is not None
+                else None
+            )
+
+        self.metadata["num_simulations"] = len(self.sim_results)
+
+    def trace_sessions(self, num_traces=100, predicate=None, max_bytes=1_000_000, seed=None):
+        """
+        Record how individual sessions of the last run went, one packed record per ten draw (stamp value,
+        stamp card position, guaranteed draws, and the outcome of every draw; see `tracing.TRACE_COLUMNS`).
+        Sessions are chosen after the run, as a random sample of all sessions or of those matching
+        `predicate`, and only the chosen sessions are replayed from their random streams, so the run itself
+        keeps no traces and memory stays within `max_bytes`.
+
+        Requires results from the 'numpy', 'jit', or 'multinomial' engine (or `run_stamp_sims`). 'multinomial'
+        sessions only have outcome counts per ten draw, so their draw columns list the outcomes in
+        OUTCOME_NAMES order rather than in draw order.
+
+        Args:
+            num_traces (int): Most sessions to trace. Default value of 100.
+            predicate (callable): Function of self.sim_results returning a boolean mask of the sessions that
+                may be traced, e.g. `lambda df: df.num_crystals_spent >= df.num_crystals_spent.quantile(0.99)`
+                for the worst 1% by crystals. Default value of None (any session).
+            max_bytes (int): Most bytes of trace records to keep. Default value of 1,000,000.
+            seed (int): Seed value for choosing the sessions. Default value of None.
+
+        Returns:
+            dict: Session index (row of self.sim_results) mapped to its trace, an array of shape
+                (ten draws, TRACE_RECORD_BYTES) with dtype uint8. `tracing.trace_to_dataframe()` unpacks one.
+        """
+
+        if self.session_stream is None or self.session_stream["sampling"] == "importance":
+            raise ValueError(
+                "Tracing replays sessions of a 'numpy', 'jit', or 'multinomial' run; run one first. Provided: ",
+                self.session_stream,
+            )
+
+        session_ids = select_trace_sessions(
+            self.sim_results,
+            num_traces=num_traces,
+            predicate=predicate,
+            max_bytes=max_bytes,
+            seed=seed,
+        )
+        compiled_banner = CompiledBanner(
+            banner_info=self.metadata["banner_info"],
+            target_weapon_type=self.metadata["target_weapon_type"],
+        )
+        _, traces = simulate_traced_sessions(
+            compiled_banner,
+            self.metadata["session_criterion"],
+            self.metadata["criterion_value"],
+            self.metadata["starting_weapon_parts"],
+            session_ids,
+            max_crystals_spent=self.metadata["max_crystals_spent"],
+            **self.session_stream,
+        )
+
+        return dict(zip(session_ids.tolist(), traces))
+
+    def generate_sampling_report(self, sampling, seconds):
+        """
+        Measure the variance reduction a sampling mode achieved against plain sampling, for each outcome
+        column of self.sim_results.
+
+        Returns:
+            dict: The `sampling` mode, the run time in `seconds`, and per outcome column the
+                `variance_reduction` factor and the `equivalent_plain_simulations` it is worth. Dividing
+                the equivalent plain simulations by the sessions plain sampling runs in the same time gives
+                the CPU time actually saved.
+        """
+
+        session_ids = np.arange(len(self.sim_results))
+        variance_reduction = {
+            column: estimate_variance_reduction(
+                self.sim_results[column].to_numpy(), session_ids, sampling
+            )
+            for column in ["targeted_weapon_parts", "num_crystals_spent", "total_stamps_earned"]
+        }
+
+        return {
+            "sampling": sampling,
+            "seconds": seconds,
+            "variance_reduction": variance_reduction,
+            "equivalent_plain_simulations": {
+                column: factor * len(self.sim_results)
+                for column, factor in variance_reduction.items()
+            },
+        }
+
+    def chunk_bounds(self, session_start=0):
+        """
+        Split the simulated sessions from index `session_start` on into [start, stop) index ranges of at most
+        `SESSIONS_PER_CHUNK` sessions.
+        """
+
+        return [
+            (chunk_start, min(chunk_start + SESSIONS_PER_CHUNK, self.metadata["num_simulations"]))
+            for chunk_start in range(session_start, self.metadata["num_simulations"], SESSIONS_PER_CHUNK)
+        ]
+
+    def scheduled_chunk_bounds(self, compiled_banner, num_workers, session_start=0, criterion_value=None):
+        """
+        Split the simulated sessions from index `session_start` on into chunks sized by their expected work
+        (see `scheduling.cost_balanced_chunk_size`), which shrink towards the end of the run so that long,
+        heavy-tailed sessions (e.g. 'overboost' on a wishlisted weapon) do not leave workers idle behind one
+        straggling chunk (see `scheduling.guided_chunk_bounds`).
+
+        Args:
+            compiled_banner (CompiledBanner): The compiled banner of the run.
+            num_workers (int): Number of workers running the chunks.
+            session_start (int): Index of the first session. Default value of 0.
+            criterion_value (int): Criterion value the sessions run to. Default value of None (the run's own).
+
+        Returns:
+            list: [start, stop) index ranges, in order.
+        """
+
+        session_cost = estimate_session_cost(
+            compiled_banner,
+            self.metadata["session_criterion"],
+            self.metadata["criterion_value"] if criterion_value is None else criterion_value,
+            starting_weapon_parts=self.metadata["starting_weapon_parts"],
+            max_crystals_spent=self.metadata["max_crystals_spent"],
+        )
+
+        return guided_chunk_bounds(
+            session_start,
+            self.metadata["num_simulations"],
+            num_workers,
+            cost_balanced_chunk_size(session_cost, SESSIONS_PER_CHUNK),
+        )
 
     def generate_title_string(self, outcome):
         NUM_STAMPS_IN_A_STAMP_CARD = 12
@@ -234,7 +1094,27 @@ class GachaSim:
 
         return plot
 
-    def return_value_probability(self, column, value, decimals=1):
+    def return_value_probability(self, column, value, decimals=1, interval=False, confidence=0.95):
+        """
+        Return the probability (as a percentage) of reaching at least `value` for `targeted_weapon_parts`, or at
+        most `value` for the other columns.
+
+        Args:
+            column (str): One of 'targeted_weapon_parts', 'num_crystals_spent', or 'total_stamps_earned'.
+            value (int): The value to compare each session's result against.
+            decimals (int): Number of decimal places to round the percentages to. Default value of 1.
+            interval (bool): Also return a confidence interval. Plain results use the exact (Clopper-Pearson)
+                binomial interval; importance-sampled results use a normal interval from the standard error
+                of the weighted estimate. Default value of False.
+            confidence (float): Confidence level of the interval. Default value of 0.95.
+
+        Sessions censored by the crystal cap (see `censored_sessions`) never met their criterion, so they do
+        not count as reaching `value` for 'num_crystals_spent' or 'total_stamps_earned'.
+
+        Returns:
+            float: The probability, or a tuple of the probability and the lower and upper bounds of its
+                confidence interval when `interval` is True.
+        """
         # Validate outcome paramter
         ACCEPTABLE_COLUMNS = ["targeted_weapon_parts", "num_crystals_spent", "total_stamps_earned"]
 
@@ -242,6 +1122,319 @@ class GachaSim:
             print("ERROR: Only acceptable outcomes for this function are `targeted_weapon_parts`, `num_crystals_spent`, and `total_stamps_earned`.")
             return
 
-        symbol = ">=" if column == "targeted_weapon_parts" else "<="
+        if "likelihood_ratio" in self.sim_results.columns:
+            estimate = self.weighted_probability(column, value)
+            probability = estimate["probability"]
+            low, high = normal_interval(probability, estimate["standard_error"], confidence=confidence)
+            low, high = max(low, 0.0), min(high, 1.0)
+        else:
+            num_successes = int(self.success_events(column, value).sum())
+            probability = num_successes / self.metadata["num_simulations"]
+            if interval:
+                low, high = clopper_pearson_interval(
+                    num_successes, self.metadata["num_simulations"], confidence=confidence
+                )
+
+        if not interval:
+            return round(100 * probability, decimals)
 
-        return round(100 * len(self.sim_results.query(column + f" {symbol} {value}")) / self.metadata["num_simulations"], decimals)
\ No newline at end of file
+        return tuple(round(100 * bound, decimals) for bound in (probability, low, high))
+
+    def success_probability(
+            self,
+            value,
+            decimals=1,
+            use_atlas=True,
+            atlas_path=ATLAS_PATH,
+            n_jobs=2,
+            engine="numpy",
+            progress=True,
+            ):
+        """
+        Return the probability (as a percentage) of the common questions: reaching OB `value` for a
+        'crystals_spent' simulation, or reaching its overboost level within `value` crystals for an 'overboost'
+        simulation. Configurations covered by the answer atlas (see `ever_crisis_gacha_simulator.atlas`) are
+        answered exactly from it, without simulating; any other configuration falls back to
+        `return_value_probability` on self.sim_results, running `run_sims` first if there are no results yet.
+
+        Args:
+            value (int): The overboost level, or the crystal budget.
+            decimals (int): Number of decimal places to round the percentage to. Default value of 1.
+            use_atlas (bool): Whether to answer from the atlas when it covers the configuration. Default value
+                of True.
+            atlas_path (str): The atlas file. Default value of the atlas shipped with the package.
+            n_jobs (int): Number of CPU cores to utilize for a fallback run. Default value of 2.
+            engine (str): Session engine of a fallback run. Default value of 'numpy'.
+            progress: Progress bar or callbacks of a fallback run, as in `run_sims`. Default value of True.
+
+        Returns:
+            float: The probability.
+        """
+
+        if self.metadata["session_criterion"] == "stamps_earned":
+            raise ValueError(
+                "`success_probability` supports the 'crystals_spent' and 'overboost' criteria. Provided: ",
+                self.metadata["session_criterion"],
+            )
+
+        probability = atlas_answer(self.metadata, value, path=atlas_path) if use_atlas else None
+        if probability is not None:
+            return round(100 * probability, decimals)
+
+        if self.sim_results is None:
+            self.run_sims(n_jobs=n_jobs, engine=engine, progress=progress)
+
+        if self.metadata["session_criterion"] == "crystals_spent":
+            return self.return_value_probability(
+                "targeted_weapon_parts", (value + 1) * WEAPON_PARTS_PER_OVERBOOST, decimals=decimals
+            )
+
+        return self.return_value_probability("num_crystals_spent", value, decimals=decimals)
+
+    def return_value_quantile(self, column, percentile, confidence=0.95, num_resamples=2_000, seed=None):
+        """
+        Return a percentile of a column along with a bootstrap confidence interval. The bootstrap resamples the
+        column's count table (distinct values and their counts) with Poisson counts, so no resampled sessions
+        are ever materialized.
+
+        Args:
+            column (str): One of 'targeted_weapon_parts', 'num_crystals_spent', or 'total_stamps_earned'.
+            percentile (float or list): Percentile(s) between 0 and 100, e.g. 50 for the median.
+            confidence (float): Confidence level of the interval. Default value of 0.95.
+            num_resamples (int): Number of bootstrap resamples. Default value of 2,000.
+            seed (int): Seed value for the bootstrap resamples. Default value of None.
+
+        Returns:
+            tuple: The percentile value and the lower and upper bounds of its confidence interval. Each is an
+                array when `percentile` is a list.
+        """
+
+        if "likelihood_ratio" in self.sim_results.columns:
+            raise ValueError(
+                "Quantile intervals are only available for unweighted results (use `run_sims`). Provided: ",
+                "importance-sampled results",
+            )
+
+        return quantile_interval(
+            self.sim_results[column].to_numpy(),
+            percentile,
+            confidence=confidence,
+            num_resamples=num_resamples,
+            seed=seed,
+        )
+
+    def summary(self, percentiles=SUMMARY_PERCENTILES, max_overboost=MAX_SUMMARY_OVERBOOST):
+        """
+        Summarize self.sim_results in one tidy table: the mean, standard deviation, range and percentiles of
+        every outcome column and of the overboost level reached, plus the probability of reaching each overboost
+        level from 0 to `max_overboost`. Every statistic comes from one count table per column, so this is
+        much faster than computing them one at a time over the rows.
+
+        Args:
+            percentiles (list): Percentiles to report, between 0 and 100. Default value of [5, 25, 50, 75, 95].
+            max_overboost (int): Highest overboost level to report the probability of reaching. Default value
+                of 10.
+
+        Returns:
+            pandas.DataFrame: One row per column and statistic, with columns 'column', 'statistic', and 'value'.
+                Probabilities ('P(OB >= k)') are percentages, as in `return_value_probability`.
+        """
+
+        summary = summarize_sim_results(
+            self.sim_results, percentiles=percentiles, max_overboost=max_overboost
+        )
+
+        if self.metadata["max_crystals_spent"] is not None:
+            weights = (
+                self.sim_results["likelihood_ratio"] if "likelihood_ratio" in self.sim_results.columns else None
+            )
+            summary.loc[len(summary)] = [
+                "censored",
+                "P(censored)",
+                100 * np.average(self.censored_sessions(), weights=weights),
+            ]
+
+        return summary
+
+    def censored_sessions(self):
+        """
+        Flag the sessions of self.sim_results that stopped at the crystal cap (`max_crystals_spent`) before
+        meeting their criterion, such as sessions that ran out of crystals before reaching their overboost
+        target. Statistics of a capped run describe the capped sessions, so e.g. its `num_crystals_spent`
+        percentiles only bound the uncapped ones from below where sessions were censored.
+
+        Returns:
+            pandas.Series: A boolean mask over self.sim_results, all False without a cap.
+        """
+
+        # Population runs carry a criterion value per session
+        criterion_value = (
+            self.sim_results["criterion_value"]
+            if "criterion_value" in self.sim_results.columns
+            else self.metadata["criterion_value"]
+        )
+
+        if self.metadata["session_criterion"] == "overboost":
+            reached = self.sim_results["targeted_weapon_parts"] >= (criterion_value + 1) * WEAPON_PARTS_PER_OVERBOOST
+        elif self.metadata["session_criterion"] == "crystals_spent":
+            reached = (criterion_value - self.sim_results["num_crystals_spent"]) < TEN_DRAW_CRYSTAL_COST
+        else:
+            reached = self.sim_results["total_stamps_earned"] >= criterion_value
+
+        return ~reached
+
+    def simulations_needed(self, column, value, half_width=0.1, confidence=0.95):
+        """
+        Estimate how many simulations would give `return_value_probability(column, value)` a confidence interval
+        of +/- `half_width` percentage points, based on the current results. Compare it with
+        self.metadata["num_simulations"] to see whether a run was too small or larger than needed.
+
+        Returns:
+            int: The number of simulations needed.
+        """
+
+        estimate = self.weighted_probability(column, value)
+        session_variance = estimate["variance"] * len(self.sim_results)
+
+        # Nothing observed yet: fall back to the variance of a probability at the rule-of-three upper bound
+        if session_variance == 0:
+            upper_bound = 3 / len(self.sim_results)
+            session_variance = upper_bound * (1 - upper_bound)
+
+        return simulations_for_half_width(
+            session_variance, half_width / 100, confidence=confidence
+        )
+
+    def minimum_budget(self, target_probability, method="exact", confidence=0.95, seed=None):
+        """
+        Find the smallest number of crystals (a multiple of 3,000) that reaches this simulation's 'overboost'
+        criterion value with at least `target_probability`, given its starting weapon parts.
+
+        With method='exact', the budget comes from the exact distribution of weapon parts (see
+        `ever_crisis_gacha_simulator.exact_solver`) and needs no simulations. With method='simulation', it is
+        read off the results of `run_sims`: each 'overboost' session stops as soon as it reaches the goal, so
+        its `num_crystals_spent` is the smallest budget that would have been enough for it, and every budget
+        is answered by the same sessions at once.
+
+        Args:
+            target_probability (float): Probability of reaching the goal, between 0 and 1 (exclusive).
+            method (str): One of 'exact' or 'simulation'. Default value of 'exact'.
+            confidence (float): Confidence level of the interval for method='simulation'. Default value of 0.95.
+            seed (int): Seed value for the bootstrap resamples of method='simulation'. Default value of None.
+
+        Returns:
+            dict: The `crystals` needed and the `probability` of reaching the goal with them. For
+                method='simulation', also the `low` and `high` bounds of a confidence interval for `crystals`.
+                Sessions censored by a crystal cap count as never reaching the goal, so `high` is None when
+                the interval reaches past the cap. Both methods raise a ValueError when the target probability
+                is not reached within the cap.
+        """
+
+        if self.metadata["session_criterion"] != "overboost":
+            raise ValueError(
+                "`minimum_budget` only supports the 'overboost' criterion. Provided: ",
+                self.metadata["session_criterion"],
+            )
+
+        if not 0 < target_probability < 1:
+            raise ValueError(
+                "`target_probability` must be between 0 and 1 (exclusive). Provided: ", target_probability
+            )
+
+        if method == "exact":
+            compiled_banner = CompiledBanner(
+                banner_info=self.metadata["banner_info"],
+                target_weapon_type=self.metadata["target_weapon_type"],
+            )
+            # A capped configuration never spends more than its cap, so the search stops there
+            max_crystals_spent = self.metadata["max_crystals_spent"]
+            return exact_minimum_budget(
+                compiled_banner,
+                self.metadata["criterion_value"],
+                target_probability,
+                starting_weapon_parts=self.metadata["starting_weapon_parts"],
+                max_ten_draws=(
+                    MAX_SOLVER_TEN_DRAWS
+                    if max_crystals_spent is None
+                    else max_crystals_spent // TEN_DRAW_CRYSTAL_COST
+                ),
+            )
+
+        if method != "simulation":
+            raise ValueError(
+                "`method` must be a str of either 'exact' or 'simulation'. Provided: ", method
+            )
+
+        if self.sim_results is None:
+            raise ValueError(
+                "method='simulation' needs simulation results; call `run_sims` first. Provided: ", method
+            )
+
+        if "likelihood_ratio" in self.sim_results.columns:
+            raise ValueError(
+                "method='simulation' is only available for unweighted results (use `run_sims`). Provided: ",
+                "importance-sampled results",
+            )
+
+        # Sessions censored by the crystal cap never reached the goal, whatever the budget
+        budgets = np.where(
+            self.censored_sessions().to_numpy(), np.inf, self.sim_results["num_crystals_spent"].to_numpy()
+        )
+        crystals, low, high = quantile_interval(
+            budgets, 100 * target_probability, confidence=confidence, seed=seed
+        )
+
+        if not np.isfinite(crystals):
+            raise ValueError(
+                "The target probability is not reached within the crystal cap. Provided: ",
+                self.metadata["max_crystals_spent"],
+            )
+
+        return {
+            "crystals": int(crystals),
+            "probability": (budgets <= crystals).mean(),
+            "low": int(low),
+            "high": int(high) if np.isfinite(high) else None,
+        }
+
+    def success_events(self, column, value):
+        """
+        Flag the sessions of self.sim_results that reach at least `value` for `targeted_weapon_parts`, or at
+        most `value` for the other columns. A session censored by the crystal cap stopped at the cap without
+        meeting its criterion, so its crystals spent or stamps earned are not a success, however few.
+
+        Returns:
+            numpy.ndarray: A boolean array over self.sim_results.
+        """
+
+        if column == "targeted_weapon_parts":
+            return self.sim_results[column].to_numpy() >= value
+
+        return (self.sim_results[column].to_numpy() <= value) & ~self.censored_sessions().to_numpy()
+
+    def weighted_probability(self, column, value):
+        """
+        Estimate the probability of the same event as `return_value_probability` (at least `value` for
+        `targeted_weapon_parts`, at most `value` otherwise), weighting each session by its likelihood ratio.
+        Sessions from `run_sims` have weights of 1, which gives the plain Monte Carlo estimate.
+
+        Returns:
+            dict: The estimated `probability` (a fraction, not a percentage), the `variance` and
+                `standard_error` of that estimate, and the `effective_sample_size` of the weights.
+        """
+
+        if "likelihood_ratio" in self.sim_results.columns:
+            weights = self.sim_results["likelihood_ratio"].to_numpy()
+        else:
+            weights = np.ones(len(self.sim_results))
+
+        weighted_event = weights * self.success_events(column, value)
+        num_sessions = len(weighted_event)
+        variance = weighted_event.var(ddof=1) / num_sessions
+
+        return {
+            "probability": weighted_event.mean(),
+            "variance": variance,
+            "standard_error": np.sqrt(variance),
+            "effective_sample_size": weights.sum() ** 2 / (weights**2).sum(),
+        }
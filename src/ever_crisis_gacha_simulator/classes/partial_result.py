@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+from ever_crisis_gacha_simulator.classes.compiled_banner import SESSION_DATA_COLUMNS
+
+
+class PartialResult:
+    """
+    Class holding the mergeable summary of a range of simulated sessions: a count table and integer moments
+    (sum and sum of squares) for every column, plus, optionally, the session data itself as a columnar block.
+    Because every statistic is an exact integer, merging the partial results of all shards reproduces the
+    summary of a single-machine run exactly.
+    """
+
+    def __init__(self, config_hash, session_ranges, count_tables, sums, sums_of_squares, data_blocks=None):
+
+        self.config_hash = config_hash
+        self.session_ranges = [tuple(session_range) for session_range in session_ranges]
+        self.count_tables = count_tables
+        self.sums = np.asarray(sums, dtype=np.int64)
+        self.sums_of_squares = np.asarray(sums_of_squares, dtype=np.int64)
+        self.data_blocks = data_blocks
+
+    @classmethod
+    def from_data(cls, config_hash, session_start, session_stop, data, keep_data=False):
+        """
+        Summarize the session data of sessions [session_start, session_stop), one row per session with the
+        columns of `SESSION_DATA_COLUMNS`.
+        """
+
+        data = np.asarray(data, dtype=np.int64)
+
+        return cls(
+            config_hash=config_hash,
+            session_ranges=[(session_start, session_stop)],
+            count_tables={
+                column: np.unique(data[:, index], return_counts=True)
+                for index, column in enumerate(SESSION_DATA_COLUMNS)
+            },
+            sums=data.sum(axis=0),
+            sums_of_squares=(data**2).sum(axis=0),
+            data_blocks={session_start: data} if keep_data else None,
+        )
+
+    @property
+    def num_sessions(self):
+        return sum(stop - start for start, stop in self.session_ranges)
+
+    def merge(self, other):
+        """
+        Combine two partial results of the same configuration over disjoint session ranges.
+
+        Returns:
+            PartialResult: The merged result. Session data blocks are only kept if both results have them.
+        """
+
+        if other.config_hash != self.config_hash:
+            raise ValueError(
+                "Only partial results of the same configuration can be merged. Provided: ",
+                (self.config_hash, other.config_hash),
+            )
+
+        session_ranges = sorted(self.session_ranges + other.session_ranges)
+        for (_, previous_stop), (next_start, _) in zip(session_ranges, session_ranges[1:]):
+            if next_start < previous_stop:
+                raise ValueError(
+                    "Partial results must cover disjoint session ranges. Provided: ",
+                    session_ranges,
+                )
+
+        count_tables = {}
+        for column in SESSION_DATA_COLUMNS:
+            values = np.concatenate([self.count_tables[column][0], other.count_tables[column][0]])
+            counts = np.concatenate([self.count_tables[column][1], other.count_tables[column][1]])
+            merged_values, inverse = np.unique(values, return_inverse=True)
+            count_tables[column] = (
+                merged_values,
+                np.bincount(inverse, weights=counts, minlength=len(merged_values)).astype(np.int64),
+            )
+
+        if self.data_blocks is not None and other.data_blocks is not None:
+            data_blocks = {**self.data_blocks, **other.data_blocks}
+        else:
+            data_blocks = None
+
+        return PartialResult(
+            config_hash=self.config_hash,
+            session_ranges=session_ranges,
+            count_tables=count_tables,
+            sums=self.sums + other.sums,
+            sums_of_squares=self.sums_of_squares + other.sums_of_squares,
+            data_blocks=data_blocks,
+        )
+
+    def is_complete(self, num_simulations):
+        """
+        Check whether the merged session ranges cover sessions [0, num_simulations) without gaps.
+        """
+
+        covered = 0
+        for start, stop in sorted(self.session_ranges):
+            if start != covered:
+                return False
+            covered = stop
+
+        return covered == num_simulations
+
+    def mean(self, column):
+        return self.sums[SESSION_DATA_COLUMNS.index(column)] / self.num_sessions
+
+    def variance(self, column):
+        """
+        Sample variance (ddof=1) of a column, from the exact integer moments.
+        """
+
+        index = SESSION_DATA_COLUMNS.index(column)
+        num_sessions = self.num_sessions
+
+        return (
+            self.sums_of_squares[index] - self.sums[index] ** 2 / num_sessions
+        ) / (num_sessions - 1)
+
+    def to_dataframe(self):
+        """
+        Reassemble the kept session data blocks into a DataFrame ordered by session index, matching
+        `GachaSim.sim_results` of a single-machine run.
+        """
+
+        if self.data_blocks is None:
+            raise ValueError(
+                "This partial result does not hold session data. Provided: ",
+                "keep_data=False",
+            )
+
+        return pd.DataFrame(
+            np.concatenate([self.data_blocks[start] for start in sorted(self.data_blocks)]),
+            columns=SESSION_DATA_COLUMNS,
+        )
+
+    def save(self, path):
+        """
+        Save the partial result as a NumPy .npz file.
+        """
+
+        arrays = {
+            "config_hash": np.array(self.config_hash),
+            "session_ranges": np.array(self.session_ranges, dtype=np.int64).reshape(-1, 2),
+            "sums": self.sums,
+            "sums_of_squares": self.sums_of_squares,
+        }
+        for column, (values, counts) in self.count_tables.items():
+            arrays[f"values__{column}"] = values
+            arrays[f"counts__{column}"] = counts
+        for start, block in (self.data_blocks or {}).items():
+            arrays[f"data__{start}"] = block
+
+        with open(path, "wb") as file:
+            np.savez(file, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a partial result saved with `save()`.
+        """
+
+        with np.load(path) as arrays:
+            data_blocks = {
+                int(name.split("__")[1]): arrays[name]
+                for name in arrays.files
+                if name.startswith("data__")
+            }
+
+            return cls(
+                config_hash=str(arrays["config_hash"]),
+                session_ranges=arrays["session_ranges"].tolist(),
+                count_tables={
+                    column: (arrays[f"values__{column}"], arrays[f"counts__{column}"])
+                    for column in SESSION_DATA_COLUMNS
+                },
+                sums=arrays["sums"],
+                sums_of_squares=arrays["sums_of_squares"],
+                data_blocks=data_blocks or None,
+            )
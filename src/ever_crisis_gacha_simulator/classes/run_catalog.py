@@ -0,0 +1,343 @@
+import sqlite3
+from datetime import datetime, timezone
+import pandas as pd
+from ever_crisis_gacha_simulator.session_kernels import generate_session_key
+from ever_crisis_gacha_simulator.sharding import generate_config_hash
+
+
+RUN_COLUMNS = [
+    "run_id",
+    "cache_key",
+    "banner_name",
+    "session_criterion",
+    "criterion_value",
+    "target_weapon_type",
+    "starting_weapon_parts",
+    "max_crystals_spent",
+    "seed_value",
+    "num_simulations",
+    "engine",
+    "sampling",
+    "seconds",
+    "sessions_per_second",
+    "recorded_at",
+]
+
+# Filters accepted by `RunCatalog.query()` and `RunCatalog.runs()`
+RUN_FILTERS = [
+    "cache_key",
+    "banner_name",
+    "session_criterion",
+    "criterion_value",
+    "target_weapon_type",
+    "starting_weapon_parts",
+    "max_crystals_spent",
+    "engine",
+    "sampling",
+]
+
+# Columns telling the scenarios of `RunCatalog.query(latest_only=True)` apart
+SCENARIO_COLUMNS = [
+    "banner_name",
+    "session_criterion",
+    "criterion_value",
+    "target_weapon_type",
+    "starting_weapon_parts",
+    "max_crystals_spent",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cache_key TEXT NOT NULL,
+    banner_name TEXT NOT NULL,
+    session_criterion TEXT NOT NULL,
+    criterion_value INTEGER NOT NULL,
+    target_weapon_type TEXT NOT NULL,
+    starting_weapon_parts INTEGER NOT NULL,
+    max_crystals_spent INTEGER,
+    seed_value TEXT,
+    num_simulations INTEGER NOT NULL,
+    engine TEXT NOT NULL,
+    sampling TEXT NOT NULL,
+    seconds REAL,
+    sessions_per_second REAL,
+    recorded_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS statistics (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    column_name TEXT NOT NULL,
+    statistic TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, column_name, statistic)
+);
+CREATE INDEX IF NOT EXISTS runs_by_scenario
+    ON runs (banner_name, session_criterion, criterion_value, target_weapon_type);
+CREATE INDEX IF NOT EXISTS runs_by_cache_key ON runs (cache_key);
+CREATE INDEX IF NOT EXISTS statistics_by_name ON statistics (column_name, statistic, run_id);
+"""
+
+
+class RunCatalog:
+    """
+    Class representing a SQLite catalog of past simulation runs. Each recorded run keeps its configuration, its
+    cache key (the hash of everything that determines its sessions, see `sharding.generate_config_hash`), its
+    run time, and its `GachaSim.summary()` table, so questions across many runs are answered from the catalog
+    without loading or re-running any simulation.
+
+    Example:
+        catalog = RunCatalog("runs.sqlite")
+        catalog.record(gacha_sim)
+        catalog.query("P(OB >= 6)", session_criterion="crystals_spent", criterion_value=21_000)
+    """
+
+    def __init__(self, path):
+
+        self.path = str(path)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        self.add_missing_columns()
+
+    def add_missing_columns(self):
+        """
+        Add the columns of newer catalog versions to a catalog created before them. Runs recorded before the
+        crystal cap was recorded were uncapped, so their `max_crystals_spent` is NULL.
+        """
+
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(runs)")}
+        if "max_crystals_spent" not in columns:
+            with self.connection:
+                self.connection.execute("ALTER TABLE runs ADD COLUMN max_crystals_spent INTEGER")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def record(self, gacha_sim, engine=None, sampling=None, seconds=None):
+        """
+        Record a `GachaSim` run and its summary statistics.
+
+        Args:
+            gacha_sim (GachaSim): A `GachaSim` with results.
+            engine (str): Engine the run used. Default value of None (taken from the run, or 'reference').
+            sampling (str): Sampling mode the run used. Default value of None (taken from the run, or 'plain').
+            seconds (float): Run time in seconds. Default value of None (taken from `gacha_sim.run_seconds`).
+
+        Returns:
+            int: The run's id in the catalog.
+        """
+
+        row = self.generate_run_row(gacha_sim, engine=engine, sampling=sampling, seconds=seconds)
+
+        with self.connection:
+            cursor = self.connection.execute(
+                f"INSERT INTO runs ({', '.join(RUN_COLUMNS[1:])}) VALUES ({', '.join('?' * (len(RUN_COLUMNS) - 1))})",
+                [row[column] for column in RUN_COLUMNS[1:]],
+            )
+            run_id = cursor.lastrowid
+            self.insert_statistics(run_id, gacha_sim)
+
+        return run_id
+
+    def update(self, run_id, gacha_sim, engine=None, sampling=None, seconds=None):
+        """
+        Replace a recorded run with a larger run of the same sessions, such as the run after
+        `GachaSim.add_sims()`, so the catalog keeps one entry per run rather than one per extension.
+
+        Args:
+            run_id (int): The id of the recorded run.
+            gacha_sim (GachaSim): A `GachaSim` with results, on the recorded run's cache key.
+            engine (str): As in `record()`.
+            sampling (str): As in `record()`.
+            seconds (float): As in `record()`.
+        """
+
+        row = self.generate_run_row(gacha_sim, engine=engine, sampling=sampling, seconds=seconds)
+
+        recorded = self.connection.execute("SELECT cache_key FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if recorded is None or recorded[0] != row["cache_key"]:
+            raise ValueError(
+                "Only a run with the same cache key as the recorded run can update it. Provided: ",
+                row["cache_key"],
+            )
+
+        with self.connection:
+            self.connection.execute(
+                "UPDATE runs SET num_simulations = ?, seconds = ?, sessions_per_second = ?, recorded_at = ? "
+                "WHERE run_id = ?",
+                (
+                    row["num_simulations"],
+                    row["seconds"],
+                    row["sessions_per_second"],
+                    row["recorded_at"],
+                    run_id,
+                ),
+            )
+            self.connection.execute("DELETE FROM statistics WHERE run_id = ?", (run_id,))
+            self.insert_statistics(run_id, gacha_sim)
+
+    def generate_run_row(self, gacha_sim, engine=None, sampling=None, seconds=None):
+        """
+        Build the `runs` table row of a `GachaSim` run, keyed by `RUN_COLUMNS` (without the run id).
+        """
+
+        if gacha_sim.sim_results is None:
+            raise ValueError(
+                "Only runs with results can be recorded; call `run_sims` first. Provided: ",
+                gacha_sim.sim_results,
+            )
+
+        metadata = gacha_sim.metadata
+        session_stream = gacha_sim.session_stream or {}
+        engine = engine or session_stream.get("engine", "reference")
+        sampling = sampling or session_stream.get("sampling", "plain")
+        # Reference runs have no session key, so their seed value stands in for it
+        key = session_stream.get("key", metadata["seed_value"])
+        # Importance-sampled runs of other tilts are weighted differently, so their tilts are part of the key
+        sampling_key = (sampling, gacha_sim.importance_tilts) if sampling == "importance" else sampling
+
+        seconds = seconds if seconds is not None else gacha_sim.run_seconds
+        num_simulations = len(gacha_sim.sim_results)
+
+        return {
+            "cache_key": generate_config_hash(metadata, key, sampling=sampling_key, engine=engine),
+            "banner_name": metadata["banner_info"]["metadata"]["name"],
+            "session_criterion": metadata["session_criterion"],
+            "criterion_value": metadata["criterion_value"],
+            "target_weapon_type": metadata["target_weapon_type"],
+            "starting_weapon_parts": metadata["starting_weapon_parts"],
+            "max_crystals_spent": metadata.get("max_crystals_spent"),
+            "seed_value": None if metadata["seed_value"] is None else str(metadata["seed_value"]),
+            "num_simulations": num_simulations,
+            "engine": engine,
+            "sampling": sampling,
+            "seconds": seconds,
+            "sessions_per_second": num_simulations / seconds if seconds else None,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def insert_statistics(self, run_id, gacha_sim):
+        """
+        Store the `GachaSim.summary()` table of a run.
+        """
+
+        self.connection.executemany(
+            "INSERT INTO statistics (run_id, column_name, statistic, value) VALUES (?, ?, ?, ?)",
+            [
+                (run_id, column, statistic, float(value))
+                for column, statistic, value in gacha_sim.summary().itertuples(index=False)
+            ],
+        )
+
+    def runs(self, **filters):
+        """
+        Return the recorded runs matching `filters` (any of `RUN_FILTERS`, e.g. banner_name='...'), newest first.
+        """
+
+        where, parameters = self.where_clause(filters)
+
+        return pd.read_sql_query(
+            f"SELECT * FROM runs {where} ORDER BY run_id DESC", self.connection, params=parameters
+        )
+
+    def query(self, statistic, column="overboost", latest_only=True, **filters):
+        """
+        Return one statistic of the `GachaSim.summary()` tables of every run matching `filters`, e.g.
+        query("P(OB >= 6)", session_criterion="crystals_spent", criterion_value=21_000) for the probability of
+        OB6 on every banner with 21,000 crystals.
+
+        Args:
+            statistic (str): A statistic of `GachaSim.summary()`, such as 'p50' or 'P(OB >= 6)'.
+            column (str): The summary column of the statistic. Default value of 'overboost'.
+            latest_only (bool): Keep only the newest run of each scenario (banner, criterion, criterion value,
+                target weapon type, starting weapon parts and crystal cap, see `SCENARIO_COLUMNS`). Default
+                value of True.
+            **filters: Run filters, any of `RUN_FILTERS`.
+
+        Returns:
+            pandas.DataFrame: One row per run, with the run's configuration and the statistic's `value`.
+        """
+
+        where, parameters = self.where_clause(filters, table="runs")
+        where = f"{where} {'AND' if where else 'WHERE'} statistics.column_name = ? AND statistics.statistic = ?"
+        parameters += [column, statistic]
+
+        results = pd.read_sql_query(
+            f"""
+            SELECT runs.*, statistics.value
+            FROM runs JOIN statistics ON statistics.run_id = runs.run_id
+            {where}
+            ORDER BY runs.run_id DESC
+            """,
+            self.connection,
+            params=parameters,
+        )
+
+        if latest_only:
+            results = results.drop_duplicates(SCENARIO_COLUMNS)
+
+        return results.reset_index(drop=True)
+
+    def summary(self, run_id):
+        """
+        Return the stored `GachaSim.summary()` table of a run.
+        """
+
+        return pd.read_sql_query(
+            "SELECT column_name AS column, statistic, value FROM statistics WHERE run_id = ? ORDER BY rowid",
+            self.connection,
+            params=[run_id],
+        )
+
+    def lookup(self, gacha_sim, engine="numpy", sampling="plain"):
+        """
+        Find the largest recorded run with the same sessions as `gacha_sim` would simulate with a seeded run on
+        `engine` and `sampling`, to reuse its summary instead of re-running it.
+
+        Returns:
+            int: The run's id, or None when no such run was recorded (or `gacha_sim` has no seed value).
+        """
+
+        if gacha_sim.metadata["seed_value"] is None:
+            return None
+
+        if engine == "reference":
+            key = gacha_sim.metadata["seed_value"]
+        else:
+            key, _ = generate_session_key(gacha_sim.metadata["seed_value"])
+
+        row = self.connection.execute(
+            "SELECT run_id FROM runs WHERE cache_key = ? ORDER BY num_simulations DESC, run_id DESC LIMIT 1",
+            (generate_config_hash(gacha_sim.metadata, key, sampling=sampling, engine=engine),),
+        ).fetchone()
+
+        return None if row is None else row[0]
+
+    @staticmethod
+    def where_clause(filters, table="runs"):
+        """
+        Build a parameterized WHERE clause from run filters.
+        """
+
+        unknown_filters = set(filters) - set(RUN_FILTERS)
+        if unknown_filters:
+            raise ValueError(
+                f"Filters must be among {RUN_FILTERS}. Provided: ", sorted(unknown_filters)
+            )
+
+        if not filters:
+            return "", []
+
+        # `IS` also matches NULL, e.g. max_crystals_spent=None for uncapped runs
+        return (
+            "WHERE " + " AND ".join(
+                f"{table}.{name} {'IS' if value is None else '='} ?" for name, value in filters.items()
+            ),
+            list(filters.values()),
+        )
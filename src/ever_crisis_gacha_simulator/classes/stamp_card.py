@@ -1,4 +1,5 @@
 import pandas as pd
+from ever_crisis_gacha_simulator.constants import STAMP_CARD_RULES
 
 
 class StampCard:
@@ -8,12 +9,7 @@ class StampCard:
 
     def __init__(self, stamp_card_position_dicts):
 
-        self.rule_enum = [
-            "guaranteed_featured_five_star_draw",
-            "guaranteed_five_star_draw",
-            "guaranteed_four_star_draw",
-            "guaranteed_not_desired_five_star_draw",
-        ]
+        self.rule_enum = list(STAMP_CARD_RULES)
 
         self.position_and_rule_df = pd.DataFrame(stamp_card_position_dicts)
 
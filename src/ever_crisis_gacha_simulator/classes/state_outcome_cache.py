@@ -0,0 +1,175 @@
+import copy
+import numpy as np
+from ever_crisis_gacha_simulator.classes.compiled_banner import CompiledBanner
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.constants import *
+from ever_crisis_gacha_simulator.exact_solver import ExactPartsDistribution
+from ever_crisis_gacha_simulator.population import stamp_card_index, validate_stamp_card_positions
+
+
+# Highest overboost level the cache answers exactly
+STATE_CACHE_MAX_OVERBOOST = 10
+
+
+class StateOutcomeCache:
+    """
+    Class answering questions asked in the middle of a banner, such as "I'm on page_two with 7 stamps and 450
+    weapon parts; what are my odds of OB6 with 15,000 more crystals?", from a memoized cache keyed by the
+    player's stamp card state (card index * 12 + card value).
+
+    The odds only depend on the stamp card state, the weapon parts held and the crystals still to spend: the
+    crystals already spent change nothing. Weapon parts only shift the goal, as P(OB >= k) with p weapon parts
+    is the probability of gaining at least (k + 1) * 200 - p weapon parts. So each card state needs one exact
+    solver run (see `exact_solver.ExactPartsDistribution`) from 0 weapon parts, whose upper tails after every
+    ten draw are kept and extended only as far as the largest budget asked so far. Every later question on that
+    card state, with any weapon parts and any budget within it, is a lookup.
+
+    Full outcome distributions (stamps, weapons drawn, ...) have no exact solver, so `simulate` memoizes a
+    seeded population run per state instead.
+
+    Example:
+        cache = StateOutcomeCache(ZACK_SEPHIROTH_LIMIT_BREAK_BANNER, "featured")
+        cache.probability("page_two", 7, weapon_parts=450, crystals=15_000, overboost=6)
+    """
+
+    def __init__(self, banner_info, target_weapon_type, max_overboost=STATE_CACHE_MAX_OVERBOOST):
+
+        self.banner_info = banner_info
+        self.target_weapon_type = target_weapon_type
+        self.max_overboost = max_overboost
+        self.max_weapon_parts = (max_overboost + 1) * WEAPON_PARTS_PER_OVERBOOST
+        self.compiled_banner = CompiledBanner(banner_info, target_weapon_type)
+
+        # The transitions only depend on the banner, so every card state's solver copies them from this one
+        self.template_solver = ExactPartsDistribution(self.compiled_banner, self.max_weapon_parts)
+
+        # Card states mapped to their solvers and to their P(weapon parts gained >= g) after each ten draw
+        self.solvers = {}
+        self.gain_tails = {}
+        self.simulations = {}
+
+    def card_state(self, stamp_card, stamp_value):
+        """
+        Return the card state of a stamp card position, with the stamp card given by its index or its name
+        (e.g. 'page_two').
+        """
+
+        card_index = stamp_card_index(self.banner_info["stamp_cards_list"], stamp_card)
+        validate_stamp_card_positions(card_index, stamp_value, self.compiled_banner.num_stamp_cards)
+
+        return card_index * MAX_STAMP_CARD_VALUE + int(stamp_value)
+
+    def gain_tail(self, card_state, num_ten_draws):
+        """
+        Return the cached upper tail of the weapon parts gained from `card_state` in `num_ten_draws` ten draws,
+        stepping that card state's solver further first if needed.
+
+        Returns:
+            numpy.ndarray: P(weapon parts gained >= g) for g from 0 to `max_weapon_parts`.
+        """
+
+        if card_state not in self.solvers:
+            solver = copy.copy(self.template_solver)
+            solver.reset(starting_card_state=card_state)
+            self.solvers[card_state] = solver
+            self.gain_tails[card_state] = [parts_upper_tail(solver.weapon_parts_distribution())]
+
+        solver = self.solvers[card_state]
+        gain_tails = self.gain_tails[card_state]
+        while solver.num_ten_draws < num_ten_draws:
+            solver.step()
+            gain_tails.append(parts_upper_tail(solver.weapon_parts_distribution()))
+
+        return gain_tails[num_ten_draws]
+
+    def overboost_probabilities(self, stamp_card, stamp_value, weapon_parts, crystals):
+        """
+        Exact probability of reaching each overboost level from a mid-banner state.
+
+        Args:
+            stamp_card: The current stamp card, by index or name (e.g. 'page_two').
+            stamp_value (int): Stamps on the current stamp card, from 0 to 11.
+            weapon_parts (int): Targeted weapon parts already held.
+            crystals (int): Crystals still to spend, rounded down to whole ten draws.
+
+        Returns:
+            numpy.ndarray: P(OB >= k) for k from 0 to `max_overboost`.
+        """
+
+        if weapon_parts < 0 or crystals < 0:
+            raise ValueError(
+                "`weapon_parts` and `crystals` must not be negative. Provided: ", (weapon_parts, crystals)
+            )
+
+        num_ten_draws = crystals // TEN_DRAW_CRYSTAL_COST
+        gain_tail = self.gain_tail(self.card_state(stamp_card, stamp_value), num_ten_draws)
+
+        required_gains = (np.arange(self.max_overboost + 1) + 1) * WEAPON_PARTS_PER_OVERBOOST - weapon_parts
+
+        return np.where(required_gains <= 0, 1.0, gain_tail[np.clip(required_gains, 0, None)])
+
+    def probability(self, stamp_card, stamp_value, weapon_parts, crystals, overboost):
+        """
+        Exact probability of reaching `overboost` from a mid-banner state, see `overboost_probabilities`.
+        """
+
+        if not 0 <= overboost <= self.max_overboost:
+            raise ValueError(
+                f"`overboost` must be between 0 and {self.max_overboost}. Provided: ", overboost
+            )
+
+        return float(self.overboost_probabilities(stamp_card, stamp_value, weapon_parts, crystals)[overboost])
+
+    def simulate(
+            self,
+            stamp_card,
+            stamp_value,
+            weapon_parts,
+            crystals,
+            num_simulations=100_000,
+            seed_value=0,
+            n_jobs=2,
+            engine="numpy",
+            ):
+        """
+        Simulate the sessions of a mid-banner state spending `crystals` more crystals, once per state, budget,
+        number of simulations, seed value and engine; repeated calls return the same `GachaSim`.
+
+        Returns:
+            GachaSim: A population run whose sessions all start from the state, with `sim_results` counting
+                the weapon parts held in total and the stamps and crystals of the remaining budget only.
+        """
+
+        card_state = self.card_state(stamp_card, stamp_value)
+        simulation_key = (card_state, weapon_parts, crystals, num_simulations, seed_value, engine)
+
+        if simulation_key not in self.simulations:
+            gacha_sim = GachaSim(
+                session_criterion="crystals_spent",
+                criterion_value=crystals,
+                target_weapon_type=self.target_weapon_type,
+                banner_info=self.banner_info,
+                seed_value=seed_value,
+                starting_weapon_parts=weapon_parts,
+                num_simulations=num_simulations,
+            )
+            gacha_sim.run_population_sims(
+                {
+                    "starting_stamp_card": card_state // MAX_STAMP_CARD_VALUE,
+                    "starting_stamp_value": card_state % MAX_STAMP_CARD_VALUE,
+                },
+                n_jobs=n_jobs,
+                engine=engine,
+                progress=False,
+            )
+            self.simulations[simulation_key] = gacha_sim
+
+        return self.simulations[simulation_key]
+
+
+def parts_upper_tail(distribution):
+    """
+    Return P(weapon parts >= g) for every g of a capped weapon parts distribution.
+    """
+
+    return np.clip(np.cumsum(distribution[::-1])[::-1], 0, 1)
@@ -1,6 +1,7 @@
 import numpy as np
 from decimal import Decimal, getcontext
-from ever_crisis_gacha_simulator.constants import OVERALL_RARITY_RATES_DICT
+from ever_crisis_gacha_simulator.constants import OVERALL_RARITY_RATES_DICT, STAMP_CARD_RULE_SPECS
+from ever_crisis_gacha_simulator.stamp_rules import pool_category_probabilities, rarity_float_range
 
 
 getcontext().prec = 16  # Set Decimal to continue to a max of 16 decimal places
@@ -29,83 +30,39 @@ class TenDraw:
 
     def draws_for_special_rules(self):
         """
-        Perform correspending operation for each rule within the special rules list.
+        Perform a draw for each rule within the special rules list, following the rule's spec in
+        `STAMP_CARD_RULE_SPECS`.
         """
 
-        pull_result_strings = []
+        return [self.special_rule_draw(rule) for rule in self.special_rules]
 
-        for rule in self.special_rules:
-            if rule == "guaranteed_featured_five_star_draw":
-                pull_result_strings.append(
-                    self.guaranteed_featured_five_star_draw(desired=True)
-                )
-            elif rule == "guaranteed_five_star_draw":
-                pull_result_strings.append(self.guaranteed_five_star_draw())
-            elif rule == "guaranteed_four_star_draw":
-                pull_result_strings.append(self.guaranteed_four_star_draw())
-            elif rule == "guaranteed_not_desired_five_star_draw":
-                pull_result_strings.append(
-                    self.guaranteed_featured_five_star_draw(desired=False)
-                )
-
-        return pull_result_strings
-
-    def guaranteed_featured_five_star_draw(self, desired):
+    def special_rule_draw(self, rule, seed=None):
         """
-        Pass a float with value restricted to targeted 5* range through `determine_pull_result()`, but only if the targeted weapon
-        is a featured weapon.
+        Perform the draw granted by a stamp card rule and return the outcome as a string. Draws from the 'any'
+        pool pass a standard float through `determine_pull_result()`, with floats of a lower rarity than the
+        rule's redrawn within the rule's rarity; draws from the other pools pick an outcome category of the
+        rule's rarity (see `stamp_rules.pool_category_probabilities()`).
         """
 
-        if (
-            desired and self.target_weapon_type == "featured"
-        ):  # `desired` means the featured weapon in question is the one you actually want.
-
-            random_float = np.random.default_rng().uniform(
-                0, self.target_weapon_rates_dict["five_star"]
-            )
-
-            return self.determine_pull_result(random_float)
-
-        elif not desired and self.target_weapon_type == "featured":
-
-            # Float should be in the range to produced a nontargeted_featured_five_star
-            random_float = np.random.default_rng().uniform(
-                self.target_weapon_rates_dict["five_star"],
-                Decimal("2.0") * self.target_weapon_rates_dict["five_star"],
-            )
-
-            return self.determine_pull_result(random_float)
-
-        else:
-            # For now, this will make sure a 5* weapon gets logged.
-            # Will change this once I allow the code to log featured and wishlisted simultaneously.
+        rule_spec = STAMP_CARD_RULE_SPECS[rule]
+        rng = np.random.default_rng(seed)
 
-            random_float = np.random.default_rng().uniform(
-                self.target_weapon_rates_dict["five_star"],
-                OVERALL_RARITY_RATES_DICT["five_star"],
-            )
+        if rule_spec["pool"] == "any":
+            low, high = rarity_float_range(rule_spec["rarity"])
+            random_float = rng.uniform(0, 1)
+            if random_float >= high:
+                random_float = rng.uniform(low, high)
 
             return self.determine_pull_result(random_float)
 
-    def guaranteed_five_star_draw(self, seed=None):
-        """
-        Pass a float with value restricted to 5* outcomes through `determine_pull_result()`.
-        """
-
-        random_float = np.random.default_rng(seed).uniform(
-            0, OVERALL_RARITY_RATES_DICT["five_star"]
+        category_probabilities = pool_category_probabilities(
+            rule_spec["pool"], self.target_weapon_type, self.num_featured_weapons
+        )
+        category = rng.choice(
+            list(category_probabilities), p=list(category_probabilities.values())
         )
 
-        return self.determine_pull_result(random_float)
-
-    def guaranteed_four_star_draw(self, seed=None):
-        """
-        Pass a float into `determine_pull_result()` and process with all 3* probability rolled into 4* probability.
-        """
-
-        random_float = np.random.default_rng(seed).uniform(0, 1)
-
-        return self.determine_pull_result(random_float, guaranteed_four_star=True)
+        return f"{category}_{rule_spec['rarity']}"
 
     def determine_pull_result(self, random_float, guaranteed_four_star=False):
         """
@@ -0,0 +1,213 @@
+import numpy as np
+import pandas as pd
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.confidence_intervals import (
+    paired_bootstrap_quantile_difference_intervals,
+    paired_difference_interval,
+)
+from ever_crisis_gacha_simulator.session_kernels import generate_session_key
+
+
+def run_paired_sims(
+    configs,
+    num_simulations=10_000,
+    seed_value=None,
+    n_jobs=2,
+    engine="numpy",
+    sampling="plain",
+    progress=True,
+    executor="joblib",
+):
+    """
+    Run one `GachaSim` per scenario, all driven by the same per-session random streams (common random numbers):
+    session i of every scenario uses the same stamp and draw floats, so differences between scenarios come
+    from the scenarios rather than from luck.
+
+    Args:
+        configs (dict): Scenario names mapped to the `GachaSim` arguments of each scenario (session_criterion,
+            criterion_value, target_weapon_type, banner_info, and optionally starting_weapon_parts).
+        num_simulations (int): Number of sessions per scenario. Default value of 10,000.
+        seed_value (int): Seed value shared by every scenario. Unseeded comparisons still share one random
+            stream. Default value of None.
+        n_jobs (int): Number of CPU cores to utilize for simulations. Default value of 2.
+        engine (str): One of 'numpy', 'jit', or 'multinomial'. Default value of 'numpy'.
+        sampling (str): One of 'plain', 'antithetic', 'stratified', or 'sobol'. Default value of 'plain'.
+        progress: Progress bar or callbacks, as in `GachaSim.run_sims`. Default value of True.
+        executor: Executor backend, as in `GachaSim.run_sims`. Default value of 'joblib'.
+
+    Returns:
+        dict: Scenario names mapped to their `GachaSim`, with results.
+    """
+
+    if engine not in ["numpy", "jit", "multinomial"]:
+        raise ValueError(
+            "`engine` must be a str of either 'numpy', 'jit', or 'multinomial'. Provided: ",
+            engine,
+        )
+
+    if len(configs) < 2:
+        raise ValueError("At least two scenarios are needed for a comparison. Provided: ", list(configs))
+
+    # Pin an unseeded comparison to one seed stream, so every scenario sees the same random numbers
+    if seed_value is None:
+        _, seed_value = generate_session_key(None)
+
+    gacha_sims = {}
+    for name, config in configs.items():
+        gacha_sim = GachaSim(**config, seed_value=seed_value, num_simulations=num_simulations)
+        gacha_sim.run_sims(
+            n_jobs=n_jobs, engine=engine, sampling=sampling, progress=progress, executor=executor
+        )
+        gacha_sims[name] = gacha_sim
+
+    return gacha_sims
+
+
+def paired_differences(
+    gacha_sims,
+    probabilities=(),
+    percentiles=(),
+    confidence=0.95,
+    num_resamples=2_000,
+    seed=None,
+):
+    """
+    Compare every scenario of `run_paired_sims` with the first one, session by session.
+
+    Args:
+        gacha_sims (dict): Scenario names mapped to `GachaSim` objects run on common random numbers. The
+            first scenario is the baseline.
+        probabilities (list): (column, value) pairs. Each compares the probability of the same event as
+            `GachaSim.return_value_probability` (at least `value` for 'targeted_weapon_parts', at most
+            `value` otherwise).
+        percentiles (list): (column, percentile) pairs, with percentiles between 0 and 100.
+        confidence (float): Confidence level of the intervals. Default value of 0.95.
+        num_resamples (int): Number of paired bootstrap resamples for percentiles. Default value of 2,000.
+        seed (int): Seed value for the bootstrap resamples. Default value of None.
+
+    Returns:
+        pandas.DataFrame: One row per scenario and statistic, with the baseline and scenario estimates, their
+            `difference` (scenario minus baseline) with its `low` and `high` bounds, and, for probabilities,
+            the `variance_reduction` against comparing independent runs. Probabilities are in percent.
+    """
+
+    names = list(gacha_sims)
+    baseline_name = names[0]
+    baseline_results = gacha_sims[baseline_name].sim_results
+
+    rows = []
+    for name in names[1:]:
+        sim_results = gacha_sims[name].sim_results
+        if len(sim_results) != len(baseline_results):
+            raise ValueError(
+                "Paired scenarios must have the same number of sessions. Provided: ",
+                (len(baseline_results), len(sim_results)),
+            )
+
+        for column, value in probabilities:
+            if column == "targeted_weapon_parts":
+                baseline_events = baseline_results[column].to_numpy() >= value
+                events = sim_results[column].to_numpy() >= value
+            else:
+                baseline_events = baseline_results[column].to_numpy() <= value
+                events = sim_results[column].to_numpy() <= value
+
+            interval = paired_difference_interval(baseline_events, events, confidence=confidence)
+            rows.append(
+                {
+                    "baseline": baseline_name,
+                    "scenario": name,
+                    "statistic": f"P({column} {'>=' if column == 'targeted_weapon_parts' else '<='} {value})",
+                    "baseline_estimate": 100 * baseline_events.mean(),
+                    "scenario_estimate": 100 * events.mean(),
+                    "difference": 100 * interval["difference"],
+                    "low": 100 * interval["low"],
+                    "high": 100 * interval["high"],
+                    "variance_reduction": interval["variance_reduction"],
+                }
+            )
+
+        for column, percentile in percentiles:
+            if not 0 <= percentile <= 100:
+                raise ValueError("`percentile` must be between 0 and 100. Provided: ", percentile)
+
+            difference, bounds = paired_bootstrap_quantile_difference_intervals(
+                baseline_results[column].to_numpy(),
+                sim_results[column].to_numpy(),
+                [percentile / 100],
+                confidence=confidence,
+                num_resamples=num_resamples,
+                seed=seed,
+            )
+            baseline_estimate = np.quantile(
+                baseline_results[column].to_numpy(), percentile / 100, method="inverted_cdf"
+            )
+            rows.append(
+                {
+                    "baseline": baseline_name,
+                    "scenario": name,
+                    "statistic": f"{column} p{percentile:g}",
+                    "baseline_estimate": baseline_estimate,
+                    "scenario_estimate": baseline_estimate + difference[0],
+                    "difference": difference[0],
+                    "low": bounds[0, 0],
+                    "high": bounds[0, 1],
+                    "variance_reduction": np.nan,
+                }
+            )
+
+    return pd.DataFrame(rows)
+
+
+def compare(
+    configs,
+    probabilities=(),
+    percentiles=(),
+    num_simulations=10_000,
+    seed_value=None,
+    n_jobs=2,
+    engine="numpy",
+    confidence=0.95,
+    progress=True,
+    executor="joblib",
+):
+    """
+    Compare scenarios (such as two banners, or featured versus wishlisted targets) with common random numbers:
+    run every scenario on the same per-session random streams, then report paired differences against the
+    first scenario. Shared randomness cancels out of the differences, so small differences show up with far
+    fewer sessions than comparing independent runs.
+
+    Args:
+        configs (dict): Scenario names mapped to `GachaSim` arguments (see `run_paired_sims`). The first
+            scenario is the baseline.
+        probabilities (list): (column, value) pairs to compare probabilities of (see `paired_differences`).
+        percentiles (list): (column, percentile) pairs to compare percentiles of.
+        num_simulations (int): Number of sessions per scenario. Default value of 10,000.
+        seed_value (int): Seed value shared by every scenario. Default value of None.
+        n_jobs (int): Number of CPU cores to utilize for simulations. Default value of 2.
+        engine (str): One of 'numpy', 'jit', or 'multinomial'. Default value of 'numpy'.
+        confidence (float): Confidence level of the intervals. Default value of 0.95.
+        progress: Progress bar or callbacks, as in `GachaSim.run_sims`. Default value of True.
+        executor: Executor backend, as in `GachaSim.run_sims`. Default value of 'joblib'.
+
+    Returns:
+        pandas.DataFrame: The paired differences (see `paired_differences`).
+    """
+
+    gacha_sims = run_paired_sims(
+        configs,
+        num_simulations=num_simulations,
+        seed_value=seed_value,
+        n_jobs=n_jobs,
+        engine=engine,
+        progress=progress,
+        executor=executor,
+    )
+
+    return paired_differences(
+        gacha_sims,
+        probabilities=probabilities,
+        percentiles=percentiles,
+        confidence=confidence,
+        seed=seed_value,
+    )
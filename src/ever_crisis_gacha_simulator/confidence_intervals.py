@@ -0,0 +1,316 @@
+import math
+import numpy as np
+from statistics import NormalDist
+
+
+MAX_CONTINUED_FRACTION_TERMS = 100_000
+BISECTION_STEPS = 64
+
+
+def _incomplete_beta_continued_fraction(x, a, b):
+    """
+    Evaluate the continued fraction of the regularized incomplete beta function with the modified Lentz method.
+    """
+
+    tiny = 1e-300
+    c = 1.0
+    d = 1.0 - (a + b) * x / (a + 1.0)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    fraction = d
+
+    for m in range(1, MAX_CONTINUED_FRACTION_TERMS + 1):
+        # Even step
+        numerator = m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m))
+        d = 1.0 + numerator * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + numerator / c
+        c = c if abs(c) > tiny else tiny
+        fraction *= d * c
+
+        # Odd step
+        numerator = -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))
+        d = 1.0 + numerator * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + numerator / c
+        c = c if abs(c) > tiny else tiny
+        change = d * c
+        fraction *= change
+
+        if abs(change - 1.0) < 1e-15:
+            break
+
+    return fraction
+
+
+def regularized_incomplete_beta(x, a, b):
+    """
+    The regularized incomplete beta function I_x(a, b), i.e. the CDF of a Beta(a, b) distribution at x.
+    """
+
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+
+    log_front = (
+        math.lgamma(a + b)
+        - math.lgamma(a)
+        - math.lgamma(b)
+        + a * math.log(x)
+        + b * math.log1p(-x)
+    )
+
+    # The continued fraction converges quickly on this side of the mean; use symmetry on the other side
+    if x < (a + 1.0) / (a + b + 2.0):
+        return math.exp(log_front) * _incomplete_beta_continued_fraction(x, a, b) / a
+
+    return 1.0 - math.exp(log_front) * _incomplete_beta_continued_fraction(
+        1.0 - x, b, a
+    ) / b
+
+
+def beta_quantile(probability, a, b):
+    """
+    Inverse of `regularized_incomplete_beta` in x, found by bisection.
+    """
+
+    low, high = 0.0, 1.0
+
+    for _ in range(BISECTION_STEPS):
+        middle = (low + high) / 2
+        if regularized_incomplete_beta(middle, a, b) < probability:
+            low = middle
+        else:
+            high = middle
+
+    return (low + high) / 2
+
+
+def clopper_pearson_interval(successes, trials, confidence=0.95):
+    """
+    Exact (Clopper-Pearson) binomial confidence interval for a probability estimated as successes / trials.
+
+    Returns:
+        tuple: Lower and upper bounds of the interval, as fractions.
+    """
+
+    successes = int(successes)
+    trials = int(trials)
+    alpha = 1 - confidence
+
+    low = 0.0 if successes == 0 else beta_quantile(
+        alpha / 2, successes, trials - successes + 1
+    )
+    high = 1.0 if successes == trials else beta_quantile(
+        1 - alpha / 2, successes + 1, trials - successes
+    )
+
+    return low, high
+
+
+def normal_interval(estimate, standard_error, confidence=0.95):
+    """
+    Normal-approximation confidence interval, used for weighted (importance-sampled) estimates.
+    """
+
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+
+    return estimate - z * standard_error, estimate + z * standard_error
+
+
+def count_table(values):
+    """
+    Collapse an array of outcomes into its distinct values and how many times each occurred.
+    """
+
+    return np.unique(np.asarray(values), return_counts=True)
+
+
+def count_table_quantiles(values, counts, quantiles):
+    """
+    Inverted-CDF quantiles (the smallest value whose cumulative share reaches the quantile) of one or more
+    count tables. `counts` may be 1-D, or 2-D with one resampled count table per row.
+    """
+
+    counts = np.atleast_2d(counts)
+    quantiles = np.atleast_1d(quantiles)
+    cumulative_counts = np.cumsum(counts, axis=1)
+    targets = np.maximum(quantiles[None, :] * cumulative_counts[:, -1:], 1)
+
+    positions = np.stack(
+        [
+            (cumulative_counts >= targets[:, [index]]).argmax(axis=1)
+            for index in range(len(quantiles))
+        ],
+        axis=1,
+    )
+
+    return np.asarray(values)[positions]
+
+
+def _resample_counts(counts, num_resamples, method, rng):
+    """
+    Draw `num_resamples` bootstrap resamples of a count table, one per row.
+    """
+
+    counts = np.asarray(counts)
+
+    if method == "poisson":
+        return rng.poisson(counts, size=(num_resamples, len(counts)))
+
+    if method == "multinomial":
+        return rng.multinomial(counts.sum(), counts / counts.sum(), size=num_resamples)
+
+    raise ValueError(
+        "`method` must be a str of either 'poisson' or 'multinomial'. Provided: ",
+        method,
+    )
+
+
+def bootstrap_quantile_intervals(
+    values,
+    counts,
+    quantiles,
+    confidence=0.95,
+    num_resamples=2_000,
+    method="poisson",
+    seed=None,
+):
+    """
+    Percentile bootstrap confidence intervals for quantiles, resampling the count table directly instead of
+    the sessions. 'poisson' gives each distinct value a Poisson(count) resampled count (equivalent to
+    Poisson(1) weights on every session); 'multinomial' redistributes the original total over the values.
+
+    Returns:
+        numpy.ndarray: Array of shape (len(quantiles), 2) with the lower and upper bound for each quantile.
+    """
+
+    resampled_counts = _resample_counts(counts, num_resamples, method, np.random.default_rng(seed))
+    resampled_quantiles = count_table_quantiles(values, resampled_counts, quantiles)
+    alpha = 1 - confidence
+
+    return np.quantile(
+        resampled_quantiles, [alpha / 2, 1 - alpha / 2], axis=0, method="inverted_cdf"
+    ).T
+
+
+def quantile_interval(values, percentile, confidence=0.95, num_resamples=2_000, seed=None):
+    """
+    Return a percentile of session values along with a bootstrap confidence interval of its count table (see
+    `bootstrap_quantile_intervals`).
+
+    Returns:
+        tuple: The percentile value and the lower and upper bounds of its confidence interval. Each is an array
+            when `percentile` is a list.
+    """
+
+    quantiles = np.atleast_1d(percentile) / 100
+    if ((quantiles < 0) | (quantiles > 1)).any():
+        raise ValueError("`percentile` must be between 0 and 100. Provided: ", percentile)
+
+    values, counts = count_table(values)
+    estimates = count_table_quantiles(values, counts, quantiles)[0]
+    bounds = bootstrap_quantile_intervals(
+        values,
+        counts,
+        quantiles,
+        confidence=confidence,
+        num_resamples=num_resamples,
+        seed=seed,
+    )
+
+    if np.ndim(percentile) == 0:
+        return estimates[0], bounds[0, 0], bounds[0, 1]
+
+    return estimates, bounds[:, 0], bounds[:, 1]
+
+
+def paired_difference_interval(first_events, second_events, confidence=0.95):
+    """
+    Difference between the probabilities of two events observed on the same sessions (second minus first),
+    with a normal-approximation interval from the variance of the per-session differences. When both events
+    are driven by the same random numbers they move together, and this variance is far smaller than that of
+    two independent runs.
+
+    Returns:
+        dict: The `difference`, its `low` and `high` bounds, and the `variance_reduction` (the variance of the
+            difference between independent runs of the same size, divided by the paired variance).
+    """
+
+    first_events = np.asarray(first_events, dtype=float)
+    second_events = np.asarray(second_events, dtype=float)
+    num_sessions = len(first_events)
+
+    differences = second_events - first_events
+    paired_variance = differences.var(ddof=1) / num_sessions
+    independent_variance = (
+        first_events.var(ddof=1) + second_events.var(ddof=1)
+    ) / num_sessions
+    low, high = normal_interval(differences.mean(), np.sqrt(paired_variance), confidence=confidence)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance_reduction = np.float64(independent_variance) / paired_variance
+
+    return {
+        "difference": differences.mean(),
+        "low": low,
+        "high": high,
+        "variance_reduction": variance_reduction,
+    }
+
+
+def paired_bootstrap_quantile_difference_intervals(
+    first_values,
+    second_values,
+    quantiles,
+    confidence=0.95,
+    num_resamples=2_000,
+    method="poisson",
+    seed=None,
+):
+    """
+    Percentile bootstrap confidence intervals for differences between quantiles (second minus first) of two
+    outcomes observed on the same sessions. Sessions are resampled as pairs, through the count table of
+    distinct (first, second) pairs, so the intervals keep the pairing.
+
+    Returns:
+        tuple: The quantile differences, and an array of shape (len(quantiles), 2) with their lower and upper
+            bounds.
+    """
+
+    pairs, pair_counts = np.unique(
+        np.stack([first_values, second_values], axis=1), axis=0, return_counts=True
+    )
+    resampled_pair_counts = _resample_counts(
+        pair_counts, num_resamples, method, np.random.default_rng(seed)
+    )
+
+    quantile_values = []
+    for column in range(2):
+        # Each marginal count table sums the pair counts over runs of pairs sorted by that side's value
+        order = np.argsort(pairs[:, column], kind="stable")
+        values, starts = np.unique(pairs[order, column], return_index=True)
+        original = count_table_quantiles(values, np.add.reduceat(pair_counts[order], starts), quantiles)[0]
+        resampled = count_table_quantiles(
+            values, np.add.reduceat(resampled_pair_counts[:, order], starts, axis=1), quantiles
+        )
+        quantile_values.append((original, resampled))
+
+    (first_quantiles, first_resampled), (second_quantiles, second_resampled) = quantile_values
+    alpha = 1 - confidence
+    bounds = np.quantile(
+        second_resampled - first_resampled, [alpha / 2, 1 - alpha / 2], axis=0, method="inverted_cdf"
+    ).T
+
+    return second_quantiles - first_quantiles, bounds
+
+
+def simulations_for_half_width(session_variance, half_width, confidence=0.95):
+    """
+    Number of sessions needed for a mean estimate to have a confidence interval of +/- `half_width`, given the
+    variance of a single session's contribution (p * (1 - p) for a plain Monte Carlo probability p).
+    """
+
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+
+    return math.ceil(z**2 * session_variance / half_width**2)
@@ -5,6 +5,7 @@ getcontext().prec = 16  # Set Decimal to continue to a max of 16 decimal places
 
 ### STATIC AMOUNTS ###
 TEN_DRAW_CRYSTAL_COST = 3000
+DRAWS_PER_TEN_DRAW = 10
 MAX_STAMP_CARD_VALUE = 12
 WEAPON_PARTS_PER_OVERBOOST = 200
 
@@ -32,3 +33,37 @@ TWO_FEATURED_TARGET_FEATURED_RATES_DICT = {
     / OVERALL_RARITY_RATES_DICT["four_star"],
     "three_star": Decimal("0.10"),  # Totaling 0.20 across both featured weapons
 }
+
+### STAMP TABLES ###
+STAMP_ROLL_MAX = 10000
+
+# Inclusive upper bound of the 1-10,000 roll that produces each stamp value
+STAMP_VALUE_ROLL_THRESHOLDS = {
+    1: 4500,
+    2: 8000,
+    3: 9592,
+    4: 9794,
+    5: 9944,
+    6: 9999,
+    12: 10000,
+}
+
+### STAMP CARD RULES ###
+# Each stamp card rule declares the draw it grants (see `stamp_rules.py`), and is compiled into the rate tables of
+# every session engine, so a new rule only needs an entry here:
+#     rarity: The rarity of the granted draw. With the 'any' pool, it is a minimum: standard draws of a lower rarity
+#         are promoted to it, split like its standard rates, and higher rarities keep their standard rates.
+#     pool: Which weapons of that rarity the draw can give. 'any' (standard rates), 'featured' (the featured weapon
+#         the player wants), 'random_featured' (a random featured weapon), 'other_featured' (a featured weapon the
+#         player does not want), or 'chosen' (the player picks the targeted weapon).
+# The rule order is the order of the special draw slots of a ten draw.
+STAMP_CARD_RULE_SPECS = {
+    "guaranteed_featured_five_star_draw": {"rarity": "five_star", "pool": "featured"},
+    "guaranteed_five_star_draw": {"rarity": "five_star", "pool": "any"},
+    "guaranteed_four_star_draw": {"rarity": "four_star", "pool": "any"},
+    "guaranteed_not_desired_five_star_draw": {"rarity": "five_star", "pool": "other_featured"},
+    "guaranteed_featured_four_star_draw": {"rarity": "four_star", "pool": "featured"},
+    "choose_one_five_star_draw": {"rarity": "five_star", "pool": "chosen"},
+}
+
+STAMP_CARD_RULES = list(STAMP_CARD_RULE_SPECS)
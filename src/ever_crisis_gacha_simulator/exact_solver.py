@@ -0,0 +1,190 @@
+import numpy as np
+from ever_crisis_gacha_simulator.constants import *
+
+
+# Most targeted weapon parts a single ten draw can give (ten targeted 5* weapons)
+MAX_TEN_DRAW_WEAPON_PARTS = 10 * 200
+
+# Stop searching for a budget after this many ten draws (3,000,000 crystals)
+MAX_SOLVER_TEN_DRAWS = 1_000
+
+
+class ExactPartsDistribution:
+    """
+    Class computing the exact distribution of a session's targeted weapon parts, one ten draw at a time, as a
+    Markov chain over (stamp card, stamp card value) states. Weapon parts are capped at `max_weapon_parts`, so
+    the cap acts as an absorbing "goal reached" state. Each ten draw convolves every state's parts distribution
+    with the weapon parts distribution of the rules its stamps trigger, using FFTs.
+
+    Attributes:
+        distribution (numpy.ndarray): Probability of each (card state, capped weapon parts) after
+            `num_ten_draws` ten draws, with card state = card index * 12 + card value.
+        num_ten_draws (int): Ten draws performed so far.
+    """
+
+    def __init__(self, compiled_banner, max_weapon_parts, starting_weapon_parts=0, starting_card_state=0):
+
+        if max_weapon_parts < 0:
+            raise ValueError(
+                "`max_weapon_parts` must not be negative. Provided: ", max_weapon_parts
+            )
+
+        self.compiled_banner = compiled_banner
+        self.max_weapon_parts = max_weapon_parts
+        self.num_card_states = compiled_banner.num_stamp_cards * MAX_STAMP_CARD_VALUE
+        self.fft_size = 1 << int(np.ceil(np.log2(max_weapon_parts + 1 + MAX_TEN_DRAW_WEAPON_PARTS)))
+
+        self.reset(starting_weapon_parts=starting_weapon_parts, starting_card_state=starting_card_state)
+
+        self.generate_transitions()
+
+    def reset(self, starting_weapon_parts=0, starting_card_state=0):
+        """
+        Put all the probability on one (card state, weapon parts) state before any ten draw, e.g. a player's
+        position in the middle of a banner. The transitions only depend on the banner, so they are kept.
+        """
+
+        if not 0 <= starting_card_state < self.num_card_states:
+            raise ValueError(
+                f"`starting_card_state` must be between 0 and {self.num_card_states - 1}. Provided: ",
+                starting_card_state,
+            )
+
+        self.distribution = np.zeros((self.num_card_states, self.max_weapon_parts + 1))
+        self.distribution[starting_card_state, min(starting_weapon_parts, self.max_weapon_parts)] = 1.0
+        self.num_ten_draws = 0
+
+    def generate_transitions(self):
+        """
+        Enumerate every (card state, stamp value) pair with its probability, next card state and the Fourier
+        transform of the weapon parts distribution of the ten draw that follows.
+        """
+
+        compiled_banner = self.compiled_banner
+        card_states, stamp_indices = np.meshgrid(
+            np.arange(self.num_card_states), np.arange(len(compiled_banner.stamp_values)), indexing="ij"
+        )
+        card_states = card_states.ravel()
+        stamp_indices = stamp_indices.ravel()
+
+        rule_counts, next_card_indices, next_card_values = compiled_banner.stamp_transition(
+            card_states // MAX_STAMP_CARD_VALUE,
+            card_states % MAX_STAMP_CARD_VALUE,
+            compiled_banner.stamp_values[stamp_indices],
+        )
+
+        rule_multisets, multiset_indices = np.unique(rule_counts, axis=0, return_inverse=True)
+        parts_transforms = []
+        for counts in rule_multisets:
+            outcome_counts, probabilities = compiled_banner.ten_draw_distribution(tuple(counts))
+            parts_pmf = np.bincount(
+                outcome_counts @ compiled_banner.weapon_parts_per_outcome,
+                weights=probabilities,
+                minlength=MAX_TEN_DRAW_WEAPON_PARTS + 1,
+            )
+            parts_transforms.append(np.fft.rfft(parts_pmf, self.fft_size))
+
+        # Summing the transitions into each next card state, weighted by their probabilities, is one matrix product
+        self.sources = card_states
+        self.aggregation = np.zeros((self.num_card_states, len(card_states)))
+        self.aggregation[
+            next_card_indices * MAX_STAMP_CARD_VALUE + next_card_values, np.arange(len(card_states))
+        ] = compiled_banner.stamp_probabilities[stamp_indices]
+        self.transition_transforms = np.array(parts_transforms)[multiset_indices]
+
+    def step(self):
+        """
+        Advance the distribution by one ten draw.
+        """
+
+        source_transforms = np.fft.rfft(self.distribution, self.fft_size, axis=1)
+        target_transforms = self.aggregation @ (source_transforms[self.sources] * self.transition_transforms)
+
+        weapon_parts = np.fft.irfft(target_transforms, self.fft_size, axis=1)
+        weapon_parts[:, self.max_weapon_parts] = weapon_parts[:, self.max_weapon_parts:].sum(axis=1)
+
+        # Remove FFT round-off below zero
+        self.distribution = np.clip(weapon_parts[:, : self.max_weapon_parts + 1], 0, None)
+        self.num_ten_draws += 1
+
+    def weapon_parts_distribution(self):
+        """
+        Return the distribution of capped weapon parts after `num_ten_draws` ten draws, over all card states.
+        """
+
+        return self.distribution.sum(axis=0)
+
+    def goal_probability(self):
+        """
+        Return the probability of holding at least `max_weapon_parts` weapon parts.
+        """
+
+        return self.distribution[:, self.max_weapon_parts].sum()
+
+
+def exact_parts_distributions(
+    compiled_banner, num_ten_draws, max_weapon_parts, starting_weapon_parts=0, starting_card_state=0
+):
+    """
+    Exact distributions of capped weapon parts after 0 to `num_ten_draws` ten draws, from the stamp card state
+    `starting_card_state` (card index * 12 + card value).
+
+    Returns:
+        numpy.ndarray: Array of shape (num_ten_draws + 1, max_weapon_parts + 1), where row t is the
+            distribution after spending t * 3,000 crystals.
+    """
+
+    solver = ExactPartsDistribution(
+        compiled_banner,
+        max_weapon_parts,
+        starting_weapon_parts=starting_weapon_parts,
+        starting_card_state=starting_card_state,
+    )
+    distributions = [solver.weapon_parts_distribution()]
+
+    for _ in range(num_ten_draws):
+        solver.step()
+        distributions.append(solver.weapon_parts_distribution())
+
+    return np.array(distributions)
+
+
+def exact_minimum_budget(
+    compiled_banner,
+    overboost_target,
+    target_probability,
+    starting_weapon_parts=0,
+    max_ten_draws=MAX_SOLVER_TEN_DRAWS,
+):
+    """
+    Find the smallest number of crystals (a multiple of 3,000) that reaches `overboost_target` with at least
+    `target_probability`, from the exact distribution. The probability of having reached the goal only grows
+    with each ten draw, so the first ten draw that crosses the target is the answer.
+
+    Returns:
+        dict: The `crystals` needed and the exact `probability` of reaching the goal with them.
+    """
+
+    if not 0 < target_probability < 1:
+        raise ValueError(
+            "`target_probability` must be between 0 and 1 (exclusive). Provided: ", target_probability
+        )
+
+    solver = ExactPartsDistribution(
+        compiled_banner,
+        (overboost_target + 1) * WEAPON_PARTS_PER_OVERBOOST,
+        starting_weapon_parts=starting_weapon_parts,
+    )
+
+    while solver.goal_probability() < target_probability:
+        if solver.num_ten_draws >= max_ten_draws:
+            raise ValueError(
+                "The target probability is not reached within the maximum number of ten draws. Provided: ",
+                max_ten_draws,
+            )
+        solver.step()
+
+    return {
+        "crystals": solver.num_ten_draws * TEN_DRAW_CRYSTAL_COST,
+        "probability": solver.goal_probability(),
+    }
@@ -0,0 +1,191 @@
+import concurrent.futures
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from time import perf_counter
+
+
+EXECUTORS = ["serial", "processes", "joblib", "threads"]
+
+
+class Executor:
+    """
+    Class describing how the chunks of a simulation are run. Every backend implements `map_unordered`, which
+    calls a function on each argument tuple and yields the results as the calls complete, in any order.
+
+    Attributes:
+        n_jobs (int): Number of workers, with the joblib convention that negative values count back from the
+            number of CPU cores (-1 uses all of them).
+    """
+
+    name = None
+
+    def __init__(self, n_jobs=2):
+
+        self.n_jobs = n_jobs
+
+    @property
+    def num_workers(self):
+        return effective_n_jobs(self.n_jobs)
+
+    def map_unordered(self, function, arguments):
+        raise NotImplementedError
+
+
+class SerialExecutor(Executor):
+    """
+    Executor running every call in the calling thread, one after another.
+    """
+
+    name = "serial"
+
+    @property
+    def num_workers(self):
+        return 1
+
+    def map_unordered(self, function, arguments):
+
+        for args in arguments:
+            yield function(*args)
+
+
+class FuturesExecutor(Executor):
+    """
+    Base class of the `concurrent.futures` executors, which yield each call's result as its future completes.
+    """
+
+    pool_class = None
+
+    def map_unordered(self, function, arguments):
+
+        with self.pool_class(max_workers=self.num_workers) as pool:
+            futures = [pool.submit(function, *args) for args in arguments]
+            for future in concurrent.futures.as_completed(futures):
+                yield future.result()
+
+
+class ProcessExecutor(FuturesExecutor):
+    """
+    Executor running calls on a `concurrent.futures.ProcessPoolExecutor`. Arguments and results are pickled
+    between processes, and each run starts its own pool.
+    """
+
+    name = "processes"
+    pool_class = concurrent.futures.ProcessPoolExecutor
+
+
+class ThreadExecutor(FuturesExecutor):
+    """
+    Executor running calls on a `concurrent.futures.ThreadPoolExecutor`. Threads share memory, so nothing is
+    pickled and no process is spawned, but they only run in parallel while the GIL is released: during the
+    large NumPy array operations of the batched 'numpy' and 'multinomial' engines, or throughout on a
+    free-threaded CPython build. The per-session 'reference' engine holds the GIL, so it gains nothing here.
+    """
+
+    name = "threads"
+    pool_class = concurrent.futures.ThreadPoolExecutor
+
+
+class JoblibExecutor(Executor):
+    """
+    Executor running calls on `joblib.Parallel` workers (loky processes by default, which are reused between
+    runs).
+
+    Attributes:
+        backend (str): joblib backend name. Default value of None (joblib's default, 'loky').
+    """
+
+    name = "joblib"
+
+    def __init__(self, n_jobs=2, backend=None):
+
+        super().__init__(n_jobs=n_jobs)
+        self.backend = backend
+
+    def map_unordered(self, function, arguments):
+
+        return Parallel(n_jobs=self.n_jobs, backend=self.backend, return_as="generator_unordered")(
+            delayed(function)(*args) for args in arguments
+        )
+
+
+EXECUTOR_CLASSES = {
+    executor_class.name: executor_class
+    for executor_class in [SerialExecutor, ProcessExecutor, JoblibExecutor, ThreadExecutor]
+}
+
+
+def generate_executor(executor="joblib", n_jobs=2):
+    """
+    Turn the `executor` argument of the simulation methods into an `Executor`.
+
+    Args:
+        executor: One of `EXECUTORS` ('serial', 'processes', 'joblib', or 'threads'), or an `Executor`
+            instance, which is used as is (its own n_jobs applies). Default value of 'joblib'.
+        n_jobs (int): Number of workers for a named executor. Default value of 2.
+
+    Returns:
+        Executor: The executor.
+    """
+
+    if isinstance(executor, Executor):
+        return executor
+
+    if executor not in EXECUTOR_CLASSES:
+        raise ValueError(
+            "`executor` must be an Executor or a str of either 'serial', 'processes', 'joblib', or 'threads'. "
+            "Provided: ",
+            executor,
+        )
+
+    return EXECUTOR_CLASSES[executor](n_jobs=n_jobs)
+
+
+def benchmark_executors(
+    gacha_sim,
+    executors=EXECUTORS,
+    n_jobs=-1,
+    engine="numpy",
+    repeats=3,
+):
+    """
+    Time `gacha_sim.run_sims` on each executor backend, on the same configuration, engine and seed, so the
+    backends are compared in one harness. Each backend first runs once untimed, to warm up worker pools and
+    compiled kernels.
+
+    Args:
+        gacha_sim (GachaSim): The simulation to time. Its results are overwritten by the last run.
+        executors (list): Executor names (or `Executor` instances) to compare. Default value of `EXECUTORS`.
+        n_jobs (int): Number of workers for every named executor. Default value of -1 (all CPU cores).
+        engine (str): The session engine to run. Default value of 'numpy'.
+        repeats (int): Number of timed runs per backend; the fastest is reported. Default value of 3.
+
+    Returns:
+        pandas.DataFrame: One row per backend, with its `workers`, best and mean `seconds`, and
+            `sessions_per_second` (of the best run), fastest first.
+    """
+
+    num_simulations = gacha_sim.metadata["num_simulations"]
+
+    rows = []
+    for executor in executors:
+        executor = generate_executor(executor, n_jobs=n_jobs)
+
+        gacha_sim.run_sims(engine=engine, executor=executor, progress=False)
+
+        seconds = []
+        for _ in range(repeats):
+            start_time = perf_counter()
+            gacha_sim.run_sims(engine=engine, executor=executor, progress=False)
+            seconds.append(perf_counter() - start_time)
+
+        rows.append(
+            {
+                "executor": executor.name,
+                "workers": executor.num_workers,
+                "seconds": min(seconds),
+                "mean_seconds": sum(seconds) / len(seconds),
+                "sessions_per_second": num_simulations / min(seconds),
+            }
+        )
+
+    return pd.DataFrame(rows).sort_values("seconds", ignore_index=True)
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+from ever_crisis_gacha_simulator.constants import *
+
+
+# Per-session parameters of a population run, in the order of their columns in `GachaSim.sim_results`
+POPULATION_PARAMETERS = [
+    "criterion_value",
+    "starting_weapon_parts",
+    "starting_stamp_card",
+    "starting_stamp_value",
+]
+
+
+def generate_population(population, metadata, num_stamp_cards):
+    """
+    Draw the per-session parameters of a population run.
+
+    Args:
+        population (dict): Any of `POPULATION_PARAMETERS` mapped to either one value for every session, an
+            array of one value per session, or a distribution: a function of a `numpy.random.Generator` and a
+            number of sessions returning that many values, e.g. `lambda rng, size: rng.integers(0, 400, size)`.
+            Parameters left out take the `GachaSim`'s own criterion value and starting weapon parts, and the
+            first stamp card at stamp value 0.
+        metadata (dict): The `metadata` of a `GachaSim`. Distributions are sampled with its seed value.
+        num_stamp_cards (int): Number of stamp cards on the banner.
+
+    Returns:
+        pandas.DataFrame: One row per session, with columns in the order of `POPULATION_PARAMETERS`.
+    """
+
+    unknown_parameters = set(population) - set(POPULATION_PARAMETERS)
+    if unknown_parameters:
+        raise ValueError(
+            f"Population parameters must be among {POPULATION_PARAMETERS}. Provided: ", sorted(unknown_parameters)
+        )
+
+    num_sessions = metadata["num_simulations"]
+    defaults = {
+        "criterion_value": metadata["criterion_value"],
+        "starting_weapon_parts": metadata["starting_weapon_parts"],
+        "starting_stamp_card": 0,
+        "starting_stamp_value": 0,
+    }
+    rng = np.random.default_rng(metadata["seed_value"])
+
+    columns = {}
+    for parameter in POPULATION_PARAMETERS:
+        values = population.get(parameter, defaults[parameter])
+        if callable(values):
+            values = values(rng, num_sessions)
+        values = np.broadcast_to(np.asarray(values), (num_sessions,))
+
+        if not np.issubdtype(values.dtype, np.integer) and not np.array_equal(values, np.round(values)):
+            raise ValueError(f"Values of `{parameter}` must be whole numbers. Provided: ", values[:5])
+        columns[parameter] = values.astype(np.int64)
+
+    validate_stamp_card_positions(columns["starting_stamp_card"], columns["starting_stamp_value"], num_stamp_cards)
+
+    if (columns["starting_weapon_parts"] < 0).any():
+        raise ValueError(
+            "`starting_weapon_parts` must not be negative. Provided: ", columns["starting_weapon_parts"].min()
+        )
+
+    return pd.DataFrame(columns)
+
+
+def validate_stamp_card_positions(card_indices, card_values, num_stamp_cards):
+    """
+    Make sure every stamp card position is on the banner: a card index below `num_stamp_cards`, and a stamp
+    value below the 12 stamps that complete a card.
+    """
+
+    if np.size(card_indices) and not 0 <= np.min(card_indices) <= np.max(card_indices) < num_stamp_cards:
+        raise ValueError(
+            f"Stamp card indices must be between 0 and {num_stamp_cards - 1}. Provided: ",
+            (np.min(card_indices), np.max(card_indices)),
+        )
+
+    if np.size(card_values) and not 0 <= np.min(card_values) <= np.max(card_values) < MAX_STAMP_CARD_VALUE:
+        raise ValueError(
+            f"Stamp values must be between 0 and {MAX_STAMP_CARD_VALUE - 1}. Provided: ",
+            (np.min(card_values), np.max(card_values)),
+        )
+
+
+def stamp_card_index(stamp_cards_list, stamp_card):
+    """
+    Return the index of a stamp card given by its name in `stamp_cards_list` (e.g. 'page_two') or its index.
+    """
+
+    if isinstance(stamp_card, str):
+        if stamp_card not in stamp_cards_list:
+            raise ValueError(f"`stamp_card` must be one of {list(stamp_cards_list)}. Provided: ", stamp_card)
+        return list(stamp_cards_list).index(stamp_card)
+
+    return int(stamp_card)
+
+
+def starting_stamps(card_indices, card_values):
+    """
+    Convert stamp card positions into the stamps a session starts with, the form the session engines track
+    positions in (see `CompiledBanner.absolute_rule_codes`).
+    """
+
+    return np.asarray(card_indices) * MAX_STAMP_CARD_VALUE + np.asarray(card_values)
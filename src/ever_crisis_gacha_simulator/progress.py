@@ -0,0 +1,226 @@
+import logging
+import os
+import socket
+import threading
+from time import perf_counter
+from tqdm.auto import tqdm
+from ever_crisis_gacha_simulator.executors import generate_executor
+
+
+class ProgressEvent:
+    """
+    Class describing the progress of a simulation after a chunk of sessions has completed.
+
+    Attributes:
+        sessions_completed (int): Sessions whose results are back, across all workers.
+        total_sessions (int): Sessions in the whole run.
+        chunks_completed (int): Chunks whose results are back.
+        total_chunks (int): Chunks in the whole run.
+        elapsed_seconds (float): Seconds since the run started.
+        sessions_per_second (float): Average throughput so far.
+        eta_seconds (float): Estimated seconds until the run completes, or None before the first chunk.
+        worker_status (dict): Per worker (host and process ID), the `chunks` and `sessions` it has completed
+            and the elapsed seconds at its `last_completion`.
+        finished (bool): Whether this is the final event of the run.
+    """
+
+    def __init__(
+        self,
+        sessions_completed,
+        total_sessions,
+        chunks_completed,
+        total_chunks,
+        elapsed_seconds,
+        worker_status,
+        finished=False,
+    ):
+
+        self.sessions_completed = sessions_completed
+        self.total_sessions = total_sessions
+        self.chunks_completed = chunks_completed
+        self.total_chunks = total_chunks
+        self.elapsed_seconds = elapsed_seconds
+        self.worker_status = worker_status
+        self.finished = finished
+
+        self.sessions_per_second = (
+            sessions_completed / elapsed_seconds if elapsed_seconds > 0 else 0.0
+        )
+        self.eta_seconds = (
+            (total_sessions - sessions_completed) / self.sessions_per_second
+            if self.sessions_per_second > 0
+            else None
+        )
+
+    @property
+    def fraction_completed(self):
+        return self.sessions_completed / self.total_sessions if self.total_sessions else 1.0
+
+
+class TqdmProgress:
+    """
+    Progress callback showing a tqdm bar counted in completed sessions. It uses `tqdm.auto`, so it renders as a
+    widget in notebooks and as a text bar elsewhere.
+    """
+
+    def __init__(self, **tqdm_kwargs):
+
+        self.tqdm_kwargs = {"unit": " sessions", "unit_scale": True, **tqdm_kwargs}
+        self.bar = None
+
+    def __call__(self, event):
+
+        if self.bar is None:
+            self.bar = tqdm(total=event.total_sessions, **self.tqdm_kwargs)
+
+        self.bar.set_postfix(workers=len(event.worker_status), refresh=False)
+        self.bar.update(event.sessions_completed - self.bar.n)
+
+        if event.finished:
+            self.bar.close()
+            self.bar = None
+
+
+class LoggingProgress:
+    """
+    Progress callback writing progress lines to a logger, at most once every `min_interval_seconds` (the
+    final event is always logged).
+    """
+
+    def __init__(self, logger=None, level=logging.INFO, min_interval_seconds=10.0):
+
+        self.logger = logger or logging.getLogger("ever_crisis_gacha_simulator")
+        self.level = level
+        self.min_interval_seconds = min_interval_seconds
+        self.last_logged_seconds = None
+
+    def __call__(self, event):
+
+        if (
+            not event.finished
+            and self.last_logged_seconds is not None
+            and event.elapsed_seconds - self.last_logged_seconds < self.min_interval_seconds
+        ):
+            return
+
+        self.last_logged_seconds = event.elapsed_seconds
+        eta = "unknown" if event.eta_seconds is None else f"{event.eta_seconds:,.0f}s"
+
+        self.logger.log(
+            self.level,
+            "%s/%s sessions (%.1f%%), %s sessions/s, ETA %s, %d workers",
+            f"{event.sessions_completed:,}",
+            f"{event.total_sessions:,}",
+            100 * event.fraction_completed,
+            f"{event.sessions_per_second:,.0f}",
+            eta,
+            len(event.worker_status),
+        )
+
+
+def generate_progress_callbacks(progress):
+    """
+    Turn the `progress` argument of the simulation methods into a list of callbacks. True gives a
+    `TqdmProgress` bar, False or None gives no progress, and a callable (or list of callables) receiving
+    `ProgressEvent`s is used as is.
+    """
+
+    if progress is True:
+        return [TqdmProgress()]
+    if not progress:
+        return []
+    if callable(progress):
+        return [progress]
+
+    return list(progress)
+
+
+def _run_chunk(function, chunk_index, kwargs):
+    """
+    Run one chunk and tag its result with the chunk index and the worker that ran it (its host and process ID,
+    plus its thread name on worker threads).
+    """
+
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    if threading.current_thread() is not threading.main_thread():
+        worker += f":{threading.current_thread().name}"
+
+    return chunk_index, worker, function(**kwargs)
+
+
+def iterate_chunks(function, chunk_kwargs, chunk_sizes, n_jobs=2, progress=True, executor="joblib"):
+    """
+    Call `function(**kwargs)` for every chunk on the workers of `executor`, and yield each chunk's index and
+    result as it completes (in any order), emitting a `ProgressEvent` to every progress callback as it does.
+
+    Args:
+        function (callable): The function simulating one chunk.
+        chunk_kwargs (list): Keyword arguments for each chunk, in the order they are submitted.
+        chunk_sizes (list): Number of sessions in each chunk.
+        n_jobs (int): Number of workers to utilize.
+        progress: See `generate_progress_callbacks`.
+        executor: Executor backend, see `executors.generate_executor`. Default value of 'joblib'.
+
+    Yields:
+        tuple: A chunk's index into `chunk_kwargs`, and its result.
+    """
+
+    callbacks = generate_progress_callbacks(progress)
+    total_sessions = int(sum(chunk_sizes))
+    worker_status = {}
+    sessions_completed = 0
+    start_time = perf_counter()
+
+    completed_chunks = generate_executor(executor, n_jobs=n_jobs).map_unordered(
+        _run_chunk,
+        [(function, chunk_index, kwargs) for chunk_index, kwargs in enumerate(chunk_kwargs)],
+    )
+
+    for chunks_completed, (chunk_index, worker, result) in enumerate(completed_chunks, start=1):
+        sessions_completed += chunk_sizes[chunk_index]
+        elapsed_seconds = perf_counter() - start_time
+
+        status = worker_status.setdefault(worker, {"chunks": 0, "sessions": 0})
+        status["chunks"] += 1
+        status["sessions"] += chunk_sizes[chunk_index]
+        status["last_completion"] = elapsed_seconds
+
+        event = ProgressEvent(
+            sessions_completed=sessions_completed,
+            total_sessions=total_sessions,
+            chunks_completed=chunks_completed,
+            total_chunks=len(chunk_kwargs),
+            elapsed_seconds=elapsed_seconds,
+            worker_status=worker_status,
+            finished=chunks_completed == len(chunk_kwargs),
+        )
+        for callback in callbacks:
+            callback(event)
+
+        yield chunk_index, result
+
+
+def run_chunks(function, chunk_kwargs, chunk_sizes, n_jobs=2, progress=True, executor="joblib"):
+    """
+    Call `function(**kwargs)` for every chunk on the workers of `executor`, emitting a `ProgressEvent` to every
+    progress callback as each chunk completes (rather than when it is submitted).
+
+    Args:
+        function (callable): The function simulating one chunk.
+        chunk_kwargs (list): Keyword arguments for each chunk.
+        chunk_sizes (list): Number of sessions in each chunk.
+        n_jobs (int): Number of workers to utilize.
+        progress: See `generate_progress_callbacks`.
+        executor: Executor backend, see `executors.generate_executor`. Default value of 'joblib'.
+
+    Returns:
+        list: The result of each chunk, in the order of `chunk_kwargs`.
+    """
+
+    results = [None] * len(chunk_kwargs)
+    for chunk_index, result in iterate_chunks(
+        function, chunk_kwargs, chunk_sizes, n_jobs=n_jobs, progress=progress, executor=executor
+    ):
+        results[chunk_index] = result
+
+    return results
@@ -0,0 +1,257 @@
+import numpy as np
+
+
+# Every ten draw of every session owns a fixed set of random "lanes", so each session's random numbers only
+# depend on the seed, the session index and the ten draw index (never on chunking, engine or n_jobs).
+LANES_PER_TEN_DRAW = 16
+STAMP_LANE = 0
+FIRST_DRAW_LANE = 1
+UNIT_SCALE = 2.0**-53
+
+SAMPLING_MODES = ["plain", "antithetic", "stratified", "sobol"]
+
+# Engines that only run with 'plain' sampling
+PLAIN_SAMPLING_ENGINES = ["reference", "jit"]
+
+# Number of consecutive session indices that form one independent replicate of each sampling mode
+SAMPLING_GROUP_SIZES = {
+    "plain": 1,
+    "antithetic": 2,
+    "stratified": 16,
+    "sobol": 1024,
+}
+
+# Sobol points cover the stamp and ten draw lanes of a session's first SOBOL_TEN_DRAWS ten draws
+SOBOL_TEN_DRAWS = 32
+SOBOL_LANES_PER_TEN_DRAW = 11
+
+# Offset that keeps per-group random streams apart from per-session ones
+_GROUP_STREAM_OFFSET = 2**62
+
+_SESSION_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_LANE_GAMMA = np.uint64(0xD1B54A32D192ED03)
+_MIX_MULTIPLIER_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_MULTIPLIER_2 = np.uint64(0x94D049BB133111EB)
+_SHIFT_1 = np.uint64(30)
+_SHIFT_2 = np.uint64(27)
+_SHIFT_3 = np.uint64(31)
+_SHIFT_MANTISSA = np.uint64(11)
+
+
+def generate_session_key(seed_value=None):
+    """
+    Derive the 64-bit key for the per-session random streams from a seed value.
+
+    Returns:
+        tuple: The key and the entropy it was derived from. Passing the entropy back in as the seed value
+            reproduces the key, which is how unseeded runs stay reproducible.
+    """
+
+    seed_sequence = np.random.SeedSequence(seed_value)
+
+    return (
+        int(seed_sequence.generate_state(1, dtype=np.uint64)[0]),
+        seed_sequence.entropy,
+    )
+
+
+def _mix64(z):
+    """
+    SplitMix64 finalizer, applied element-wise to uint64 values.
+    """
+
+    z = (z ^ (z >> _SHIFT_1)) * _MIX_MULTIPLIER_1
+    z = (z ^ (z >> _SHIFT_2)) * _MIX_MULTIPLIER_2
+
+    return z ^ (z >> _SHIFT_3)
+
+
+def counter_uniforms(key, session_ids, ten_draw_index, lanes):
+    """
+    Counter-based uniform floats on [0, 1) for the given sessions, ten draw index and lane(s).
+    `session_ids` and `lanes` are broadcast against each other.
+    """
+
+    with np.errstate(over="ignore"):
+        z = _mix64(
+            np.uint64(key) + np.asarray(session_ids, dtype=np.uint64) * _SESSION_GAMMA
+        )
+        counter = np.uint64(ten_draw_index) * np.uint64(
+            LANES_PER_TEN_DRAW
+        ) + np.asarray(lanes, dtype=np.uint64)
+        z = _mix64(z + counter * _LANE_GAMMA)
+
+    return (z >> _SHIFT_MANTISSA).astype(np.float64) * UNIT_SCALE
+
+
+def validate_sampling(sampling, engine):
+    """
+    Make sure `sampling` is one of `SAMPLING_MODES` and is supported by `engine`: the variance-reduced modes run
+    on the 'numpy' and 'multinomial' engines only.
+    """
+
+    if sampling not in SAMPLING_MODES:
+        raise ValueError(
+            "`sampling` must be a str of either 'plain', 'antithetic', 'stratified', or 'sobol'. Provided: ",
+            sampling,
+        )
+
+    if engine in PLAIN_SAMPLING_ENGINES and sampling != "plain":
+        raise ValueError(
+            f"The '{engine}' engine only supports 'plain' sampling. Provided: ",
+            sampling,
+        )
+
+
+class SessionUniforms:
+    """
+    Class supplying the uniform floats for a chunk of sessions under one of the `SAMPLING_MODES`:
+        plain: Independent counter-based floats for every session.
+        antithetic: Sessions 2k and 2k + 1 form a pair, and the odd session uses the mirror image (1 - u)
+            of every float of the even session.
+        stratified: Within each group of 16 sessions, the stamp floats of a ten draw are spread over the
+            16 equal strata of [0, 1), one per session, via a random permutation.
+        sobol: Within each group of 1,024 sessions, the stamp and draw floats of the first 32 ten draws
+            come from an independently scrambled Sobol sequence (requires SciPy). Later ten draws use
+            plain floats.
+    Every mode leaves each individual session with exactly the banner's rates, so results stay unbiased.
+    """
+
+    def __init__(self, key, session_ids, sampling="plain"):
+
+        if sampling not in SAMPLING_MODES:
+            raise ValueError(
+                "`sampling` must be a str of either 'plain', 'antithetic', 'stratified', or 'sobol'. Provided: ",
+                sampling,
+            )
+
+        self.key = key
+        self.session_ids = np.asarray(session_ids, dtype=np.int64)
+        self.sampling = sampling
+
+        if sampling == "sobol":
+            self.sobol_floats = generate_sobol_floats(key, self.session_ids)
+
+    def uniforms(self, positions, ten_draw_index, lanes):
+        """
+        Return floats for the sessions at `positions` (indices into `session_ids`) at one ten draw index. A scalar
+        lane gives one float per session; an array of lanes gives an array of shape (sessions, lanes).
+        """
+
+        session_ids = self.session_ids[positions]
+        lanes = np.asarray(lanes)
+        if lanes.ndim == 1:
+            positions = positions[:, None]
+            session_ids = session_ids[:, None]
+
+        if self.sampling == "antithetic":
+            mirrored = (session_ids % 2) == 1
+            floats = counter_uniforms(
+                self.key, session_ids - mirrored, ten_draw_index, lanes
+            )
+            return np.where(mirrored, 1 - UNIT_SCALE - floats, floats)
+
+        floats = counter_uniforms(self.key, session_ids, ten_draw_index, lanes)
+
+        if self.sampling == "stratified" and lanes.ndim == 0 and lanes == STAMP_LANE:
+            return self.stratified_stamp_floats(session_ids, ten_draw_index, floats)
+
+        if self.sampling == "sobol" and ten_draw_index < SOBOL_TEN_DRAWS:
+            in_sobol = lanes < SOBOL_LANES_PER_TEN_DRAW
+            sobol_floats = self.sobol_floats[
+                positions, ten_draw_index, np.where(in_sobol, lanes, 0)
+            ]
+            return np.where(in_sobol, sobol_floats, floats)
+
+        return floats
+
+    def stratified_stamp_floats(self, session_ids, ten_draw_index, floats):
+        """
+        Move each session's float into its own stratum of [0, 1) within its group. The stratum comes from a
+        random affine permutation (odd multiplier, any offset) of the session's position in the group.
+        """
+
+        group_size = SAMPLING_GROUP_SIZES["stratified"]
+        group_streams = _GROUP_STREAM_OFFSET + session_ids // group_size
+
+        multiplier = (
+            2
+            * (
+                counter_uniforms(self.key, group_streams, ten_draw_index, STAMP_LANE)
+                * (group_size // 2)
+            ).astype(np.int64)
+            + 1
+        )
+        offset = (
+            counter_uniforms(self.key, group_streams, ten_draw_index, FIRST_DRAW_LANE)
+            * group_size
+        ).astype(np.int64)
+        strata = (multiplier * (session_ids % group_size) + offset) % group_size
+
+        return (strata + floats) / group_size
+
+
+def generate_sobol_floats(key, session_ids):
+    """
+    Generate the scrambled Sobol floats of each session, with shape (sessions, SOBOL_TEN_DRAWS, SOBOL_LANES_PER_TEN_DRAW).
+    Each group of `SAMPLING_GROUP_SIZES["sobol"]` sessions gets its own scramble, seeded from the key.
+    """
+
+    try:
+        from scipy.stats import qmc
+    except ImportError:
+        raise ImportError(
+            "The 'sobol' sampling mode requires SciPy. Install it with "
+            "`pip install ever_crisis_gacha_simulator[sobol]`."
+        )
+
+    group_size = SAMPLING_GROUP_SIZES["sobol"]
+    dimensions = SOBOL_TEN_DRAWS * SOBOL_LANES_PER_TEN_DRAW
+    sobol_floats = np.empty((len(session_ids), dimensions))
+
+    for group in np.unique(session_ids // group_size):
+        in_group = session_ids // group_size == group
+        sobol_points = qmc.Sobol(
+            d=dimensions,
+            scramble=True,
+            seed=np.random.default_rng([key, int(group)]),
+        ).random(group_size)
+        sobol_floats[in_group] = sobol_points[session_ids[in_group] % group_size]
+
+    return sobol_floats.reshape(
+        len(session_ids), SOBOL_TEN_DRAWS, SOBOL_LANES_PER_TEN_DRAW
+    )
+
+
+def estimate_variance_reduction(values, session_ids, sampling):
+    """
+    Estimate how much a sampling mode reduced the variance of the mean of `values`, compared with plain
+    sampling of the same number of sessions. Complete groups of `SAMPLING_GROUP_SIZES[sampling]` sessions
+    are independent replicates, so the variance of their means measures the mode's actual variance, while
+    the variance across individual sessions measures what plain sampling would have given.
+
+    Returns:
+        float: The variance reduction factor. A factor of 4 means plain sampling would need 4 times as many
+            sessions for the same precision. NaN when there are too few complete groups, or no variance.
+    """
+
+    group_size = SAMPLING_GROUP_SIZES[sampling]
+    values = np.asarray(values, dtype=np.float64)
+
+    _, group_inverse, group_counts = np.unique(
+        np.asarray(session_ids) // group_size, return_inverse=True, return_counts=True
+    )
+    complete_groups = group_counts == group_size
+    if complete_groups.sum() < 2:
+        return np.nan
+
+    group_means = (
+        np.bincount(group_inverse, weights=values)[complete_groups] / group_size
+    )
+    plain_variance = values[complete_groups[group_inverse]].var(ddof=1)
+    achieved_variance = group_size * group_means.var(ddof=1)
+
+    if achieved_variance == 0:
+        return np.nan
+
+    return plain_variance / achieved_variance
@@ -0,0 +1,117 @@
+import math
+from ever_crisis_gacha_simulator.classes.crystal_pull_session import (
+    validate_criterion_value,
+    validate_max_crystals_spent,
+)
+from ever_crisis_gacha_simulator.constants import *
+
+
+# Expected ten draws per chunk of sessions: a full chunk of 10,000 sessions spending 75,000 crystals each.
+# Chunks of longer sessions hold fewer of them, so no chunk runs far longer than the others.
+TEN_DRAWS_PER_CHUNK = 250_000
+
+# Smallest chunk worth a task of its own. The batched engines step every chunk until its longest session
+# ends, so smaller chunks repeat that fixed per-ten-draw overhead more often than they save in idle time.
+MIN_SESSIONS_PER_CHUNK = 1_000
+
+# Guided scheduling gives each chunk this share of the remaining sessions per worker, so chunks shrink as the
+# run nears its end and the last ones finish close together
+GUIDED_CHUNK_FRACTION = 0.5
+
+
+def estimate_session_cost(
+    compiled_banner,
+    session_criterion,
+    criterion_value,
+    starting_weapon_parts=0,
+    max_crystals_spent=None,
+):
+    """
+    Estimate the number of ten draws a pull session runs, which the run time of a compiled session engine is
+    proportional to. Sessions on the 'overboost' criterion are estimated from the mean weapon parts of a
+    standard ten draw, without the extra weapon parts of stamp cards, so their estimate is an upper bound; a
+    wishlisted target's lower rates make its sessions the longest. A crystal cap bounds every estimate.
+
+    Args:
+        compiled_banner (CompiledBanner): The compiled banner and target weapon type.
+        session_criterion (str): One of 'crystals_spent', 'overboost', or 'stamps_earned'.
+        criterion_value (int): The value at which each pull session should stop.
+        starting_weapon_parts (int): The number of weapon parts each pull session starts with.
+        max_crystals_spent (int): The crystal cap of the pull sessions. Default value of None (no cap).
+
+    Returns:
+        float: The expected number of ten draws per session.
+    """
+
+    validate_criterion_value(session_criterion, criterion_value)
+    validate_max_crystals_spent(max_crystals_spent)
+
+    if session_criterion == "crystals_spent":
+        num_ten_draws = criterion_value / TEN_DRAW_CRYSTAL_COST
+    elif session_criterion == "stamps_earned":
+        num_ten_draws = criterion_value / (compiled_banner.stamp_values @ compiled_banner.stamp_probabilities)
+    else:
+        weapon_parts_per_ten_draw = 10 * (
+            compiled_banner.standard_probabilities @ compiled_banner.weapon_parts_per_outcome
+        )
+        weapon_parts_needed = max(
+            (criterion_value + 1) * WEAPON_PARTS_PER_OVERBOOST - starting_weapon_parts, 0
+        )
+        num_ten_draws = weapon_parts_needed / weapon_parts_per_ten_draw
+
+    if max_crystals_spent is None:
+        return num_ten_draws
+
+    return min(num_ten_draws, max_crystals_spent // TEN_DRAW_CRYSTAL_COST)
+
+
+def cost_balanced_chunk_size(session_cost, max_chunk_size, min_chunk_size=MIN_SESSIONS_PER_CHUNK):
+    """
+    Number of sessions per chunk that keeps a chunk's expected work near `TEN_DRAWS_PER_CHUNK` ten draws.
+
+    Args:
+        session_cost (float): Expected ten draws per session, from `estimate_session_cost()`.
+        max_chunk_size (int): Most sessions per chunk.
+        min_chunk_size (int): Fewest sessions per chunk. Default value of `MIN_SESSIONS_PER_CHUNK`.
+
+    Returns:
+        int: The chunk size.
+    """
+
+    if session_cost <= 0:
+        return max_chunk_size
+
+    return int(min(max(TEN_DRAWS_PER_CHUNK // session_cost, min_chunk_size), max_chunk_size))
+
+
+def guided_chunk_bounds(
+    session_start,
+    session_stop,
+    num_workers,
+    max_chunk_size,
+    min_chunk_size=MIN_SESSIONS_PER_CHUNK,
+):
+    """
+    Split the sessions in [session_start, session_stop) into chunks that shrink towards the end of the run
+    (guided scheduling): each chunk takes `GUIDED_CHUNK_FRACTION` of the remaining sessions per worker, between
+    `min_chunk_size` and `max_chunk_size`. Workers take chunks as they free up, so the large early chunks keep
+    scheduling overhead low, and the small late ones fill in around workers still busy with a chunk of long
+    sessions instead of leaving cores idle while one straggling chunk finishes. Sessions only depend on their
+    index, so results never depend on the chunks.
+
+    Returns:
+        list: [start, stop) index ranges, in order.
+    """
+
+    chunk_bounds = []
+    chunk_start = session_start
+    while chunk_start < session_stop:
+        remaining = session_stop - chunk_start
+        chunk_size = min(
+            max(math.ceil(GUIDED_CHUNK_FRACTION * remaining / num_workers), min_chunk_size),
+            max_chunk_size,
+        )
+        chunk_bounds.append((chunk_start, min(chunk_start + chunk_size, session_stop)))
+        chunk_start += chunk_size
+
+    return chunk_bounds
@@ -0,0 +1,712 @@
+import warnings
+import numpy as np
+from ever_crisis_gacha_simulator.classes.compiled_banner import (
+    OUTCOME_NAMES,
+    SESSION_DATA_COLUMNS,
+    decode_rule_multiset_codes,
+)
+from ever_crisis_gacha_simulator.classes.crystal_pull_session import (
+    validate_criterion_value,
+    validate_max_crystals_spent,
+)
+from ever_crisis_gacha_simulator.constants import *
+from ever_crisis_gacha_simulator.sampling import (
+    FIRST_DRAW_LANE,
+    LANES_PER_TEN_DRAW,
+    STAMP_LANE,
+    UNIT_SCALE,
+    SessionUniforms,
+    generate_session_key,
+)
+from ever_crisis_gacha_simulator.stamp_stage import (
+    STAMP_BLOCK_TEN_DRAWS,
+    sample_stamp_block,
+    ten_draw_rule_codes,
+)
+from ever_crisis_gacha_simulator.tracing import (
+    TRACE_RECORD_BYTES,
+    append_trace_records,
+    outcome_counts_to_outcomes,
+)
+
+try:
+    import numba
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+ENGINES = ["reference", "numpy", "jit", "multinomial"]
+CRITERION_CODES = {"overboost": 0, "crystals_spent": 1, "stamps_earned": 2}
+
+NUM_OUTCOMES = len(OUTCOME_NAMES)
+NUM_DATA_COLUMNS = len(SESSION_DATA_COLUMNS)
+# Crystal cap the kernels use when a session has none, so capped and uncapped sessions share one stop rule
+NO_CRYSTAL_CAP = np.iinfo(np.int64).max
+
+
+def crystal_cap(max_crystals_spent):
+    """
+    Validate the `max_crystals_spent` of a compound stop rule and turn it into the cap the kernels compare
+    crystals spent against.
+    """
+
+    validate_max_crystals_spent(max_crystals_spent)
+
+    return NO_CRYSTAL_CAP if max_crystals_spent is None else int(max_crystals_spent)
+
+
+def session_is_running(data, criterion_code, criterion_value, max_crystals_spent=NO_CRYSTAL_CAP):
+    """
+    Vectorized stopping rules of the `CrystalPullSession.criterion_*` methods, including the optional crystal
+    cap of `CrystalPullSession.within_crystal_cap`.
+    """
+
+    if criterion_code == 0:
+        running = data[:, 0] < (criterion_value + 1) * WEAPON_PARTS_PER_OVERBOOST
+    elif criterion_code == 1:
+        running = (criterion_value - data[:, 2]) >= TEN_DRAW_CRYSTAL_COST
+    else:
+        running = data[:, 1] < criterion_value
+
+    if max_crystals_spent == NO_CRYSTAL_CAP:
+        return running
+
+    return running & ((max_crystals_spent - data[:, 2]) >= TEN_DRAW_CRYSTAL_COST)
+
+
+def simulate_sessions_numpy(
+    compiled_banner,
+    criterion_code,
+    criterion_value,
+    starting_weapon_parts,
+    session_ids,
+    key,
+    proposal=None,
+    sampling="plain",
+    ten_draw_tables=None,
+    traces=None,
+    starting_data=None,
+    first_ten_draw_index=0,
+    max_crystals_spent=NO_CRYSTAL_CAP,
+):
+    """
+    Simulate pull sessions in lockstep, one ten draw at a time across every session that is still running.
+    When an importance sampling `proposal` from `CompiledBanner.importance_proposal()` is provided, stamps
+    and draws are sampled from its tilted tables instead. `sampling` selects how the uniform floats are
+    generated (see `SessionUniforms`). When `ten_draw_tables` from `CompiledBanner.generate_ten_draw_tables()`
+    are provided, each ten draw's outcome counts are sampled from a single float instead of ten. When `traces`
+    is a list of one empty list per session, every ten draw's packed trace record (see `tracing`) is appended
+    to its session's list. When `starting_data` (one row per session, as returned) is provided, the sessions
+    continue from those end states at ten draw `first_ten_draw_index` instead of starting from scratch.
+    Sessions also stop once another ten draw would go over `max_crystals_spent` (see `crystal_cap()`).
+    `criterion_value` is either one value for every session or an array of one value per session.
+
+    Returns:
+        tuple: Session data (one row per session, columns in the order of `SESSION_DATA_COLUMNS`) and each
+            session's log likelihood ratio (all 0 without a proposal).
+    """
+
+    num_sessions = len(session_ids)
+    if starting_data is None:
+        data = np.zeros((num_sessions, NUM_DATA_COLUMNS), dtype=np.int64)
+        data[:, 0] = starting_weapon_parts
+    else:
+        data = np.array(starting_data, dtype=np.int64)
+    log_weights = np.zeros(num_sessions)
+
+    # Stamps and the rules they trigger are sampled STAMP_BLOCK_TEN_DRAWS ten draws ahead for every running
+    # session, and `block_rows` maps a session to its row of the current block
+    block_rows = np.zeros(num_sessions, dtype=np.int64)
+    session_uniforms = SessionUniforms(key, session_ids, sampling=sampling)
+
+    draw_slots = np.arange(DRAWS_PER_TEN_DRAW)
+    draw_lanes = FIRST_DRAW_LANE + draw_slots
+    slot_cdfs = compiled_banner.slot_cdfs if proposal is None else proposal["slot_cdfs"]
+    # Only the first NUM_OUTCOMES - 1 boundaries are needed to classify a float
+    slot_boundaries = slot_cdfs[:, :-1]
+
+    active = np.arange(num_sessions)
+    ten_draw_index = first_ten_draw_index
+    block_start = None
+    per_session_criterion = np.ndim(criterion_value) > 0
+
+    while True:
+        active = active[
+            session_is_running(
+                data[active],
+                criterion_code,
+                criterion_value[active] if per_session_criterion else criterion_value,
+                max_crystals_spent,
+            )
+        ]
+        if active.size == 0:
+            break
+
+        if block_start is None or ten_draw_index - block_start == STAMP_BLOCK_TEN_DRAWS:
+            block_start = ten_draw_index
+            block_stamp_values, block_log_weights = sample_stamp_block(
+                compiled_banner,
+                session_uniforms,
+                active,
+                ten_draw_index,
+                STAMP_BLOCK_TEN_DRAWS,
+                proposal=proposal,
+            )
+            # Transposed, so each ten draw's values are contiguous
+            block_rule_codes = ten_draw_rule_codes(
+                compiled_banner, data[active, 1], block_stamp_values
+            ).T.copy()
+            block_stamp_values = block_stamp_values.T.copy()
+            block_log_weights = block_log_weights.T.copy()
+            block_rows[active] = np.arange(active.size)
+
+        block_offset = ten_draw_index - block_start
+        rows = block_rows[active]
+        stamp_values = block_stamp_values[block_offset, rows]
+        rule_codes = block_rule_codes[block_offset, rows]
+        if proposal is not None:
+            log_weights[active] += block_log_weights[block_offset, rows]
+
+        if ten_draw_tables is not None:
+            table_indices = np.searchsorted(ten_draw_tables["multiset_codes"], rule_codes)
+            rows = np.searchsorted(
+                ten_draw_tables["offset_cdfs"],
+                table_indices
+                + session_uniforms.uniforms(active, ten_draw_index, FIRST_DRAW_LANE),
+                side="right",
+            )
+            data[active, 0] += ten_draw_tables["weapon_parts"][rows]
+            data[active, 1] += stamp_values
+            data[active, 2] += TEN_DRAW_CRYSTAL_COST
+            data[active, 3:] += ten_draw_tables["outcome_counts"][rows]
+            if traces is not None:
+                append_trace_records(
+                    traces,
+                    compiled_banner,
+                    active,
+                    data[active, 1],
+                    stamp_values,
+                    rule_codes,
+                    outcome_counts_to_outcomes(ten_draw_tables["outcome_counts"][rows]),
+                )
+            ten_draw_index += 1
+            continue
+
+        # Special rule draws come first (in rule order), then standard draws fill the remaining slots
+        cumulative_rule_counts = np.cumsum(decode_rule_multiset_codes(rule_codes), axis=1)
+        slot_kinds = (
+            draw_slots[None, :, None] >= cumulative_rule_counts[:, None, :]
+        ).sum(axis=2)
+
+        draw_floats = session_uniforms.uniforms(active, ten_draw_index, draw_lanes)
+        outcomes = (draw_floats[..., None] >= slot_boundaries[slot_kinds]).sum(axis=2)
+        outcome_counts = (outcomes[..., None] == np.arange(NUM_OUTCOMES)).sum(axis=1)
+        if proposal is not None:
+            log_weights[active] += proposal["slot_log_likelihood_ratios"][
+                slot_kinds, outcomes
+            ].sum(axis=1)
+
+        data[active, 0] += outcome_counts @ compiled_banner.weapon_parts_per_outcome
+        data[active, 1] += stamp_values
+        data[active, 2] += TEN_DRAW_CRYSTAL_COST
+        data[active, 3:] += outcome_counts
+        if traces is not None:
+            append_trace_records(
+                traces, compiled_banner, active, data[active, 1], stamp_values, rule_codes, outcomes
+            )
+
+        ten_draw_index += 1
+
+    return data, log_weights
+
+
+if NUMBA_AVAILABLE:
+
+    @numba.njit(cache=True)
+    def _jit_mix64(z):
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+    @numba.njit(cache=True)
+    def _jit_counter_uniform(key, session_id, ten_draw_index, lane):
+        z = _jit_mix64(key + np.uint64(session_id) * np.uint64(0x9E3779B97F4A7C15))
+        counter = np.uint64(ten_draw_index) * np.uint64(LANES_PER_TEN_DRAW) + np.uint64(
+            lane
+        )
+        z = _jit_mix64(z + counter * np.uint64(0xD1B54A32D192ED03))
+        return np.float64(z >> np.uint64(11)) * UNIT_SCALE
+
+    @numba.njit(cache=True)
+    def _jit_simulate_sessions(
+        stamp_value_lookup,
+        card_rule_prefix,
+        slot_cdfs,
+        weapon_parts_per_outcome,
+        criterion_code,
+        criterion_values,
+        max_crystals_spent,
+        starting_data,
+        first_ten_draw_indices,
+        session_ids,
+        key,
+    ):
+        num_sessions = session_ids.shape[0]
+        num_cards = card_rule_prefix.shape[0]
+        num_rules = card_rule_prefix.shape[2]
+        num_outcomes = slot_cdfs.shape[1]
+        data = np.zeros((num_sessions, 3 + num_outcomes), dtype=np.int64)
+        rule_counts = np.zeros(num_rules, dtype=np.int64)
+
+        for i in range(num_sessions):
+            session_id = session_ids[i]
+            for column in range(3 + num_outcomes):
+                data[i, column] = starting_data[i, column]
+            # A session's stamp card position follows from its total stamps, the EX card repeating
+            card_index = min(data[i, 1] // MAX_STAMP_CARD_VALUE, num_cards - 1)
+            card_value = data[i, 1] % MAX_STAMP_CARD_VALUE
+            ten_draw_index = first_ten_draw_indices[i]
+            criterion_value = criterion_values[i]
+
+            while True:
+                if criterion_code == 0:
+                    running = data[i, 0] < (criterion_value + 1) * WEAPON_PARTS_PER_OVERBOOST
+                elif criterion_code == 1:
+                    running = (criterion_value - data[i, 2]) >= TEN_DRAW_CRYSTAL_COST
+                else:
+                    running = data[i, 1] < criterion_value
+                if not running or (max_crystals_spent - data[i, 2]) < TEN_DRAW_CRYSTAL_COST:
+                    break
+
+                stamp_roll = np.int64(
+                    _jit_counter_uniform(key, session_id, ten_draw_index, STAMP_LANE)
+                    * STAMP_ROLL_MAX
+                )
+                stamp_value = stamp_value_lookup[stamp_roll]
+
+                new_value = card_value + stamp_value
+                next_index = min(card_index + 1, num_cards - 1)
+                for r in range(num_rules):
+                    rule_counts[r] = (
+                        card_rule_prefix[
+                            card_index, min(new_value, MAX_STAMP_CARD_VALUE), r
+                        ]
+                        - card_rule_prefix[card_index, card_value, r]
+                    )
+                if new_value >= MAX_STAMP_CARD_VALUE:
+                    card_value = new_value - MAX_STAMP_CARD_VALUE
+                    card_index = next_index
+                    for r in range(num_rules):
+                        rule_counts[r] += card_rule_prefix[card_index, card_value, r]
+                else:
+                    card_value = new_value
+
+                slot_kind = 0
+                slot_kind_end = rule_counts[0]
+                for slot in range(DRAWS_PER_TEN_DRAW):
+                    while slot_kind < num_rules and slot >= slot_kind_end:
+                        slot_kind += 1
+                        if slot_kind < num_rules:
+                            slot_kind_end += rule_counts[slot_kind]
+                    draw_float = _jit_counter_uniform(
+                        key, session_id, ten_draw_index, FIRST_DRAW_LANE + slot
+                    )
+                    outcome = 0
+                    for k in range(num_outcomes - 1):
+                        if draw_float >= slot_cdfs[slot_kind, k]:
+                            outcome += 1
+                    data[i, 0] += weapon_parts_per_outcome[outcome]
+                    data[i, 3 + outcome] += 1
+
+                data[i, 1] += stamp_value
+                data[i, 2] += TEN_DRAW_CRYSTAL_COST
+                ten_draw_index += 1
+
+        return data
+
+
+def simulate_sessions(
+    compiled_banner,
+    session_criterion,
+    criterion_value,
+    starting_weapon_parts,
+    session_start,
+    session_stop,
+    key,
+    engine="numpy",
+    sampling="plain",
+    max_crystals_spent=None,
+):
+    """
+    Simulate the pull sessions with indices in [session_start, session_stop) on a compiled banner.
+
+    Args:
+        compiled_banner (CompiledBanner): Rate, stamp and stamp card tables for the banner and target weapon type.
+        session_criterion (str): One of 'crystals_spent', 'overboost', or 'stamps_earned'.
+        criterion_value (int): The value at which each pull session should stop.
+        starting_weapon_parts (int): The number of weapon parts each pull session starts with.
+        session_start (int): Index of the first session to simulate.
+        session_stop (int): Index one past the last session to simulate.
+        key (int): Key for the per-session random streams, from `generate_session_key()`.
+        engine (str): 'numpy' for the vectorized engine, or 'jit' for the Numba-compiled kernel. 'jit' falls
+            back to 'numpy' (with a warning) when Numba is not installed. Both engines return identical results.
+            'multinomial' samples each ten draw's outcome counts at once from the cached distributions of
+            `CompiledBanner.generate_ten_draw_tables()`; its sessions follow the same distribution, but are
+            not the same sessions as the other engines give for a seed.
+        sampling (str): One of 'plain', 'antithetic', 'stratified', or 'sobol' (see `SessionUniforms`). Only
+            'plain' is supported by the 'jit' engine.
+        max_crystals_spent (int): Crystal cap of a compound stop rule: sessions also stop once another ten
+            draw would go over it, so they can end before reaching `criterion_value` (censored sessions).
+            Default value of None (no cap).
+
+    Returns:
+        numpy.ndarray: One row per session, with columns in the order of `SESSION_DATA_COLUMNS`.
+    """
+
+    validate_criterion_value(session_criterion, criterion_value)
+    max_crystals_spent = crystal_cap(max_crystals_spent)
+
+    if engine not in ["numpy", "jit", "multinomial"]:
+        raise ValueError(
+            "`engine` must be a str of either 'numpy', 'jit', or 'multinomial'. Provided: ",
+            engine,
+        )
+
+    if engine == "jit" and sampling != "plain":
+        raise ValueError(
+            "The 'jit' engine only supports 'plain' sampling. Provided: ", sampling
+        )
+
+    session_ids = np.arange(session_start, session_stop, dtype=np.int64)
+
+    if engine == "jit" and not NUMBA_AVAILABLE:
+        warnings.warn(
+            "Numba is not installed, so the 'jit' engine is falling back to 'numpy'."
+        )
+        engine = "numpy"
+
+    if engine == "jit":
+        starting_data = np.zeros((len(session_ids), NUM_DATA_COLUMNS), dtype=np.int64)
+        starting_data[:, 0] = starting_weapon_parts
+
+        return _jit_simulate_sessions(
+            compiled_banner.stamp_value_lookup,
+            compiled_banner.card_rule_prefix,
+            compiled_banner.slot_cdfs,
+            compiled_banner.weapon_parts_per_outcome,
+            CRITERION_CODES[session_criterion],
+            np.full(len(session_ids), criterion_value, dtype=np.int64),
+            max_crystals_spent,
+            starting_data,
+            np.zeros(len(session_ids), dtype=np.int64),
+            session_ids,
+            np.uint64(key),
+        )
+
+    data, _ = simulate_sessions_numpy(
+        compiled_banner,
+        CRITERION_CODES[session_criterion],
+        criterion_value,
+        starting_weapon_parts,
+        session_ids,
+        key,
+        sampling=sampling,
+        ten_draw_tables=(
+            compiled_banner.generate_ten_draw_tables() if engine == "multinomial" else None
+        ),
+        max_crystals_spent=max_crystals_spent,
+    )
+
+    return data
+
+
+def continue_sessions(
+    compiled_banner,
+    session_criterion,
+    criterion_value,
+    end_states,
+    session_start,
+    key,
+    engine="numpy",
+    sampling="plain",
+    max_crystals_spent=None,
+):
+    """
+    Continue the sessions with indices from `session_start` on from their end states to a higher criterion
+    value of the same criterion. A session's end state is its row of session data: its total stamps give its
+    stamp card index and value, and its crystals spent give its position in its random stream (the ten draws
+    it has made), so only the extra ten draws are simulated, and the results match a fresh run at the higher
+    value with the same key.
+
+    Args:
+        compiled_banner (CompiledBanner): Rate, stamp and stamp card tables for the banner and target weapon type.
+        session_criterion (str): One of 'crystals_spent', 'overboost', or 'stamps_earned'.
+        criterion_value (int): The new value at which each pull session should stop.
+        end_states (numpy.ndarray): Session data of the sessions to continue, with columns in the order of
+            `SESSION_DATA_COLUMNS`.
+        session_start (int): Index of the first session to continue.
+        key (int): Key of the sessions' random streams.
+        engine (str): One of 'numpy', 'jit', or 'multinomial', as in `simulate_sessions()`.
+        sampling (str): One of 'plain', 'antithetic', 'stratified', or 'sobol'.
+        max_crystals_spent (int): Crystal cap of the sessions, as in `simulate_sessions()`.
+
+    Returns:
+        numpy.ndarray: One row per session, with columns in the order of `SESSION_DATA_COLUMNS`.
+    """
+
+    validate_criterion_value(session_criterion, criterion_value)
+    max_crystals_spent = crystal_cap(max_crystals_spent)
+
+    if engine not in ["numpy", "jit", "multinomial"]:
+        raise ValueError(
+            "`engine` must be a str of either 'numpy', 'jit', or 'multinomial'. Provided: ",
+            engine,
+        )
+
+    if engine == "jit" and not NUMBA_AVAILABLE:
+        warnings.warn(
+            "Numba is not installed, so the 'jit' engine is falling back to 'numpy'."
+        )
+        engine = "numpy"
+
+    end_states = np.asarray(end_states, dtype=np.int64)
+    session_ids = np.arange(session_start, session_start + len(end_states), dtype=np.int64)
+    first_ten_draw_indices = end_states[:, 2] // TEN_DRAW_CRYSTAL_COST
+
+    if engine == "jit":
+        return _jit_simulate_sessions(
+            compiled_banner.stamp_value_lookup,
+            compiled_banner.card_rule_prefix,
+            compiled_banner.slot_cdfs,
+            compiled_banner.weapon_parts_per_outcome,
+            CRITERION_CODES[session_criterion],
+            np.full(len(session_ids), criterion_value, dtype=np.int64),
+            max_crystals_spent,
+            end_states,
+            first_ten_draw_indices,
+            session_ids,
+            np.uint64(key),
+        )
+
+    data = end_states.copy()
+    running = session_is_running(
+        end_states, CRITERION_CODES[session_criterion], criterion_value, max_crystals_spent
+    )
+
+    # The NumPy engine runs sessions in lockstep, so sessions continue in groups at the same ten draw
+    for first_ten_draw_index in np.unique(first_ten_draw_indices[running]):
+        group = running & (first_ten_draw_indices == first_ten_draw_index)
+        data[group], _ = simulate_sessions_numpy(
+            compiled_banner,
+            CRITERION_CODES[session_criterion],
+            criterion_value,
+            None,
+            session_ids[group],
+            key,
+            sampling=sampling,
+            ten_draw_tables=(
+                compiled_banner.generate_ten_draw_tables() if engine == "multinomial" else None
+            ),
+            starting_data=end_states[group],
+            first_ten_draw_index=int(first_ten_draw_index),
+            max_crystals_spent=max_crystals_spent,
+        )
+
+    return data
+
+
+def simulate_population_sessions(
+    compiled_banner,
+    session_criterion,
+    criterion_values,
+    starting_weapon_parts,
+    starting_stamps,
+    session_start,
+    key,
+    engine="numpy",
+    sampling="plain",
+    max_crystals_spent=None,
+):
+    """
+    Simulate sessions with their own criterion values, starting weapon parts and starting stamp card
+    positions, one of each per session, in one batched run. A session's stamp card position is given as the
+    stamps it starts with (card index * 12 + stamp value), from which the engines already derive its card;
+    its `total_stamps_earned` only counts the stamps earned during the session, and for the 'stamps_earned'
+    criterion its criterion value is the number of stamps to earn during the session.
+
+    Args:
+        compiled_banner (CompiledBanner): Rate, stamp and stamp card tables for the banner and target weapon type.
+        session_criterion (str): One of 'crystals_spent', 'overboost', or 'stamps_earned'.
+        criterion_values (numpy.ndarray): Each session's criterion value.
+        starting_weapon_parts (numpy.ndarray): Each session's starting weapon parts.
+        starting_stamps (numpy.ndarray): Each session's starting stamps.
+        session_start (int): Index of the first session; sessions are numbered on from it.
+        key (int): Key for the per-session random streams, from `generate_session_key()`.
+        engine (str): One of 'numpy', 'jit', or 'multinomial', as in `simulate_sessions()`.
+        sampling (str): One of 'plain', 'antithetic', 'stratified', or 'sobol'.
+        max_crystals_spent (int): Crystal cap of the sessions, as in `simulate_sessions()`.
+
+    Returns:
+        numpy.ndarray: One row per session, with columns in the order of `SESSION_DATA_COLUMNS`.
+    """
+
+    criterion_values = np.asarray(criterion_values, dtype=np.int64)
+    starting_stamps = np.asarray(starting_stamps, dtype=np.int64)
+    if len(criterion_values):
+        # Criterion values are only range checked, so the extremes cover every session
+        validate_criterion_value(session_criterion, int(criterion_values.min()))
+        validate_criterion_value(session_criterion, int(criterion_values.max()))
+    max_crystals_spent = crystal_cap(max_crystals_spent)
+
+    if engine not in ["numpy", "jit", "multinomial"]:
+        raise ValueError(
+            "`engine` must be a str of either 'numpy', 'jit', or 'multinomial'. Provided: ",
+            engine,
+        )
+
+    if engine == "jit" and sampling != "plain":
+        raise ValueError(
+            "The 'jit' engine only supports 'plain' sampling. Provided: ", sampling
+        )
+
+    if engine == "jit" and not NUMBA_AVAILABLE:
+        warnings.warn(
+            "Numba is not installed, so the 'jit' engine is falling back to 'numpy'."
+        )
+        engine = "numpy"
+
+    session_ids = np.arange(session_start, session_start + len(criterion_values), dtype=np.int64)
+    starting_data = np.zeros((len(session_ids), NUM_DATA_COLUMNS), dtype=np.int64)
+    starting_data[:, 0] = starting_weapon_parts
+    starting_data[:, 1] = starting_stamps
+
+    # The engines compare total stamps, starting stamps included, against the criterion
+    if session_criterion == "stamps_earned":
+        criterion_values = criterion_values + starting_stamps
+
+    if engine == "jit":
+        data = _jit_simulate_sessions(
+            compiled_banner.stamp_value_lookup,
+            compiled_banner.card_rule_prefix,
+            compiled_banner.slot_cdfs,
+            compiled_banner.weapon_parts_per_outcome,
+            CRITERION_CODES[session_criterion],
+            criterion_values,
+            max_crystals_spent,
+            starting_data,
+            np.zeros(len(session_ids), dtype=np.int64),
+            session_ids,
+            np.uint64(key),
+        )
+    else:
+        data, _ = simulate_sessions_numpy(
+            compiled_banner,
+            CRITERION_CODES[session_criterion],
+            criterion_values,
+            None,
+            session_ids,
+            key,
+            sampling=sampling,
+            ten_draw_tables=(
+                compiled_banner.generate_ten_draw_tables() if engine == "multinomial" else None
+            ),
+            starting_data=starting_data,
+            max_crystals_spent=max_crystals_spent,
+        )
+
+    data[:, 1] -= starting_stamps
+
+    return data
+
+
+def simulate_weighted_sessions(
+    compiled_banner,
+    session_criterion,
+    criterion_value,
+    starting_weapon_parts,
+    session_start,
+    session_stop,
+    key,
+    five_star_tilt=1.0,
+    stamp_tilt=0.0,
+    max_crystals_spent=None,
+):
+    """
+    Importance-sampled version of `simulate_sessions()` on the NumPy engine. Sessions are simulated under
+    the tilted tables of `CompiledBanner.importance_proposal()`, and each one carries the likelihood ratio
+    that weights it back to the banner's true rates.
+
+    Returns:
+        tuple: Session data (columns in the order of `SESSION_DATA_COLUMNS`) and each session's likelihood ratio.
+    """
+
+    validate_criterion_value(session_criterion, criterion_value)
+    max_crystals_spent = crystal_cap(max_crystals_spent)
+
+    data, log_weights = simulate_sessions_numpy(
+        compiled_banner,
+        CRITERION_CODES[session_criterion],
+        criterion_value,
+        starting_weapon_parts,
+        np.arange(session_start, session_stop, dtype=np.int64),
+        key,
+        proposal=compiled_banner.importance_proposal(
+            five_star_tilt=five_star_tilt, stamp_tilt=stamp_tilt
+        ),
+        max_crystals_spent=max_crystals_spent,
+    )
+
+    return data, np.exp(log_weights)
+
+
+def simulate_traced_sessions(
+    compiled_banner,
+    session_criterion,
+    criterion_value,
+    starting_weapon_parts,
+    session_ids,
+    key,
+    engine="numpy",
+    sampling="plain",
+    max_crystals_spent=None,
+):
+    """
+    Replay the sessions with the given indices, recording a trace of every ten draw. Each session's random
+    numbers only depend on the key and its index, so the replayed sessions are the same sessions as in the
+    full run ('jit' sessions are replayed on the identical 'numpy' engine).
+
+    Returns:
+        tuple: Session data (one row per session, columns in the order of `SESSION_DATA_COLUMNS`), and one
+            array of trace records of shape (ten draws, TRACE_RECORD_BYTES) per session.
+    """
+
+    validate_criterion_value(session_criterion, criterion_value)
+    max_crystals_spent = crystal_cap(max_crystals_spent)
+
+    if engine not in ["numpy", "jit", "multinomial"]:
+        raise ValueError(
+            "`engine` must be a str of either 'numpy', 'jit', or 'multinomial'. Provided: ",
+            engine,
+        )
+
+    traces = [[] for _ in range(len(session_ids))]
+    data, _ = simulate_sessions_numpy(
+        compiled_banner,
+        CRITERION_CODES[session_criterion],
+        criterion_value,
+        starting_weapon_parts,
+        np.asarray(session_ids, dtype=np.int64),
+        key,
+        sampling=sampling,
+        ten_draw_tables=(
+            compiled_banner.generate_ten_draw_tables() if engine == "multinomial" else None
+        ),
+        traces=traces,
+        max_crystals_spent=max_crystals_spent,
+    )
+
+    return data, [
+        np.array(trace, dtype=np.uint8).reshape(len(trace), TRACE_RECORD_BYTES) for trace in traces
+    ]
@@ -0,0 +1,301 @@
+import argparse
+import hashlib
+import os
+import pickle
+import socket
+import subprocess
+import sys
+import time
+from functools import reduce
+from pathlib import Path
+from ever_crisis_gacha_simulator.classes.compiled_banner import CompiledBanner
+from ever_crisis_gacha_simulator.classes.partial_result import PartialResult
+from ever_crisis_gacha_simulator.session_kernels import (
+    generate_session_key,
+    simulate_sessions,
+)
+
+
+# Sessions simulated per call of the session engine while running a shard
+SESSIONS_PER_SHARD_CHUNK = 10_000
+
+TASKS_DIRECTORY = "tasks"
+CLAIMED_DIRECTORY = "claimed"
+RESULTS_DIRECTORY = "results"
+
+
+def generate_config_hash(metadata, key, sampling="plain", engine="numpy"):
+    """
+    Hash everything that determines the sessions of a run except how many there are, so that only partial
+    results of the same configuration and seed stream can be merged. The 'numpy' and 'jit' engines give
+    identical sessions, so they share a hash.
+    """
+
+    config = (
+        metadata["session_criterion"],
+        metadata["criterion_value"],
+        metadata["target_weapon_type"],
+        metadata["banner_info"],
+        metadata["starting_weapon_parts"],
+        key,
+        sampling,
+        "numpy" if engine == "jit" else engine,
+    )
+    # Uncapped runs keep the hashes they had before crystal caps existed
+    if metadata.get("max_crystals_spent") is not None:
+        config += (metadata["max_crystals_spent"],)
+
+    return hashlib.sha256(repr(config).encode()).hexdigest()
+
+
+def generate_shard_specs(metadata, num_shards, engine="numpy", sampling="plain", keep_data=False):
+    """
+    Split a `GachaSim` configuration into independent shards. Each shard is a range of session indices plus
+    the key of the run's seed stream; since every session's random numbers only depend on the key and its
+    index, shards can run anywhere, in any order, and still merge into the single-machine result.
+
+    Args:
+        metadata (dict): The `metadata` of a `GachaSim`.
+        num_shards (int): Number of shards to split the sessions into.
+        engine (str): One of 'numpy', 'jit', or 'multinomial'.
+        sampling (str): One of 'plain', 'antithetic', 'stratified', or 'sobol'.
+        keep_data (bool): Whether shards should return their session data along with the summary.
+
+    Returns:
+        list: One dict per shard, each safe to pickle and send to another machine.
+    """
+
+    if engine not in ["numpy", "jit", "multinomial"]:
+        raise ValueError(
+            "`engine` must be a str of either 'numpy', 'jit', or 'multinomial'. Provided: ",
+            engine,
+        )
+
+    if num_shards < 1:
+        raise ValueError("`num_shards` must be at least 1. Provided: ", num_shards)
+
+    key, entropy = generate_session_key(metadata["seed_value"])
+    config_hash = generate_config_hash(metadata, key, sampling=sampling, engine=engine)
+    num_simulations = metadata["num_simulations"]
+
+    return [
+        {
+            "shard_index": shard_index,
+            "session_start": shard_index * num_simulations // num_shards,
+            "session_stop": (shard_index + 1) * num_simulations // num_shards,
+            "key": key,
+            "entropy": entropy,
+            "config_hash": config_hash,
+            "session_criterion": metadata["session_criterion"],
+            "criterion_value": metadata["criterion_value"],
+            "target_weapon_type": metadata["target_weapon_type"],
+            "banner_info": metadata["banner_info"],
+            "starting_weapon_parts": metadata["starting_weapon_parts"],
+            "max_crystals_spent": metadata.get("max_crystals_spent"),
+            "engine": engine,
+            "sampling": sampling,
+            "keep_data": keep_data,
+        }
+        for shard_index in range(num_shards)
+    ]
+
+
+def run_shard(shard_spec):
+    """
+    Simulate the sessions of one shard.
+
+    Returns:
+        PartialResult: The shard's mergeable partial result.
+    """
+
+    compiled_banner = CompiledBanner(
+        banner_info=shard_spec["banner_info"],
+        target_weapon_type=shard_spec["target_weapon_type"],
+    )
+    if shard_spec["engine"] == "multinomial":
+        compiled_banner.generate_ten_draw_tables()
+
+    partial_results = []
+    for chunk_start in range(
+        shard_spec["session_start"], shard_spec["session_stop"], SESSIONS_PER_SHARD_CHUNK
+    ):
+        chunk_stop = min(chunk_start + SESSIONS_PER_SHARD_CHUNK, shard_spec["session_stop"])
+        data = simulate_sessions(
+            compiled_banner=compiled_banner,
+            session_criterion=shard_spec["session_criterion"],
+            criterion_value=shard_spec["criterion_value"],
+            starting_weapon_parts=shard_spec["starting_weapon_parts"],
+            session_start=chunk_start,
+            session_stop=chunk_stop,
+            key=shard_spec["key"],
+            engine=shard_spec["engine"],
+            sampling=shard_spec["sampling"],
+            max_crystals_spent=shard_spec.get("max_crystals_spent"),
+        )
+        partial_results.append(
+            PartialResult.from_data(
+                shard_spec["config_hash"],
+                chunk_start,
+                chunk_stop,
+                data,
+                keep_data=shard_spec["keep_data"],
+            )
+        )
+
+    partial_result = merge_partial_results(partial_results)
+
+    # Keep one data block per shard rather than one per chunk
+    if partial_result.data_blocks is not None:
+        partial_result.data_blocks = {
+            shard_spec["session_start"]: partial_result.to_dataframe().to_numpy()
+        }
+
+    return partial_result
+
+
+def merge_partial_results(partial_results):
+    """
+    Merge any number of partial results of the same configuration into one.
+    """
+
+    if not partial_results:
+        raise ValueError("At least one partial result is needed. Provided: ", partial_results)
+
+    return reduce(PartialResult.merge, partial_results)
+
+
+def write_shard_tasks(shard_specs, directory):
+    """
+    Write shard specs as task files for file-based workers. The directory can be any folder the workers can
+    reach, such as a network share.
+    """
+
+    directory = Path(directory)
+    for subdirectory in [TASKS_DIRECTORY, CLAIMED_DIRECTORY, RESULTS_DIRECTORY]:
+        (directory / subdirectory).mkdir(parents=True, exist_ok=True)
+
+    for shard_spec in shard_specs:
+        task_path = directory / TASKS_DIRECTORY / f"shard_{shard_spec['shard_index']:05d}.pkl"
+        with open(task_path.with_suffix(".tmp"), "wb") as file:
+            pickle.dump(shard_spec, file)
+        os.replace(task_path.with_suffix(".tmp"), task_path)
+
+
+def run_worker(directory, worker_name=None):
+    """
+    Claim and run shard tasks from a task directory until none are left. A task is claimed by atomically
+    moving its file into the claimed directory, so several workers can share one directory safely.
+
+    Returns:
+        int: Number of shards this worker ran.
+    """
+
+    directory = Path(directory)
+    worker_name = worker_name or f"{socket.gethostname()}-{os.getpid()}"
+    num_shards_run = 0
+
+    for task_path in sorted((directory / TASKS_DIRECTORY).glob("shard_*.pkl")):
+        claimed_path = directory / CLAIMED_DIRECTORY / f"{task_path.stem}.{worker_name}.pkl"
+        try:
+            os.rename(task_path, claimed_path)
+        except FileNotFoundError:
+            # Another worker claimed it first
+            continue
+
+        with open(claimed_path, "rb") as file:
+            shard_spec = pickle.load(file)
+
+        result_path = directory / RESULTS_DIRECTORY / f"{task_path.stem}.npz"
+        run_shard(shard_spec).save(result_path.with_suffix(".tmp"))
+        os.replace(result_path.with_suffix(".tmp"), result_path)
+        num_shards_run += 1
+
+    return num_shards_run
+
+
+def collect_results(directory, num_shards, timeout=None, poll_seconds=0.5):
+    """
+    Wait for the result files of all shards in a task directory, then merge them.
+
+    Returns:
+        PartialResult: The merged result of every shard.
+    """
+
+    results_directory = Path(directory) / RESULTS_DIRECTORY
+    start_time = time.monotonic()
+
+    while True:
+        result_paths = sorted(results_directory.glob("shard_*.npz"))
+        if len(result_paths) >= num_shards:
+            break
+        if timeout is not None and time.monotonic() - start_time > timeout:
+            raise TimeoutError(
+                f"Only {len(result_paths)} of {num_shards} shard results arrived within {timeout} seconds."
+            )
+        time.sleep(poll_seconds)
+
+    return merge_partial_results([PartialResult.load(path) for path in result_paths])
+
+
+def run_local_cluster(shard_specs, directory, num_workers=2, timeout=None):
+    """
+    Run shards on several local worker processes that stand in for separate machines, each started with
+    `python -m ever_crisis_gacha_simulator.sharding worker <directory>`.
+
+    Returns:
+        PartialResult: The merged result of every shard.
+    """
+
+    write_shard_tasks(shard_specs, directory)
+
+    # Workers must be able to import this package even when it is not installed
+    environment = dict(os.environ)
+    package_root = str(Path(__file__).resolve().parents[1])
+    environment["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [package_root, environment.get("PYTHONPATH")])
+    )
+
+    workers = [
+        subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "ever_crisis_gacha_simulator.sharding",
+                "worker",
+                str(directory),
+                "--name",
+                f"local-{worker_index}",
+            ],
+            env=environment,
+        )
+        for worker_index in range(num_workers)
+    ]
+
+    for worker in workers:
+        if worker.wait(timeout=timeout) != 0:
+            raise RuntimeError(
+                f"A local worker exited with return code {worker.returncode}."
+            )
+
+    return collect_results(directory, len(shard_specs), timeout=timeout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run shards of a gacha simulation from a shared task directory."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    worker_parser = subparsers.add_parser("worker", help="Claim and run shard tasks until none are left.")
+    worker_parser.add_argument("directory")
+    worker_parser.add_argument("--name", default=None)
+
+    arguments = parser.parse_args(argv)
+
+    if arguments.command == "worker":
+        num_shards_run = run_worker(arguments.directory, worker_name=arguments.name)
+        print(f"Ran {num_shards_run} shards.")
+
+
+if __name__ == "__main__":
+    main()
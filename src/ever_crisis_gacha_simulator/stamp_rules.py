@@ -0,0 +1,125 @@
+import numpy as np
+from decimal import Decimal
+from ever_crisis_gacha_simulator.constants import *
+
+
+# Rarities from highest to lowest, and the draw pools a stamp card rule can grant (see STAMP_CARD_RULE_SPECS)
+RARITIES = ["five_star", "four_star", "three_star"]
+RULE_POOLS = ["any", "featured", "random_featured", "other_featured", "chosen"]
+
+# Every outcome name is one of these categories followed by a rarity, e.g. 'nontargeted_featured_four_star'
+OUTCOME_CATEGORIES = ["targeted", "nontargeted_featured", "nontargeted"]
+
+
+def validate_rule_specs(rule_specs=STAMP_CARD_RULE_SPECS):
+    """
+    Make sure every stamp card rule spec names a supported rarity and pool.
+    """
+
+    for rule, spec in rule_specs.items():
+        if set(spec) != {"rarity", "pool"}:
+            raise ValueError(
+                f"The spec of rule '{rule}' must have exactly the keys 'rarity' and 'pool'. Provided: ", spec
+            )
+        if spec["rarity"] not in RARITIES:
+            raise ValueError(f"The rarity of rule '{rule}' must be one of {RARITIES}. Provided: ", spec["rarity"])
+        if spec["pool"] not in RULE_POOLS:
+            raise ValueError(f"The pool of rule '{rule}' must be one of {RULE_POOLS}. Provided: ", spec["pool"])
+
+
+def split_outcome_name(outcome):
+    """
+    Split an outcome name into its category and rarity, e.g. 'targeted_five_star' into ('targeted', 'five_star').
+    """
+
+    category, rarity_first, rarity_second = outcome.rsplit("_", 2)
+
+    return category, f"{rarity_first}_{rarity_second}"
+
+
+def rarity_float_range(rarity):
+    """
+    Return the [low, high) range of the unit interval that `TenDraw.determine_pull_result()` maps to a rarity.
+    """
+
+    low = sum(
+        (OVERALL_RARITY_RATES_DICT[higher] for higher in RARITIES[: RARITIES.index(rarity)]), Decimal(0)
+    )
+
+    return low, low + OVERALL_RARITY_RATES_DICT[rarity]
+
+
+def pool_category_probabilities(pool, target_weapon_type, num_featured_weapons):
+    """
+    Return the probability of each outcome category for a draw from a rule's weapon pool (other than 'any').
+    Featured weapons count as nontargeted when the target is a wishlisted weapon, and a banner with a single
+    featured weapon has no other featured weapon to give, so its 'other_featured' draws are off-banner weapons.
+
+    Returns:
+        dict: Outcome categories mapped to their probabilities.
+    """
+
+    if pool == "chosen":
+        return {"targeted": 1.0}
+
+    if target_weapon_type == "wishlisted":
+        return {"nontargeted": 1.0}
+
+    two_featured = num_featured_weapons == 2
+
+    if pool == "featured":
+        return {"targeted": 1.0}
+    elif pool == "random_featured":
+        return {"targeted": 0.5, "nontargeted_featured": 0.5} if two_featured else {"targeted": 1.0}
+    elif pool == "other_featured":
+        return {"nontargeted_featured": 1.0} if two_featured else {"nontargeted": 1.0}
+
+    raise ValueError(f"`pool` must be one of {RULE_POOLS[1:]}. Provided: ", pool)
+
+
+def compile_rule_probabilities(
+    rule_spec,
+    outcome_names,
+    standard_probabilities,
+    target_weapon_type,
+    num_featured_weapons,
+):
+    """
+    Compile a stamp card rule spec into the outcome probabilities of the draw it grants.
+
+    Args:
+        rule_spec (dict): The rule's 'rarity' and 'pool' (see STAMP_CARD_RULE_SPECS).
+        outcome_names (list): Outcome names, in the order of the returned probabilities.
+        standard_probabilities (numpy.ndarray): Outcome probabilities of a standard draw.
+        target_weapon_type (str): Either 'featured' or 'wishlisted'.
+        num_featured_weapons (int): Number of featured weapons on the banner.
+
+    Returns:
+        numpy.ndarray: The outcome probabilities of a draw under the rule.
+    """
+
+    rarities = np.array([split_outcome_name(outcome)[1] for outcome in outcome_names])
+    rarity_rank = RARITIES.index(rule_spec["rarity"])
+
+    if rule_spec["pool"] == "any":
+        # Lower rarities are promoted to the rule's rarity, split like its standard rates
+        at_rarity = rarities == rule_spec["rarity"]
+        promoted = np.isin(rarities, RARITIES[rarity_rank + 1:])
+        above_rarity = ~(at_rarity | promoted)
+
+        probabilities = np.where(above_rarity, standard_probabilities, 0.0)
+        probabilities[at_rarity] = (
+            standard_probabilities[at_rarity]
+            / standard_probabilities[at_rarity].sum()
+            * (standard_probabilities[at_rarity].sum() + standard_probabilities[promoted].sum())
+        )
+
+        return probabilities
+
+    probabilities = np.zeros(len(outcome_names))
+    for category, probability in pool_category_probabilities(
+        rule_spec["pool"], target_weapon_type, num_featured_weapons
+    ).items():
+        probabilities[outcome_names.index(f"{category}_{rule_spec['rarity']}")] = probability
+
+    return probabilities
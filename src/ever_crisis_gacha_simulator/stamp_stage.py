@@ -0,0 +1,138 @@
+import numpy as np
+from ever_crisis_gacha_simulator.classes.crystal_pull_session import validate_max_crystals_spent
+from ever_crisis_gacha_simulator.constants import *
+from ever_crisis_gacha_simulator.sampling import STAMP_LANE, SessionUniforms
+
+
+# Number of ten draws whose stamps (and triggered rules) the session engines sample per batch. Larger blocks
+# waste work on sessions that stop mid-block and stop fitting in cache.
+STAMP_BLOCK_TEN_DRAWS = 8
+
+# Batch size for stamp-only sessions, which only need a cumulative sum per ten draw
+STAMP_ONLY_BLOCK_TEN_DRAWS = 64
+
+
+def sample_stamp_block(
+    compiled_banner,
+    session_uniforms,
+    positions,
+    first_ten_draw_index,
+    num_ten_draws,
+    proposal=None,
+):
+    """
+    Sample the stamp values of `num_ten_draws` consecutive ten draws, starting at `first_ten_draw_index`, for the
+    sessions at `positions` in one batch, by inverse-CDF table lookup of each ten draw's stamp float. Stamps
+    never depend on draw outcomes, so they can be sampled ahead of the draws.
+
+    Returns:
+        tuple: Stamp values of shape (sessions, num_ten_draws), and the log likelihood ratios of those stamps
+            under an importance sampling `proposal` (all 0 without one).
+    """
+
+    stamp_floats = np.stack(
+        [
+            session_uniforms.uniforms(positions, first_ten_draw_index + offset, STAMP_LANE)
+            for offset in range(num_ten_draws)
+        ],
+        axis=1,
+    )
+
+    if proposal is None:
+        return (
+            compiled_banner.stamp_value_lookup[(stamp_floats * STAMP_ROLL_MAX).astype(np.int64)],
+            np.zeros(stamp_floats.shape),
+        )
+
+    stamp_indices = np.searchsorted(proposal["stamp_cdf"], stamp_floats, side="right")
+
+    return (
+        compiled_banner.stamp_values[stamp_indices],
+        proposal["stamp_log_likelihood_ratios"][stamp_indices],
+    )
+
+
+def ten_draw_rule_codes(compiled_banner, starting_stamps, stamp_values):
+    """
+    Compute up front which stamp card rules each ten draw of a stamp sequence triggers. The cumulative stamp
+    total is a session's absolute position across its stamp cards, so the rules of a ten draw are the rules
+    at absolute positions between the totals before and after its stamps.
+
+    Args:
+        compiled_banner (CompiledBanner): The banner's stamp card tables.
+        starting_stamps (numpy.ndarray): Total stamps each session had earned before the sequence.
+        stamp_values (numpy.ndarray): Stamp values of shape (sessions, ten draws).
+
+    Returns:
+        numpy.ndarray: The `rule_multiset_codes()` of each ten draw's rules, of shape (sessions, ten draws).
+    """
+
+    boundaries = np.concatenate(
+        [starting_stamps[:, None], starting_stamps[:, None] + np.cumsum(stamp_values, axis=1)],
+        axis=1,
+    )
+
+    return np.diff(compiled_banner.absolute_rule_codes(boundaries), axis=1)
+
+
+def simulate_stamp_sessions(
+    compiled_banner,
+    criterion_value,
+    session_start,
+    session_stop,
+    key,
+    sampling="plain",
+    max_crystals_spent=None,
+):
+    """
+    Simulate `stamps_earned` sessions from their stamp sequences alone. Weapon draws never affect stamps, so the
+    stamps earned and crystals spent (the ten draws until the stamp total first reaches `criterion_value`, or
+    until `max_crystals_spent` allows no more) need no draws at all, and match the same columns of the full
+    session engines for the same key.
+
+    Returns:
+        numpy.ndarray: One row per session in [session_start, session_stop), holding its total stamps earned
+            and crystals spent.
+    """
+
+    validate_max_crystals_spent(max_crystals_spent)
+    max_ten_draws = (
+        np.iinfo(np.int64).max if max_crystals_spent is None else max_crystals_spent // TEN_DRAW_CRYSTAL_COST
+    )
+
+    session_ids = np.arange(session_start, session_stop, dtype=np.int64)
+    num_sessions = len(session_ids)
+    session_uniforms = SessionUniforms(key, session_ids, sampling=sampling)
+    total_stamps = np.zeros(num_sessions, dtype=np.int64)
+    num_ten_draws = np.zeros(num_sessions, dtype=np.int64)
+
+    active = np.arange(num_sessions)
+    first_ten_draw_index = 0
+
+    while True:
+        active = active[(total_stamps[active] < criterion_value) & (num_ten_draws[active] < max_ten_draws)]
+        if active.size == 0:
+            break
+
+        stamp_values, _ = sample_stamp_block(
+            compiled_banner,
+            session_uniforms,
+            active,
+            first_ten_draw_index,
+            STAMP_ONLY_BLOCK_TEN_DRAWS,
+        )
+        cumulative_stamps = total_stamps[active, None] + np.cumsum(stamp_values, axis=1)
+
+        # Ten draws needed within this block, or the whole block if the criterion is still not met, up to the
+        # ten draws the crystal cap has left
+        reached = cumulative_stamps >= criterion_value
+        block_ten_draws = np.minimum(
+            np.where(reached.any(axis=1), reached.argmax(axis=1) + 1, STAMP_ONLY_BLOCK_TEN_DRAWS),
+            max_ten_draws - num_ten_draws[active],
+        )
+
+        total_stamps[active] = cumulative_stamps[np.arange(active.size), block_ten_draws - 1]
+        num_ten_draws[active] += block_ten_draws
+        first_ten_draw_index += STAMP_ONLY_BLOCK_TEN_DRAWS
+
+    return np.stack([total_stamps, num_ten_draws * TEN_DRAW_CRYSTAL_COST], axis=1)
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+from ever_crisis_gacha_simulator.confidence_intervals import count_table_quantiles
+from ever_crisis_gacha_simulator.constants import *
+
+
+SUMMARY_PERCENTILES = [5, 25, 50, 75, 95]
+MAX_SUMMARY_OVERBOOST = 10
+
+
+def parts_to_overboost(weapon_parts):
+    """
+    Convert weapon parts to overboost levels, element-wise: divide by 200, round down, and subtract 1 (e.g. 525
+    weapon parts is OB1). Fewer than 200 weapon parts gives -1, as the weapon has not been drawn at 5* yet.
+    """
+
+    return np.floor_divide(weapon_parts, WEAPON_PARTS_PER_OVERBOOST) - 1
+
+
+def weighted_count_table(values, weights=None):
+    """
+    Collapse a column into its distinct values and their total weight (their counts, without weights).
+    """
+
+    values, inverse = np.unique(np.asarray(values), return_inverse=True)
+
+    return values, np.bincount(inverse, weights=weights, minlength=len(values))
+
+
+def summarize_column(values, counts, percentiles=SUMMARY_PERCENTILES):
+    """
+    Summary statistics of one column from its count table.
+
+    Returns:
+        dict: The mean, standard deviation, minimum, maximum, and percentiles, keyed by statistic name.
+    """
+
+    shares = counts / counts.sum()
+    mean = shares @ values
+    quantiles = count_table_quantiles(values, counts, np.asarray(percentiles) / 100)[0]
+
+    return {
+        "mean": mean,
+        "std": np.sqrt(shares @ (values - mean) ** 2),
+        "min": values[counts > 0].min(),
+        **{f"p{percentile:g}": quantile for percentile, quantile in zip(percentiles, quantiles)},
+        "max": values[counts > 0].max(),
+    }
+
+
+def overboost_probabilities(weapon_parts_values, counts, max_overboost=MAX_SUMMARY_OVERBOOST):
+    """
+    Percent probability of reaching each overboost level from 0 to `max_overboost`, from the count table of
+    the `targeted_weapon_parts` column.
+
+    Returns:
+        numpy.ndarray: Percent probability of at least OB k, for k = 0, ..., max_overboost.
+    """
+
+    overboost_levels = np.arange(max_overboost + 1)
+    reached = weapon_parts_values[None, :] >= (overboost_levels[:, None] + 1) * WEAPON_PARTS_PER_OVERBOOST
+
+    return 100 * (reached @ counts) / counts.sum()
+
+
+def summarize_sim_results(sim_results, percentiles=SUMMARY_PERCENTILES, max_overboost=MAX_SUMMARY_OVERBOOST):
+    """
+    Summarize simulation results in one tidy table. Each column is reduced to its count table once, and every
+    statistic is computed from the count tables, so the table costs one sort per column however many
+    statistics it holds. Importance-sampled results are weighted by their `likelihood_ratio` column.
+
+    Args:
+        sim_results (pandas.DataFrame): The sim_results of a `GachaSim`.
+        percentiles (list): Percentiles to report for every column, between 0 and 100.
+        max_overboost (int): Highest overboost level to report the probability of reaching.
+
+    Returns:
+        pandas.DataFrame: One row per column and statistic, with columns 'column', 'statistic', and 'value'.
+            The 'overboost' column's 'P(OB >= k)' statistics are percentages.
+    """
+
+    weights = (
+        sim_results["likelihood_ratio"].to_numpy() if "likelihood_ratio" in sim_results.columns else None
+    )
+    columns = [column for column in sim_results.columns if column != "likelihood_ratio"]
+
+    rows = []
+    for column in columns:
+        values, counts = weighted_count_table(sim_results[column].to_numpy(), weights=weights)
+        rows.extend(
+            (column, statistic, value)
+            for statistic, value in summarize_column(values, counts, percentiles=percentiles).items()
+        )
+
+        if column == "targeted_weapon_parts":
+            # Overboost levels are a monotone function of weapon parts, so they share its count table
+            overboost_values, overboost_inverse = np.unique(parts_to_overboost(values), return_inverse=True)
+            overboost_counts = np.bincount(overboost_inverse, weights=counts, minlength=len(overboost_values))
+            rows.extend(
+                ("overboost", statistic, value)
+                for statistic, value in summarize_column(
+                    overboost_values, overboost_counts, percentiles=percentiles
+                ).items()
+            )
+            rows.extend(
+                ("overboost", f"P(OB >= {overboost})", probability)
+                for overboost, probability in enumerate(
+                    overboost_probabilities(values, counts, max_overboost=max_overboost)
+                )
+            )
+
+    return pd.DataFrame(rows, columns=["column", "statistic", "value"])
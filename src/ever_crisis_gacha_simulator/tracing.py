@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+from ever_crisis_gacha_simulator.classes.compiled_banner import (
+    OUTCOME_NAMES,
+    decode_rule_multiset_codes,
+)
+from ever_crisis_gacha_simulator.constants import *
+
+
+# One packed uint8 record per ten draw of a traced session. The card index and value are the stamp card
+# position after the ten draw's stamps; the rule columns count the ten draw's special draws, which take the
+# first draw slots in rule order; the draw columns hold each draw's index into OUTCOME_NAMES.
+TRACE_COLUMNS = (
+    ["stamp_value", "card_index", "card_value"]
+    + [rule + "s" for rule in STAMP_CARD_RULES]
+    + [f"draw_{slot + 1}_outcome" for slot in range(DRAWS_PER_TEN_DRAW)]
+)
+TRACE_RECORD_BYTES = len(TRACE_COLUMNS)
+
+
+def pack_trace_records(compiled_banner, stamp_values, total_stamps, rule_codes, outcomes):
+    """
+    Pack one ten draw of several sessions into trace records.
+
+    Args:
+        compiled_banner (CompiledBanner): The banner's stamp card tables.
+        stamp_values (numpy.ndarray): Stamps earned in the ten draw, per session.
+        total_stamps (numpy.ndarray): Total stamps earned after the ten draw, per session.
+        rule_codes (numpy.ndarray): `rule_multiset_codes()` of the rules the ten draw triggered.
+        outcomes (numpy.ndarray): Outcome index of each draw, of shape (sessions, 10).
+
+    Returns:
+        numpy.ndarray: Records of shape (sessions, TRACE_RECORD_BYTES), with dtype uint8.
+    """
+
+    # A session's absolute stamp position is its total stamps, and the EX card repeats after the last card
+    card_indices = np.minimum(total_stamps // MAX_STAMP_CARD_VALUE, compiled_banner.num_stamp_cards - 1)
+
+    return np.concatenate(
+        [
+            stamp_values[:, None],
+            card_indices[:, None],
+            (total_stamps % MAX_STAMP_CARD_VALUE)[:, None],
+            decode_rule_multiset_codes(rule_codes),
+            outcomes,
+        ],
+        axis=1,
+    ).astype(np.uint8)
+
+
+def append_trace_records(traces, compiled_banner, active, total_stamps, stamp_values, rule_codes, outcomes):
+    """
+    Append one ten draw of the `active` sessions to their traces, a list holding one list of records per session.
+    """
+
+    records = pack_trace_records(compiled_banner, stamp_values, total_stamps, rule_codes, outcomes)
+    for position, record in zip(active, records):
+        traces[position].append(record)
+
+
+def outcome_counts_to_outcomes(outcome_counts):
+    """
+    List the outcomes of ten draws whose outcome counts are known but whose draw order is not, in
+    OUTCOME_NAMES order.
+    """
+
+    draw_slots = np.arange(DRAWS_PER_TEN_DRAW)
+
+    return (draw_slots[None, :, None] >= np.cumsum(outcome_counts, axis=1)[:, None, :]).sum(axis=2)
+
+
+def select_trace_sessions(sim_results, num_traces=100, predicate=None, max_bytes=1_000_000, seed=None):
+    """
+    Choose the sessions to trace: a uniform random sample of the sessions (the sample a reservoir would hold at
+    the end of the run), or of the sessions matching `predicate`, limited to `num_traces` sessions and to
+    `max_bytes` of packed trace records. Each session's trace length is known from its crystals spent, so the
+    memory budget holds exactly.
+
+    Returns:
+        numpy.ndarray: Sorted session indices to trace.
+    """
+
+    if predicate is None:
+        candidates = np.arange(len(sim_results))
+    else:
+        candidates = np.flatnonzero(np.asarray(predicate(sim_results), dtype=bool))
+
+    candidates = np.random.default_rng(seed).permutation(candidates)[:num_traces]
+    trace_bytes = (
+        sim_results["num_crystals_spent"].to_numpy()[candidates] // TEN_DRAW_CRYSTAL_COST * TRACE_RECORD_BYTES
+    )
+
+    return np.sort(candidates[np.cumsum(trace_bytes) <= max_bytes])
+
+
+def trace_to_dataframe(trace):
+    """
+    Unpack a session's trace records into a readable pandas DataFrame, with one row per ten draw and outcome
+    names in the draw columns.
+    """
+
+    trace_df = pd.DataFrame(trace, columns=TRACE_COLUMNS).astype(np.int64)
+    for column in TRACE_COLUMNS[-DRAWS_PER_TEN_DRAW:]:
+        trace_df[column] = pd.Categorical.from_codes(trace_df[column], categories=OUTCOME_NAMES)
+
+    trace_df.index.name = "ten_draw"
+
+    return trace_df
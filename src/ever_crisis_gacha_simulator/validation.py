@@ -0,0 +1,448 @@
+import argparse
+import math
+import numpy as np
+import pandas as pd
+from time import perf_counter
+from ever_crisis_gacha_simulator.classes.compiled_banner import CompiledBanner
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.exact_solver import (
+    ExactPartsDistribution,
+    exact_parts_distributions,
+)
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+from ever_crisis_gacha_simulator.constants import *
+
+
+MAX_SERIES_TERMS = 100_000
+KOLMOGOROV_TERMS = 100
+
+# Bins of a chi-square test are merged until each one expects at least this many sessions
+MIN_EXPECTED_COUNT = 5
+
+# Per-test significance level. Each validation runs dozens of tests, so a strict level keeps false alarms rare,
+# while a real difference in an engine still gives p-values many orders of magnitude smaller.
+DEFAULT_ALPHA = 1e-4
+
+# Configurations every engine is validated on: both criteria the exact solver covers, a stamp criterion,
+# one and two featured weapons, and both target weapon types
+VALIDATION_CONFIGS = {
+    "aerith_21k_featured": {
+        "session_criterion": "crystals_spent",
+        "criterion_value": 21_000,
+        "target_weapon_type": "featured",
+        "banner_info": AERITH_LUCIA_EASTER_BANNER,
+    },
+    "zack_ob1_featured": {
+        "session_criterion": "overboost",
+        "criterion_value": 1,
+        "target_weapon_type": "featured",
+        "banner_info": ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        "starting_weapon_parts": 50,
+    },
+    "cloud_60_stamps_wishlisted": {
+        "session_criterion": "stamps_earned",
+        "criterion_value": 60,
+        "target_weapon_type": "wishlisted",
+        "banner_info": CLOUD_GLENN_LIMIT_BREAK_BANNER,
+    },
+}
+
+
+def regularized_upper_gamma(a, x):
+    """
+    Regularized upper incomplete gamma function Q(a, x), by its series below a + 1 and its continued fraction
+    (modified Lentz method) above.
+    """
+
+    if x <= 0:
+        return 1.0
+
+    log_prefactor = a * math.log(x) - x - math.lgamma(a)
+
+    if x < a + 1:
+        term = 1.0 / a
+        total = term
+        for n in range(1, MAX_SERIES_TERMS):
+            term *= x / (a + n)
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1.0 - total * math.exp(log_prefactor))
+
+    tiny = 1e-300
+    b = x + 1.0 - a
+    c = 1.0 / tiny
+    d = 1.0 / b
+    fraction = d
+    for n in range(1, MAX_SERIES_TERMS):
+        an = -n * (n - a)
+        b += 2.0
+        d = an * d + b
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = b + an / c
+        c = c if abs(c) > tiny else tiny
+        delta = d * c
+        fraction *= delta
+        if abs(delta - 1.0) < 1e-15:
+            break
+
+    return math.exp(log_prefactor) * fraction
+
+
+def chi_square_p_value(statistic, degrees_of_freedom):
+    """
+    Upper tail probability of the chi-square distribution.
+    """
+
+    if degrees_of_freedom <= 0:
+        return 1.0
+
+    return regularized_upper_gamma(degrees_of_freedom / 2, statistic / 2)
+
+
+def merge_sparse_bins(observed, expected, min_expected=MIN_EXPECTED_COUNT):
+    """
+    Merge adjacent bins (in value order) until every merged bin expects at least `min_expected` sessions.
+    `observed` and `expected` have one row per sample (or per observed and expected count) and one column per
+    bin.
+
+    Returns:
+        tuple: The merged observed and expected counts.
+    """
+
+    merged_observed, merged_expected = [], []
+    running_observed = np.zeros(observed.shape[0])
+    running_expected = np.zeros(expected.shape[0])
+
+    for column in range(observed.shape[1]):
+        running_observed += observed[:, column]
+        running_expected += expected[:, column]
+        if running_expected.min() >= min_expected:
+            merged_observed.append(running_observed)
+            merged_expected.append(running_expected)
+            running_observed = np.zeros(observed.shape[0])
+            running_expected = np.zeros(expected.shape[0])
+
+    # Leftover sparse tail bins join the last full bin
+    if merged_observed:
+        merged_observed[-1] = merged_observed[-1] + running_observed
+        merged_expected[-1] = merged_expected[-1] + running_expected
+    else:
+        merged_observed.append(running_observed)
+        merged_expected.append(running_expected)
+
+    return np.stack(merged_observed, axis=1), np.stack(merged_expected, axis=1)
+
+
+def chi_square_two_sample(first_values, second_values, min_expected=MIN_EXPECTED_COUNT):
+    """
+    Chi-square test that two samples of a discrete outcome come from the same distribution, on the
+    contingency table of their value counts (sparse values merged with their neighbors).
+
+    Returns:
+        dict: The chi-square `statistic`, its `degrees_of_freedom`, and the `p_value`.
+    """
+
+    values, inverse = np.unique(np.concatenate([first_values, second_values]), return_inverse=True)
+    observed = np.stack(
+        [
+            np.bincount(inverse[: len(first_values)], minlength=len(values)),
+            np.bincount(inverse[len(first_values):], minlength=len(values)),
+        ]
+    ).astype(float)
+
+    # Expected counts if both samples shared the pooled distribution
+    sample_shares = observed.sum(axis=1, keepdims=True) / observed.sum()
+    expected = sample_shares * observed.sum(axis=0, keepdims=True)
+    observed, expected = merge_sparse_bins(observed, expected, min_expected=min_expected)
+
+    statistic = float(((observed - expected) ** 2 / expected).sum())
+    degrees_of_freedom = observed.shape[1] - 1
+
+    return {
+        "statistic": statistic,
+        "degrees_of_freedom": degrees_of_freedom,
+        "p_value": chi_square_p_value(statistic, degrees_of_freedom),
+    }
+
+
+def chi_square_goodness_of_fit(values, support, probabilities, min_expected=MIN_EXPECTED_COUNT):
+    """
+    Chi-square test that a sample of a discrete outcome follows an exact distribution over `support`
+    (sorted). Values outside the support fall into the nearest support bin.
+
+    Returns:
+        dict: The chi-square `statistic`, its `degrees_of_freedom`, and the `p_value`.
+    """
+
+    bins = np.clip(np.searchsorted(support, values), 0, len(support) - 1)
+    observed = np.bincount(bins, minlength=len(support))[None, :].astype(float)
+    expected = (len(values) * np.asarray(probabilities))[None, :]
+    observed, expected = merge_sparse_bins(observed, expected, min_expected=min_expected)
+
+    statistic = float(((observed - expected) ** 2 / expected).sum())
+    degrees_of_freedom = observed.shape[1] - 1
+
+    return {
+        "statistic": statistic,
+        "degrees_of_freedom": degrees_of_freedom,
+        "p_value": chi_square_p_value(statistic, degrees_of_freedom),
+    }
+
+
+def kolmogorov_smirnov_two_sample(first_values, second_values):
+    """
+    Two-sample Kolmogorov-Smirnov test with the asymptotic Kolmogorov distribution. On discrete outcomes the
+    test is conservative: ties make it reject less often than its level, never more.
+
+    Returns:
+        dict: The KS `statistic` (largest gap between the two empirical CDFs) and the `p_value`.
+    """
+
+    first_values = np.sort(first_values)
+    second_values = np.sort(second_values)
+    values = np.union1d(first_values, second_values)
+
+    first_cdf = np.searchsorted(first_values, values, side="right") / len(first_values)
+    second_cdf = np.searchsorted(second_values, values, side="right") / len(second_values)
+    statistic = float(np.abs(first_cdf - second_cdf).max())
+
+    effective_size = math.sqrt(
+        len(first_values) * len(second_values) / (len(first_values) + len(second_values))
+    )
+    scaled = (effective_size + 0.12 + 0.11 / effective_size) * statistic
+    if scaled < 1e-3:
+        return {"statistic": statistic, "p_value": 1.0}
+
+    p_value = 2 * sum(
+        (-1) ** (k - 1) * math.exp(-2 * k**2 * scaled**2) for k in range(1, KOLMOGOROV_TERMS)
+    )
+
+    return {"statistic": statistic, "p_value": min(max(p_value, 0.0), 1.0)}
+
+
+def exact_distribution(metadata):
+    """
+    The exact distribution of the outcome a configuration's sessions stop on, where the exact solver
+    covers it: weapon parts for 'crystals_spent' sessions, and crystals spent for 'overboost' sessions.
+
+    Returns:
+        tuple: The column, its support and its probabilities, or None for other criteria.
+    """
+
+    compiled_banner = CompiledBanner(
+        banner_info=metadata["banner_info"],
+        target_weapon_type=metadata["target_weapon_type"],
+    )
+
+    if metadata["session_criterion"] == "crystals_spent":
+        num_ten_draws = metadata["criterion_value"] // TEN_DRAW_CRYSTAL_COST
+        # The top bin holds every session with at least this many weapon parts; two targeted 5* weapons per
+        # ten draw is far beyond what any session reaches
+        max_weapon_parts = (
+            metadata["starting_weapon_parts"] + 2 * num_ten_draws * WEAPON_PARTS_PER_OVERBOOST
+        )
+        probabilities = exact_parts_distributions(
+            compiled_banner,
+            num_ten_draws,
+            max_weapon_parts,
+            starting_weapon_parts=metadata["starting_weapon_parts"],
+        )[-1]
+        return "targeted_weapon_parts", np.arange(max_weapon_parts + 1), probabilities
+
+    if metadata["session_criterion"] == "overboost":
+        solver = ExactPartsDistribution(
+            compiled_banner,
+            (metadata["criterion_value"] + 1) * WEAPON_PARTS_PER_OVERBOOST,
+            starting_weapon_parts=metadata["starting_weapon_parts"],
+        )
+        goal_probabilities = [solver.goal_probability()]
+        while goal_probabilities[-1] < 1 - 1e-9:
+            solver.step()
+            goal_probabilities.append(solver.goal_probability())
+
+        probabilities = np.diff(goal_probabilities, prepend=0.0)
+        return (
+            "num_crystals_spent",
+            np.arange(len(probabilities)) * TEN_DRAW_CRYSTAL_COST,
+            probabilities / probabilities.sum(),
+        )
+
+    return None
+
+
+def run_engine(config, engine, num_simulations, seed_value, n_jobs=1):
+    """
+    Run one configuration on one engine.
+
+    Returns:
+        tuple: The `GachaSim` with results, and the run time in seconds.
+    """
+
+    gacha_sim = GachaSim(**config, seed_value=seed_value, num_simulations=num_simulations)
+    start_time = perf_counter()
+    gacha_sim.run_sims(n_jobs=n_jobs, engine=engine, progress=False)
+
+    return gacha_sim, perf_counter() - start_time
+
+
+def compare_distributions(reference_results, candidate_results, alpha=DEFAULT_ALPHA):
+    """
+    Compare every outcome column of two runs with chi-square and KS tests.
+
+    Returns:
+        pandas.DataFrame: One row per column and test, with the test `statistic`, `p_value`, and whether the
+            test `passed` at level `alpha`.
+    """
+
+    rows = []
+    for column in reference_results.columns:
+        reference_values = reference_results[column].to_numpy()
+        candidate_values = candidate_results[column].to_numpy()
+
+        chi_square = chi_square_two_sample(reference_values, candidate_values)
+        kolmogorov_smirnov = kolmogorov_smirnov_two_sample(reference_values, candidate_values)
+        rows.append((column, "chi_square", chi_square["statistic"], chi_square["p_value"]))
+        rows.append((column, "ks", kolmogorov_smirnov["statistic"], kolmogorov_smirnov["p_value"]))
+
+    comparison = pd.DataFrame(rows, columns=["column", "test", "statistic", "p_value"])
+    comparison["passed"] = comparison["p_value"] >= alpha
+
+    return comparison
+
+
+def validate_engine(
+    engine,
+    configs=None,
+    num_simulations=2_000,
+    reference_num_simulations=None,
+    seed_value=743,
+    reference_engine="reference",
+    alpha=DEFAULT_ALPHA,
+    n_jobs=1,
+):
+    """
+    Validate an engine against the reference `CrystalPullSession` path: run both on the same configurations,
+    compare every outcome column's distribution (chi-square and KS), compare both runs with the exact solver
+    where it covers the configuration, and time both engines.
+
+    Args:
+        engine (str): The engine to validate, one of 'numpy', 'jit', or 'multinomial'.
+        configs (dict): Configuration names mapped to `GachaSim` arguments. Default value of None
+            (`VALIDATION_CONFIGS`).
+        num_simulations (int): Sessions per configuration for the engine. Default value of 2,000.
+        reference_num_simulations (int): Sessions per configuration for the reference engine, which is much
+            slower. Default value of None (`num_simulations`).
+        seed_value (int): Seed value for both engines (their random streams differ regardless). Default value
+            of 743.
+        reference_engine (str): Engine to validate against. Default value of 'reference'.
+        alpha (float): Significance level of each test. Default value of 1e-4.
+        n_jobs (int): Number of CPU cores to utilize for simulations. Default value of 1.
+
+    Returns:
+        dict: `tests`, a pandas.DataFrame with one row per configuration, engine, column and test (including
+            'exact' goodness-of-fit tests of each engine), and `timings`, a pandas.DataFrame with the seconds
+            and sessions per second of each engine on each configuration.
+    """
+
+    configs = VALIDATION_CONFIGS if configs is None else configs
+    reference_num_simulations = reference_num_simulations or num_simulations
+
+    tests = []
+    timings = []
+    for name, config in configs.items():
+        reference_sim, reference_seconds = run_engine(
+            config, reference_engine, reference_num_simulations, seed_value, n_jobs=n_jobs
+        )
+        candidate_sim, candidate_seconds = run_engine(
+            config, engine, num_simulations, seed_value, n_jobs=n_jobs
+        )
+
+        comparison = compare_distributions(
+            reference_sim.sim_results, candidate_sim.sim_results, alpha=alpha
+        )
+        comparison.insert(0, "engine", f"{engine} vs {reference_engine}")
+        comparison.insert(0, "config", name)
+        tests.append(comparison)
+
+        exact = exact_distribution(reference_sim.metadata)
+        if exact is not None:
+            column, support, probabilities = exact
+            for engine_name, gacha_sim in [(reference_engine, reference_sim), (engine, candidate_sim)]:
+                goodness_of_fit = chi_square_goodness_of_fit(
+                    gacha_sim.sim_results[column].to_numpy(), support, probabilities
+                )
+                tests.append(
+                    pd.DataFrame(
+                        [
+                            {
+                                "config": name,
+                                "engine": engine_name,
+                                "column": column,
+                                "test": "exact",
+                                "statistic": goodness_of_fit["statistic"],
+                                "p_value": goodness_of_fit["p_value"],
+                                "passed": goodness_of_fit["p_value"] >= alpha,
+                            }
+                        ]
+                    )
+                )
+
+        for engine_name, sessions, seconds in [
+            (reference_engine, reference_num_simulations, reference_seconds),
+            (engine, num_simulations, candidate_seconds),
+        ]:
+            timings.append(
+                {
+                    "config": name,
+                    "engine": engine_name,
+                    "num_simulations": sessions,
+                    "seconds": seconds,
+                    "sessions_per_second": sessions / seconds,
+                }
+            )
+
+    return {
+        "tests": pd.concat(tests, ignore_index=True),
+        "timings": pd.DataFrame(timings),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Validate a session engine against the reference engine at full size."
+    )
+    parser.add_argument("engine", choices=["numpy", "jit", "multinomial"])
+    parser.add_argument("--num-simulations", type=int, default=200_000)
+    parser.add_argument("--reference-num-simulations", type=int, default=20_000)
+    parser.add_argument("--seed-value", type=int, default=743)
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+
+    arguments = parser.parse_args(argv)
+
+    validation = validate_engine(
+        arguments.engine,
+        num_simulations=arguments.num_simulations,
+        reference_num_simulations=arguments.reference_num_simulations,
+        seed_value=arguments.seed_value,
+        alpha=arguments.alpha,
+        n_jobs=arguments.n_jobs,
+    )
+
+    with pd.option_context("display.width", 200, "display.max_rows", None):
+        print(validation["tests"].to_string(index=False))
+        print()
+        print(validation["timings"].to_string(index=False))
+
+    failed = validation["tests"][~validation["tests"]["passed"]]
+    if not failed.empty:
+        print(f"\n{len(failed)} of {len(validation['tests'])} tests failed.")
+        return 1
+
+    print(f"\nAll {len(validation['tests'])} tests passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+import copy
+import numpy as np
+import pytest
+from ever_crisis_gacha_simulator.atlas import (
+    atlas_answer,
+    atlas_probability,
+    build_atlas,
+    load_atlas,
+)
+from ever_crisis_gacha_simulator.classes.compiled_banner import CompiledBanner
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.exact_solver import exact_minimum_budget
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+BANNER_NAME = ZACK_SEPHIROTH_LIMIT_BREAK_BANNER["metadata"]["name"]
+
+
+@pytest.fixture(scope="module")
+def small_atlas_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("atlas") / "atlas.npz"
+    build_atlas(
+        path=path,
+        banners=[ZACK_SEPHIROTH_LIMIT_BREAK_BANNER],
+        target_weapon_types=["wishlisted"],
+        max_overboost=2,
+        max_crystals=60_000,
+    )
+    return path
+
+
+def test_atlas_matches_the_exact_solver(small_atlas_path):
+    """
+    The first budget whose atlas probability crosses a target should be the exact solver's minimum budget.
+    """
+
+    minimum_budget = exact_minimum_budget(
+        CompiledBanner(ZACK_SEPHIROTH_LIMIT_BREAK_BANNER, "wishlisted"), 1, 0.3
+    )
+
+    assert atlas_probability(
+        BANNER_NAME, "wishlisted", 1, minimum_budget["crystals"], path=small_atlas_path
+    ) == pytest.approx(minimum_budget["probability"])
+    assert atlas_probability(
+        BANNER_NAME, "wishlisted", 1, minimum_budget["crystals"] - 3_000, path=small_atlas_path
+    ) < 0.3
+
+
+def test_atlas_probabilities_are_monotone(small_atlas_path):
+    probabilities = load_atlas(small_atlas_path)["probabilities"][0, 0]
+
+    assert probabilities.shape == (21, 3)
+    assert (np.diff(probabilities, axis=0) >= 0).all()
+    assert (np.diff(probabilities, axis=1) <= 0).all()
+    assert (probabilities[0] == 0).all()
+
+
+@pytest.mark.parametrize(
+    "banner_name, target_weapon_type, overboost, crystals",
+    [
+        ("Not a banner", "wishlisted", 1, 30_000),
+        (BANNER_NAME, "featured", 1, 30_000),
+        (BANNER_NAME, "wishlisted", 3, 30_000),
+        (BANNER_NAME, "wishlisted", 1, 63_000),
+    ],
+)
+def test_atlas_does_not_cover(small_atlas_path, banner_name, target_weapon_type, overboost, crystals):
+    assert atlas_probability(banner_name, target_weapon_type, overboost, crystals, path=small_atlas_path) is None
+
+
+def test_missing_atlas(tmp_path):
+    assert load_atlas(tmp_path / "missing.npz") is None
+    assert atlas_probability(BANNER_NAME, "wishlisted", 1, 30_000, path=tmp_path / "missing.npz") is None
+
+
+def test_atlas_is_loaded_once(small_atlas_path):
+    assert load_atlas(small_atlas_path) is load_atlas(small_atlas_path)
+
+
+def generate_gacha_sim(**kwargs):
+    config = {
+        "session_criterion": "crystals_spent",
+        "criterion_value": 45_000,
+        "target_weapon_type": "wishlisted",
+        "banner_info": ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        "seed_value": 743,
+        "num_simulations": 20_000,
+    }
+    return GachaSim(**{**config, **kwargs})
+
+
+@pytest.mark.parametrize(
+    "config, value",
+    [({}, 0), ({}, 1), ({"session_criterion": "overboost", "criterion_value": 0}, 30_000)],
+)
+def test_shipped_atlas_agrees_with_simulation(config, value):
+    """
+    The shipped atlas should answer without simulating, and agree with a live simulation.
+    """
+
+    gacha_sim = generate_gacha_sim(**config)
+    atlas_percent = gacha_sim.success_probability(value)
+    assert gacha_sim.sim_results is None
+
+    simulated_percent = gacha_sim.success_probability(value, use_atlas=False, n_jobs=1, progress=False)
+    assert 1 < atlas_percent < 99
+    assert abs(atlas_percent - simulated_percent) < 1.5
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {"starting_weapon_parts": 100},
+        {"max_crystals_spent": 30_000},
+        {"banner_info": copy.deepcopy(ZACK_SEPHIROTH_LIMIT_BREAK_BANNER)},
+    ],
+)
+def test_uncovered_configurations_fall_back_to_simulation(config):
+    if "banner_info" in config:
+        config["banner_info"]["metadata"]["non_featured_five_star_percent_rate"] = 0.5
+
+    gacha_sim = generate_gacha_sim(num_simulations=1_000, **config)
+
+    assert atlas_answer(gacha_sim.metadata, 1) is None
+    gacha_sim.success_probability(1, n_jobs=1, progress=False)
+    assert len(gacha_sim.sim_results) == 1_000
+
+
+def test_success_probability_rejects_stamps_earned():
+    with pytest.raises(ValueError):
+        generate_gacha_sim(session_criterion="stamps_earned", criterion_value=12).success_probability(1)
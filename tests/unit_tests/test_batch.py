@@ -0,0 +1,95 @@
+import pandas as pd
+import pytest
+from ever_crisis_gacha_simulator.batch import run_many
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+CONFIGS = {
+    "crystals": {
+        "session_criterion": "crystals_spent",
+        "criterion_value": 15_000,
+        "target_weapon_type": "featured",
+        "banner_info": ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        "seed_value": 743,
+        "num_simulations": 12_000,
+    },
+    "wishlisted_overboost": {
+        "session_criterion": "overboost",
+        "criterion_value": 1,
+        "target_weapon_type": "wishlisted",
+        "banner_info": ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        "seed_value": 744,
+        "num_simulations": 3_000,
+    },
+    "stamps": {
+        "session_criterion": "stamps_earned",
+        "criterion_value": 12,
+        "target_weapon_type": "featured",
+        "banner_info": CLOUD_GLENN_LIMIT_BREAK_BANNER,
+        "seed_value": 745,
+        "num_simulations": 1_000,
+    },
+}
+
+
+@pytest.mark.parametrize("engine, sampling", [("numpy", "plain"), ("multinomial", "plain"), ("numpy", "sobol")])
+def test_run_many_matches_individual_runs(engine, sampling):
+    """
+    Every configuration of a batch should get exactly the sessions of its own run.
+    """
+
+    gacha_sims = dict(run_many(CONFIGS, n_jobs=1, engine=engine, sampling=sampling, progress=False))
+
+    assert set(gacha_sims) == set(CONFIGS)
+    for name, config in CONFIGS.items():
+        individual = GachaSim(**config)
+        individual.run_sims(n_jobs=1, engine=engine, sampling=sampling, progress=False)
+
+        pd.testing.assert_frame_equal(gacha_sims[name].sim_results, individual.sim_results)
+        assert gacha_sims[name].session_stream == individual.session_stream
+        assert (gacha_sims[name].sampling_report is None) == (sampling == "plain")
+
+
+def test_run_many_schedules_expensive_configs_first():
+    """
+    With one serial worker, the most expensive chunks run first, so the wishlisted overboost configuration
+    finishes first, and run times count from the start of the batch.
+    """
+
+    finished = list(run_many(CONFIGS, executor="serial", progress=False))
+
+    assert finished[0][0] == "wishlisted_overboost"
+    assert sorted(name for name, _ in finished) == sorted(CONFIGS)
+    run_seconds = [gacha_sim.run_seconds for _, gacha_sim in finished]
+    assert run_seconds == sorted(run_seconds)
+
+
+def test_run_many_streams_results():
+    """
+    The first configuration should be available before the others are simulated.
+    """
+
+    events = []
+    batch = run_many(CONFIGS, executor="serial", progress=[lambda event: events.append(event)])
+
+    name, gacha_sim = next(batch)
+    assert name == "wishlisted_overboost"
+    assert len(gacha_sim.sim_results) == 3_000
+    assert events[-1].sessions_completed < events[-1].total_sessions == 16_000
+
+    assert len(list(batch)) == 2
+    assert events[-1].finished
+
+
+def test_run_many_empty_config():
+    gacha_sims = dict(
+        run_many({"empty": {**CONFIGS["crystals"], "num_simulations": 0}}, n_jobs=1, progress=False)
+    )
+
+    assert gacha_sims["empty"].sim_results.empty
+
+
+def test_run_many_rejects_the_reference_engine():
+    with pytest.raises(ValueError):
+        list(run_many(CONFIGS, engine="reference"))
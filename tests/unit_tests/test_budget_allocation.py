@@ -0,0 +1,95 @@
+import itertools
+import numpy as np
+import pytest
+from ever_crisis_gacha_simulator.budget_allocation import (
+    evaluate_allocation,
+    generate_goal_curve,
+    optimize_budget_allocation,
+    optimize_ten_draw_allocation,
+    simulated_goal_curve,
+)
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+@pytest.fixture()
+def test_goal_curves():
+    """
+    Goal curves of three banners with different goals, re-used across tests.
+    """
+
+    return [
+        generate_goal_curve(ZACK_SEPHIROTH_LIMIT_BREAK_BANNER, 1, 12),
+        generate_goal_curve(CLOUD_GLENN_LIMIT_BREAK_BANNER, 3, 12),
+        generate_goal_curve(AERITH_LUCIA_EASTER_BANNER, 0, 12, starting_weapon_parts=100),
+    ]
+
+
+@pytest.mark.parametrize("objective", ["expected_utility", "all_goals"])
+def test_optimizer_matches_brute_force(test_goal_curves, objective):
+    """
+    The dynamic program should find an allocation as good as the best of every possible allocation.
+    """
+
+    weights = [1.0, 3.0, 0.5]
+    key = "expected_utility" if objective == "expected_utility" else "probability_all_goals"
+
+    allocation = optimize_ten_draw_allocation(test_goal_curves, 12, weights=weights, objective=objective)
+    best_value = max(
+        evaluate_allocation(test_goal_curves, ten_draws, weights=weights)[key]
+        for ten_draws in itertools.product(range(13), repeat=3)
+        if sum(ten_draws) <= 12
+    )
+
+    assert allocation.sum() <= 12
+    assert evaluate_allocation(test_goal_curves, allocation, weights=weights)[key] == pytest.approx(best_value)
+
+
+def test_goal_curves_are_monotone(test_goal_curves):
+    for goal_curve in test_goal_curves:
+        assert goal_curve[0] == 0
+        assert (np.diff(goal_curve) >= -1e-12).all()
+
+
+def test_simulated_goal_curve_matches_exact_curve():
+    gacha_sim = GachaSim(
+        session_criterion="overboost",
+        criterion_value=1,
+        target_weapon_type="featured",
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        seed_value=743,
+        num_simulations=20_000,
+    )
+    gacha_sim.run_sims(n_jobs=1, engine="multinomial", progress=False)
+
+    simulated_curve = simulated_goal_curve(gacha_sim.sim_results["num_crystals_spent"], 12)
+    exact_curve = generate_goal_curve(ZACK_SEPHIROTH_LIMIT_BREAK_BANNER, 1, 12)
+
+    np.testing.assert_allclose(simulated_curve, exact_curve, atol=0.015)
+
+
+def test_simulated_goal_curve_excludes_censored_sessions():
+    num_crystals_spent = np.array([3_000, 6_000, 9_000, 9_000])
+    censored = np.array([False, False, False, True])
+
+    np.testing.assert_allclose(
+        simulated_goal_curve(num_crystals_spent, 4, censored=censored), [0, 0.25, 0.5, 0.75, 0.75]
+    )
+
+
+def test_optimize_budget_allocation():
+    goals = [
+        {"banner_info": ZACK_SEPHIROTH_LIMIT_BREAK_BANNER, "overboost_target": 1},
+        {"banner_info": CLOUD_GLENN_LIMIT_BREAK_BANNER, "overboost_target": 1, "weight": 2},
+    ]
+
+    result = optimize_budget_allocation(goals, 50_000)
+
+    assert result["crystals"].sum() <= 48_000
+    assert (result["crystals"] % 3_000 == 0).all()
+    assert 0 < result["probability_all_goals"] <= min(result["goal_probabilities"])
+
+
+def test_optimizer_rejects_unknown_objective(test_goal_curves):
+    with pytest.raises(ValueError):
+        optimize_ten_draw_allocation(test_goal_curves, 12, objective="median")
@@ -0,0 +1,59 @@
+import pytest
+from ever_crisis_gacha_simulator.classes import gacha_sim as gacha_sim_module
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.checkpointing import block_path
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+def make_gacha_sim(seed_value=743, criterion_value=15_000):
+    return GachaSim(
+        session_criterion="crystals_spent",
+        criterion_value=criterion_value,
+        target_weapon_type="featured",
+        banner_info=AERITH_LUCIA_EASTER_BANNER,
+        seed_value=seed_value,
+        num_simulations=25_000,
+    )
+
+
+@pytest.mark.parametrize("seed_value", [743, None])
+def test_resumed_run_matches_uninterrupted_run(tmp_path, monkeypatch, seed_value):
+    """
+    Resuming after losing some blocks should only simulate the missing ones, and give the same results.
+    """
+
+    uninterrupted = make_gacha_sim(seed_value=seed_value)
+    uninterrupted.run_sims(n_jobs=1, engine="numpy", checkpoint_dir=tmp_path)
+
+    # Simulate an interruption that lost the last two blocks
+    block_path(tmp_path, 10_000, 20_000).unlink()
+    block_path(tmp_path, 20_000, 25_000).unlink()
+
+    simulated_blocks = []
+    simulate_checkpointed_sessions = gacha_sim_module.simulate_checkpointed_sessions
+
+    def counting_simulate(**kwargs):
+        simulated_blocks.append((kwargs["session_start"], kwargs["session_stop"]))
+        return simulate_checkpointed_sessions(**kwargs)
+
+    monkeypatch.setattr(gacha_sim_module, "simulate_checkpointed_sessions", counting_simulate)
+
+    resumed = make_gacha_sim(seed_value=seed_value)
+    resumed.run_sims(n_jobs=1, engine="numpy", checkpoint_dir=tmp_path, resume=True)
+
+    assert simulated_blocks == [(10_000, 20_000), (20_000, 25_000)]
+    assert resumed.sim_results.equals(uninterrupted.sim_results)
+
+
+def test_resume_rejects_a_different_configuration(tmp_path):
+    make_gacha_sim().run_sims(n_jobs=1, engine="numpy", checkpoint_dir=tmp_path)
+
+    with pytest.raises(ValueError):
+        make_gacha_sim(criterion_value=30_000).run_sims(
+            n_jobs=1, engine="numpy", checkpoint_dir=tmp_path, resume=True
+        )
+
+
+def test_checkpointing_requires_a_compiled_engine(tmp_path):
+    with pytest.raises(ValueError):
+        make_gacha_sim().run_sims(n_jobs=1, engine="reference", checkpoint_dir=tmp_path)
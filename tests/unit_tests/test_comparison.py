@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from ever_crisis_gacha_simulator.comparison import (
+    compare,
+    paired_differences,
+    run_paired_sims,
+)
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+BASE_CONFIG = {
+    "session_criterion": "crystals_spent",
+    "criterion_value": 30_000,
+    "target_weapon_type": "featured",
+    "banner_info": ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+}
+
+
+@pytest.mark.parametrize("engine", ["numpy", "multinomial"])
+def test_scenarios_share_random_streams(engine):
+    """
+    Scenarios with the same rates should get identical sessions, even without a seed value.
+    """
+
+    gacha_sims = run_paired_sims(
+        {
+            "zack": BASE_CONFIG,
+            "cloud": {**BASE_CONFIG, "banner_info": CLOUD_GLENN_LIMIT_BREAK_BANNER},
+        },
+        num_simulations=2_000,
+        n_jobs=1,
+        engine=engine,
+        progress=False,
+    )
+
+    assert gacha_sims["zack"].sim_results.equals(gacha_sims["cloud"].sim_results)
+
+
+def test_compare_reports_paired_differences():
+    """
+    Extra starting weapon parts should show up as a significant difference, with a much smaller variance than
+    comparing independent runs.
+    """
+
+    differences = compare(
+        {"baseline": BASE_CONFIG, "extra_parts": {**BASE_CONFIG, "starting_weapon_parts": 100}},
+        probabilities=[("targeted_weapon_parts", 600)],
+        percentiles=[("targeted_weapon_parts", 50)],
+        num_simulations=5_000,
+        seed_value=743,
+        n_jobs=1,
+        progress=False,
+    )
+
+    probability_row, percentile_row = differences.to_dict("records")
+    assert 0 < probability_row["low"] <= probability_row["difference"] <= probability_row["high"]
+    assert probability_row["variance_reduction"] > 5
+    assert percentile_row["difference"] == percentile_row["low"] == percentile_row["high"] == 100
+    assert np.isnan(percentile_row["variance_reduction"])
+
+
+def test_paired_differences_require_equal_sizes():
+    gacha_sims = run_paired_sims(
+        {"first": BASE_CONFIG, "second": BASE_CONFIG},
+        num_simulations=1_000,
+        seed_value=743,
+        n_jobs=1,
+        progress=False,
+    )
+    gacha_sims["second"].sim_results = gacha_sims["second"].sim_results.iloc[:500]
+
+    with pytest.raises(ValueError):
+        paired_differences(gacha_sims, probabilities=[("targeted_weapon_parts", 400)])
+
+
+def test_run_paired_sims_rejects_reference_engine():
+    with pytest.raises(ValueError):
+        run_paired_sims({"first": BASE_CONFIG, "second": BASE_CONFIG}, engine="reference")
@@ -0,0 +1,193 @@
+import numpy as np
+import pytest
+from decimal import getcontext
+from ever_crisis_gacha_simulator.classes.compiled_banner import (
+    CompiledBanner,
+    OUTCOME_NAMES,
+)
+from ever_crisis_gacha_simulator.classes.crystal_pull_session import CrystalPullSession
+from ever_crisis_gacha_simulator.classes.ten_draw import TenDraw
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+from ever_crisis_gacha_simulator.constants import *
+
+
+getcontext().prec = 16  # Set Decimal to continue to a max of 16 decimal places
+
+
+@pytest.fixture()
+def test_compiled_banner():
+    """
+    A `CompiledBanner` object to re-use across tests for the CompiledBanner class.
+    """
+
+    return CompiledBanner(
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        target_weapon_type="featured",
+    )
+
+
+@pytest.mark.parametrize(
+    "banner_info", [ZACK_FF9_CROSSOVER_BANNER, ZACK_SEPHIROTH_LIMIT_BREAK_BANNER]
+)
+@pytest.mark.parametrize("target_weapon_type", ["featured", "wishlisted"])
+def test_standard_probabilities_match_determine_pull_result(
+    banner_info, target_weapon_type
+):
+    """
+    The share of an evenly spaced grid of floats that `determine_pull_result()` maps to each outcome should
+    match the compiled standard draw probabilities.
+    """
+
+    compiled_banner = CompiledBanner(banner_info, target_weapon_type)
+
+    ten_draw = TenDraw(
+        rules_for_next_ten_draw=[],
+        target_weapon_rates_dict=compiled_banner.target_weapon_rates_dict,
+        target_weapon_type=target_weapon_type,
+        num_featured_weapons=compiled_banner.num_featured_weapons,
+    )
+
+    grid_size = 20_000
+    pull_results = [
+        ten_draw.determine_pull_result((index + 0.5) / grid_size)
+        for index in range(grid_size)
+    ]
+    grid_shares = np.array(
+        [pull_results.count(outcome) / grid_size for outcome in OUTCOME_NAMES]
+    )
+
+    assert np.allclose(
+        grid_shares, compiled_banner.standard_probabilities, atol=1 / grid_size
+    )
+
+
+def test_rule_probabilities_cover_acceptable_outputs(test_compiled_banner):
+    """
+    Each rule may only put probability on the outcomes that `draws_for_special_rules()` can produce for it.
+    """
+
+    acceptable_outputs_dict = {
+        "guaranteed_featured_five_star_draw": ["targeted_five_star"],
+        "guaranteed_five_star_draw": [
+            "targeted_five_star",
+            "nontargeted_featured_five_star",
+            "nontargeted_five_star",
+        ],
+        "guaranteed_four_star_draw": [
+            "targeted_five_star",
+            "nontargeted_featured_five_star",
+            "nontargeted_five_star",
+            "targeted_four_star",
+            "nontargeted_featured_four_star",
+            "nontargeted_four_star",
+        ],
+        "guaranteed_not_desired_five_star_draw": [
+            "nontargeted_featured_five_star",
+            "nontargeted_five_star",
+        ],
+        "guaranteed_featured_four_star_draw": ["targeted_four_star"],
+        "choose_one_five_star_draw": ["targeted_five_star"],
+    }
+
+    for rule, probabilities in zip(
+        STAMP_CARD_RULES, test_compiled_banner.rule_probabilities
+    ):
+        assert probabilities.sum() == pytest.approx(1)
+        for outcome, probability in zip(OUTCOME_NAMES, probabilities):
+            if outcome not in acceptable_outputs_dict[rule]:
+                assert probability == 0
+
+
+def test_stamp_value_lookup(test_compiled_banner):
+    """
+    Every possible stamp roll should give the same stamp value as `determine_stamp_value_for_ten_draw()`.
+    """
+
+    crystal_pull_session = CrystalPullSession(
+        session_criterion="crystals_spent",
+        criterion_value=90_000,
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        target_weapon_type="featured",
+    )
+
+    expected = [
+        crystal_pull_session.determine_stamp_value_for_ten_draw(predetermined_int=roll)
+        for roll in range(1, STAMP_ROLL_MAX + 1)
+    ]
+
+    assert test_compiled_banner.stamp_value_lookup.tolist() == expected
+
+
+def test_stamp_transition(test_compiled_banner):
+    """
+    Stamp card transitions should inject the same rules as `pre_draw_stamp_card_operations()`.
+    """
+
+    input_ten_draw_stamp_values = [1, 5, 3, 6, 4, 2, 12, 1, 1, 1, 12]
+    expected_rules_for_draw = [
+        [],
+        ["guaranteed_featured_five_star_draw"],
+        [],
+        [],
+        ["guaranteed_featured_five_star_draw", "guaranteed_five_star_draw"],
+        ["guaranteed_featured_five_star_draw"],
+        ["guaranteed_featured_five_star_draw"],
+        [],
+        [],
+        ["guaranteed_featured_five_star_draw"],
+        ["guaranteed_four_star_draw", "guaranteed_five_star_draw"],
+    ]
+
+    card_index = np.array([0])
+    card_value = np.array([0])
+
+    for stamp_value, expected_rules in zip(
+        input_ten_draw_stamp_values, expected_rules_for_draw
+    ):
+        rule_counts, card_index, card_value = test_compiled_banner.stamp_transition(
+            card_index, card_value, np.array([stamp_value])
+        )
+
+        assert rule_counts[0].tolist() == [
+            expected_rules.count(rule) for rule in STAMP_CARD_RULES
+        ]
+
+
+@pytest.mark.parametrize(
+    "rule_counts",
+    [(0, 0, 0, 0, 0, 0), (1, 0, 0, 0, 0, 0), (0, 1, 1, 0, 0, 0), (0, 0, 0, 1, 0, 0), (0, 0, 0, 0, 1, 1)],
+)
+def test_ten_draw_distribution(test_compiled_banner, rule_counts):
+    """
+    The joint outcome count distribution of a ten draw should sum to 1, always hold ten pull results and
+    have the mean counts of its individual draws.
+    """
+
+    outcome_counts, probabilities = test_compiled_banner.ten_draw_distribution(
+        rule_counts
+    )
+
+    expected_means = (
+        np.array(rule_counts) @ test_compiled_banner.rule_probabilities
+        + (DRAWS_PER_TEN_DRAW - sum(rule_counts))
+        * test_compiled_banner.standard_probabilities
+    )
+
+    assert probabilities.sum() == pytest.approx(1)
+    assert (outcome_counts.sum(axis=1) == DRAWS_PER_TEN_DRAW).all()
+    assert np.allclose(probabilities @ outcome_counts, expected_means)
+
+
+def test_ten_draw_tables_cover_reachable_rule_multisets(test_compiled_banner):
+    """
+    Every rule combination a stamp transition can produce should have a cached ten draw distribution.
+    """
+
+    ten_draw_tables = test_compiled_banner.generate_ten_draw_tables()
+    rule_multisets = test_compiled_banner.reachable_rule_multisets()
+
+    assert (0,) * len(STAMP_CARD_RULES) in rule_multisets
+    assert len(ten_draw_tables["multiset_codes"]) == len(rule_multisets)
+    assert (np.diff(ten_draw_tables["multiset_codes"]) > 0).all()
+    assert ten_draw_tables["offset_cdfs"][-1] == len(rule_multisets)
+    assert (np.diff(ten_draw_tables["offset_cdfs"]) >= 0).all()
@@ -0,0 +1,147 @@
+import numpy as np
+import pytest
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.confidence_intervals import (
+    bootstrap_quantile_intervals,
+    clopper_pearson_interval,
+    count_table,
+    count_table_quantiles,
+    paired_bootstrap_quantile_difference_intervals,
+    paired_difference_interval,
+    regularized_incomplete_beta,
+    simulations_for_half_width,
+)
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+@pytest.mark.parametrize(
+    "x, a, b, expected",
+    [
+        (0.3, 1, 1, 0.3),
+        (0.3, 2, 1, 0.09),
+        (0.3, 1, 3, 1 - 0.7**3),
+        (0.5, 7, 7, 0.5),
+    ],
+)
+def test_regularized_incomplete_beta(x, a, b, expected):
+    """
+    The incomplete beta function should match closed forms of simple Beta distributions.
+    """
+
+    assert regularized_incomplete_beta(x, a, b) == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize(
+    "successes, trials, expected",
+    [
+        (0, 10, (0.0, 1 - 0.025**0.1)),
+        (10, 10, (0.025**0.1, 1.0)),
+        (5, 10, (0.18708602, 0.81291398)),
+        (50, 500_000, (7.4221e-05, 1.31838e-04)),
+    ],
+)
+def test_clopper_pearson_interval(successes, trials, expected):
+    """
+    Exact binomial intervals should match known values, including tiny probabilities from large runs.
+    """
+
+    low, high = clopper_pearson_interval(successes, trials)
+
+    assert low == pytest.approx(expected[0], rel=1e-4)
+    assert high == pytest.approx(expected[1], rel=1e-4)
+
+
+def test_count_table_quantiles_match_numpy():
+    """
+    Quantiles of a count table should match inverted-CDF quantiles of the values it was built from.
+    """
+
+    values = np.random.default_rng(743).integers(0, 50, size=5_000)
+    quantiles = np.array([0, 0.1, 0.5, 0.9, 0.99, 1])
+
+    assert np.array_equal(
+        count_table_quantiles(*count_table(values), quantiles)[0],
+        np.quantile(values, quantiles, method="inverted_cdf"),
+    )
+
+
+@pytest.mark.parametrize("method", ["poisson", "multinomial"])
+def test_bootstrap_quantile_intervals_cover_true_quantile(method):
+    """
+    Bootstrap intervals of a geometric sample's quantiles should contain the true quantiles.
+    """
+
+    values = np.random.default_rng(743).geometric(0.1, size=20_000)
+    quantiles = np.array([0.25, 0.5, 0.9])
+    true_quantiles = np.ceil(np.log(1 - quantiles) / np.log(0.9))
+
+    bounds = bootstrap_quantile_intervals(
+        *count_table(values), quantiles, method=method, seed=743
+    )
+
+    assert (bounds[:, 0] <= true_quantiles).all()
+    assert (bounds[:, 1] >= true_quantiles).all()
+
+
+def test_paired_intervals_cancel_shared_noise():
+    """
+    Outcomes that share their noise should give tight paired intervals around the true difference.
+    """
+
+    rng = np.random.default_rng(743)
+    first_values = rng.integers(0, 1_000, size=20_000)
+    second_values = first_values + 50
+
+    difference, bounds = paired_bootstrap_quantile_difference_intervals(
+        first_values, second_values, [0.25, 0.5], seed=743
+    )
+    np.testing.assert_array_equal(difference, [50, 50])
+    np.testing.assert_array_equal(bounds, [[50, 50], [50, 50]])
+
+    interval = paired_difference_interval(first_values >= 500, second_values >= 500)
+    assert interval["low"] <= interval["difference"] <= interval["high"]
+    assert interval["difference"] == pytest.approx(0.05, abs=0.005)
+    assert interval["variance_reduction"] > 5
+
+
+def test_simulations_for_half_width():
+    """
+    A 50% probability needs about 9,604 sessions for a 95% interval of +/- 1 percentage point.
+    """
+
+    assert simulations_for_half_width(0.25, 0.01) == 9_604
+
+
+def test_gacha_sim_intervals_contain_estimates():
+    """
+    Probability and quantile outputs of a simulation should come with intervals around their estimates.
+    """
+
+    gacha_sim = GachaSim(
+        session_criterion="crystals_spent",
+        criterion_value=30_000,
+        target_weapon_type="featured",
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        seed_value=743,
+        num_simulations=20_000,
+    )
+    gacha_sim.run_sims(n_jobs=1, engine="numpy")
+
+    probability, low, high = gacha_sim.return_value_probability(
+        "targeted_weapon_parts", 600, interval=True
+    )
+    assert low <= probability <= high
+    assert high - low < 2
+
+    median, median_low, median_high = gacha_sim.return_value_quantile(
+        "targeted_weapon_parts", 50, seed=743
+    )
+    assert median_low <= median <= median_high
+    assert median == np.quantile(
+        gacha_sim.sim_results["targeted_weapon_parts"], 0.5, method="inverted_cdf"
+    )
+
+    # Halving the interval's half-width takes about four times the simulations
+    assert gacha_sim.simulations_needed(
+        "targeted_weapon_parts", 600, half_width=(high - low) / 4
+    ) == pytest.approx(4 * 20_000, rel=0.1)
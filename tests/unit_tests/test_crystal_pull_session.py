@@ -413,3 +413,54 @@ def test_pre_draw_stamp_card_operations_rules_for_draw(
         expected_col="expected_" + column_suffix,
         output_col="output_" + column_suffix,
     )
+
+
+@pytest.mark.parametrize("starting_stamp_card", [2, "page_three"])
+def test_mid_banner_starting_state(starting_stamp_card):
+    """
+    A session resuming from the middle of a banner should start on its stamp card position, without granting
+    the rules already passed again, and count the crystals already spent towards its criterion.
+    """
+
+    cps = CrystalPullSession(
+        session_criterion="crystals_spent",
+        criterion_value=30_000,
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        target_weapon_type="featured",
+        starting_weapon_parts=450,
+        starting_stamp_card=starting_stamp_card,
+        starting_stamp_value=7,
+        starting_crystals_spent=21_000,
+    )
+
+    assert cps.current_stamp_card_index == 2
+    assert cps.current_stamp_card.current_stamp_value == 7
+
+    cps.log_rules_for_next_draw(7)
+    assert cps.rules_for_next_ten_draw == []
+
+    cps.execute_pull_session()
+
+    assert cps.data["num_crystals_spent"] == 30_000
+    assert cps.data["targeted_weapon_parts"] >= 450
+    assert cps.data["total_stamps_earned"] <= 3 * max(STAMP_VALUE_ROLL_THRESHOLDS)
+
+
+@pytest.mark.parametrize(
+    "starting_position",
+    [{"starting_stamp_card": 4}, {"starting_stamp_card": "page_four"}, {"starting_stamp_value": 12}],
+)
+def test_invalid_starting_state(starting_position):
+    """
+    Starting stamp card positions outside the banner's stamp cards should raise a ValueError.
+    """
+
+    with pytest.raises(ValueError):
+        CrystalPullSession(
+            session_criterion="crystals_spent",
+            criterion_value=30_000,
+            banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+            target_weapon_type="featured",
+            starting_weapon_parts=0,
+            **starting_position,
+        )
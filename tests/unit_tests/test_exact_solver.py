@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+from ever_crisis_gacha_simulator.classes.compiled_banner import CompiledBanner
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.exact_solver import (
+    exact_minimum_budget,
+    exact_parts_distributions,
+)
+from ever_crisis_gacha_simulator.session_kernels import (
+    generate_session_key,
+    simulate_sessions,
+)
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+@pytest.fixture()
+def test_compiled_banner():
+    """
+    A `CompiledBanner` object to re-use across tests for the exact solver.
+    """
+
+    return CompiledBanner(
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        target_weapon_type="featured",
+    )
+
+
+def test_exact_distribution_matches_simulation(test_compiled_banner):
+    """
+    The exact distribution of weapon parts after 24,000 crystals should match simulated sessions within their
+    sampling error.
+    """
+
+    num_sessions = 50_000
+    distributions = exact_parts_distributions(test_compiled_banner, 8, 1_000)
+    key, _ = generate_session_key(743)
+    weapon_parts = simulate_sessions(
+        test_compiled_banner, "crystals_spent", 24_000, 0, 0, num_sessions, key
+    )[:, 0]
+
+    np.testing.assert_allclose(distributions.sum(axis=1), 1)
+    for value in [400, 600, 800, 1_000]:
+        exact_probability = distributions[8, value:].sum()
+        standard_error = np.sqrt(exact_probability * (1 - exact_probability) / num_sessions)
+        assert abs((weapon_parts >= value).mean() - exact_probability) < 4 * standard_error
+
+
+@pytest.mark.parametrize("target_probability", [0.5, 0.9])
+def test_exact_minimum_budget_is_smallest(test_compiled_banner, target_probability):
+    """
+    The budget should reach the target probability, and one ten draw less should not.
+    """
+
+    budget = exact_minimum_budget(test_compiled_banner, 2, target_probability)
+    distributions = exact_parts_distributions(
+        test_compiled_banner, budget["crystals"] // 3_000, 600
+    )
+
+    assert budget["probability"] >= target_probability
+    assert distributions[-1, 600] == pytest.approx(budget["probability"])
+    assert distributions[-2, 600] < target_probability
+
+
+def test_exact_minimum_budget_with_enough_starting_parts(test_compiled_banner):
+    budget = exact_minimum_budget(test_compiled_banner, 1, 0.9, starting_weapon_parts=400)
+
+    assert budget == {"crystals": 0, "probability": 1.0}
+
+
+def test_simulated_minimum_budget_brackets_exact_budget():
+    """
+    The budget read off simulated 'overboost' sessions should have a confidence interval around the exact one.
+    """
+
+    gacha_sim = GachaSim(
+        session_criterion="overboost",
+        criterion_value=2,
+        target_weapon_type="featured",
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        seed_value=743,
+        starting_weapon_parts=100,
+        num_simulations=20_000,
+    )
+    gacha_sim.run_sims(n_jobs=1, engine="multinomial", progress=False)
+
+    exact_budget = gacha_sim.minimum_budget(0.8)
+    simulated_budget = gacha_sim.minimum_budget(0.8, method="simulation", seed=743)
+
+    assert simulated_budget["low"] <= exact_budget["crystals"] <= simulated_budget["high"]
+    assert simulated_budget["probability"] >= 0.8
+
+
+def test_minimum_budget_requires_overboost_criterion():
+    gacha_sim = GachaSim(
+        session_criterion="crystals_spent",
+        criterion_value=30_000,
+        target_weapon_type="featured",
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+    )
+
+    with pytest.raises(ValueError):
+        gacha_sim.minimum_budget(0.9)
@@ -0,0 +1,100 @@
+import pandas as pd
+import pytest
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.executors import (
+    EXECUTORS,
+    JoblibExecutor,
+    ThreadExecutor,
+    benchmark_executors,
+    generate_executor,
+)
+from ever_crisis_gacha_simulator.progress import run_chunks
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+def add(first, second):
+    return first + second
+
+
+@pytest.fixture
+def gacha_sim():
+    return GachaSim(
+        session_criterion="crystals_spent",
+        criterion_value=9_000,
+        target_weapon_type="featured",
+        banner_info=AERITH_LUCIA_EASTER_BANNER,
+        seed_value=743,
+        num_simulations=25_000,
+    )
+
+
+@pytest.mark.parametrize("executor", EXECUTORS)
+def test_executors_map_every_call(executor):
+    results = generate_executor(executor, n_jobs=2).map_unordered(add, [(value, 1) for value in range(8)])
+
+    assert sorted(results) == list(range(1, 9))
+
+
+@pytest.mark.parametrize("executor", EXECUTORS)
+def test_run_chunks_on_every_executor(executor):
+    events = []
+    results = run_chunks(
+        add,
+        [{"first": value, "second": 10} for value in range(5)],
+        [1, 2, 3, 4, 5],
+        n_jobs=2,
+        progress=events.append,
+        executor=executor,
+    )
+
+    assert results == [10, 11, 12, 13, 14]
+    assert events[-1].finished and events[-1].sessions_completed == 15
+
+
+def test_thread_workers_are_reported_per_thread():
+    events = []
+    run_chunks(
+        add,
+        [{"first": value, "second": 0} for value in range(20)],
+        [1] * 20,
+        progress=events.append,
+        executor=ThreadExecutor(n_jobs=2),
+    )
+
+    assert all(worker.count(":") == 2 for worker in events[-1].worker_status)
+
+
+@pytest.mark.parametrize("engine", ["numpy", "multinomial"])
+def test_results_do_not_depend_on_the_executor(gacha_sim, engine):
+    """
+    Every backend should produce the same sessions, as each session's random stream only depends on its index.
+    """
+
+    results = []
+    for executor in EXECUTORS:
+        gacha_sim.run_sims(n_jobs=2, engine=engine, executor=executor, progress=False)
+        results.append(gacha_sim.sim_results)
+
+    for sim_results in results[1:]:
+        pd.testing.assert_frame_equal(sim_results, results[0])
+
+
+def test_invalid_executor():
+    with pytest.raises(ValueError):
+        generate_executor("dask")
+
+
+def test_executor_instances_are_used_as_is():
+    executor = JoblibExecutor(n_jobs=1, backend="threading")
+
+    assert generate_executor(executor, n_jobs=4) is executor
+    assert executor.num_workers == 1
+
+
+def test_benchmark_executors(gacha_sim):
+    benchmark = benchmark_executors(gacha_sim, n_jobs=2, repeats=1)
+
+    assert sorted(benchmark["executor"]) == sorted(EXECUTORS)
+    assert benchmark["seconds"].is_monotonic_increasing
+    assert (benchmark["sessions_per_second"] > 0).all()
+    assert len(gacha_sim.sim_results) == 25_000
@@ -0,0 +1,366 @@
+import pandas as pd
+import pytest
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+def generate_gacha_sim(num_simulations, seed_value=743, criterion_value=21_000):
+    return GachaSim(
+        session_criterion="crystals_spent",
+        criterion_value=criterion_value,
+        target_weapon_type="featured",
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        seed_value=seed_value,
+        num_simulations=num_simulations,
+    )
+
+
+@pytest.mark.parametrize(
+    "engine, sampling",
+    [("numpy", "plain"), ("multinomial", "plain"), ("numpy", "antithetic"), ("numpy", "stratified")],
+)
+def test_add_sims_matches_a_single_run(engine, sampling):
+    """
+    Extending a run (across a chunk boundary) should give exactly the sessions of one larger run.
+    """
+
+    extended = generate_gacha_sim(7_000)
+    extended.run_sims(n_jobs=1, engine=engine, sampling=sampling, progress=False)
+    extended.add_sims(5_000, n_jobs=1, progress=False)
+    extended.add_sims(1, n_jobs=1, progress=False)
+
+    single = generate_gacha_sim(12_001)
+    single.run_sims(n_jobs=1, engine=engine, sampling=sampling, progress=False)
+
+    pd.testing.assert_frame_equal(extended.sim_results, single.sim_results)
+    assert extended.metadata["num_simulations"] == 12_001
+    assert (extended.sampling_report is None) == (sampling == "plain")
+
+
+def test_add_sims_to_an_unseeded_run():
+    gacha_sim = generate_gacha_sim(1_000, seed_value=None)
+    gacha_sim.run_sims(n_jobs=1, engine="numpy", progress=False)
+    first_sessions = gacha_sim.sim_results.copy()
+    gacha_sim.add_sims(1_000, n_jobs=1, progress=False)
+
+    pd.testing.assert_frame_equal(gacha_sim.sim_results.iloc[:1_000], first_sessions)
+    assert len(gacha_sim.sim_results.drop_duplicates()) > 1_000
+
+
+def test_add_sims_requires_a_compiled_run():
+    gacha_sim = generate_gacha_sim(10)
+    gacha_sim.run_sims(n_jobs=1, engine="reference", progress=False)
+
+    with pytest.raises(ValueError):
+        gacha_sim.add_sims(10, progress=False)
+
+
+def test_merge_runs_of_the_same_stream():
+    shorter = generate_gacha_sim(1_000)
+    shorter.run_sims(n_jobs=1, engine="numpy", progress=False)
+    longer = generate_gacha_sim(3_000)
+    longer.run_sims(n_jobs=1, engine="numpy", progress=False)
+
+    shorter.merge_sims(longer)
+
+    pd.testing.assert_frame_equal(shorter.sim_results, longer.sim_results)
+    assert shorter.session_stream == longer.session_stream
+    assert shorter.metadata["num_simulations"] == 3_000
+
+
+def test_merge_independent_runs():
+    first = generate_gacha_sim(1_000, seed_value=1)
+    first.run_sims(n_jobs=1, engine="numpy", progress=False)
+    second = generate_gacha_sim(2_000, seed_value=2)
+    second.run_sims(n_jobs=1, engine="multinomial", progress=False)
+    first_results = first.sim_results.copy()
+
+    first.merge_sims(second)
+
+    pd.testing.assert_frame_equal(
+        first.sim_results, pd.concat([first_results, second.sim_results], ignore_index=True)
+    )
+    assert first.session_stream is None and first.metadata["seed_value"] is None
+    with pytest.raises(ValueError):
+        first.add_sims(10, progress=False)
+
+
+def test_merge_requires_the_same_configuration():
+    first = generate_gacha_sim(100)
+    first.run_sims(n_jobs=1, engine="numpy", progress=False)
+    second = generate_gacha_sim(100, criterion_value=30_000)
+    second.run_sims(n_jobs=1, engine="numpy", progress=False)
+
+    with pytest.raises(ValueError):
+        first.merge_sims(second)
+
+
+@pytest.mark.parametrize(
+    "engine, sampling",
+    [("numpy", "plain"), ("jit", "plain"), ("multinomial", "plain"), ("numpy", "stratified")],
+)
+@pytest.mark.parametrize(
+    "session_criterion, criterion_value, higher_criterion_value",
+    [("crystals_spent", 21_000, 30_000), ("overboost", 1, 2), ("stamps_earned", 20, 40)],
+)
+def test_continue_sims_matches_a_fresh_run(
+    engine, sampling, session_criterion, criterion_value, higher_criterion_value
+):
+    """
+    Continuing every session to a higher criterion value should give exactly the sessions of a fresh run.
+    """
+
+    def generate_criterion_sim(value):
+        return GachaSim(
+            session_criterion=session_criterion,
+            criterion_value=value,
+            target_weapon_type="featured",
+            banner_info=ZACK_FF9_CROSSOVER_BANNER,
+            seed_value=743,
+            num_simulations=3_000,
+        )
+
+    continued = generate_criterion_sim(criterion_value)
+    continued.run_sims(n_jobs=1, engine=engine, sampling=sampling, progress=False)
+    continued.continue_sims(higher_criterion_value, n_jobs=1, progress=False)
+
+    fresh = generate_criterion_sim(higher_criterion_value)
+    fresh.run_sims(n_jobs=1, engine=engine, sampling=sampling, progress=False)
+
+    pd.testing.assert_frame_equal(continued.sim_results, fresh.sim_results)
+    assert continued.metadata["criterion_value"] == higher_criterion_value
+
+
+def test_continue_sims_rejects_lower_values():
+    gacha_sim = generate_gacha_sim(100)
+    gacha_sim.run_sims(n_jobs=1, engine="numpy", progress=False)
+
+    with pytest.raises(ValueError):
+        gacha_sim.continue_sims(18_000, progress=False)
+
+
+def generate_capped_sim(max_crystals_spent, session_criterion="overboost", criterion_value=3, num_simulations=2_000):
+    return GachaSim(
+        session_criterion=session_criterion,
+        criterion_value=criterion_value,
+        target_weapon_type="wishlisted",
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        seed_value=743,
+        num_simulations=num_simulations,
+        max_crystals_spent=max_crystals_spent,
+    )
+
+
+@pytest.mark.parametrize("engine", ["reference", "numpy", "jit", "multinomial"])
+def test_crystal_cap_censors_sessions(engine):
+    """
+    Capped sessions should stop at the cap without reaching the target, and every other session should reach it.
+    """
+
+    gacha_sim = generate_capped_sim(60_000, num_simulations=500 if engine == "reference" else 2_000)
+    gacha_sim.run_sims(n_jobs=1, engine=engine, progress=False)
+
+    censored = gacha_sim.censored_sessions()
+    sim_results = gacha_sim.sim_results
+    assert sim_results["num_crystals_spent"].max() <= 60_000
+    assert (sim_results["num_crystals_spent"][censored] == 60_000).all()
+    assert (sim_results["targeted_weapon_parts"][~censored] >= 800).all()
+    assert 0 < censored.mean() < 1
+
+    summary = gacha_sim.summary().set_index(["column", "statistic"])["value"]
+    assert summary[("censored", "P(censored)")] == pytest.approx(100 * censored.mean())
+
+
+@pytest.mark.parametrize("engine", ["numpy", "jit", "multinomial"])
+def test_crystal_cap_truncates_the_uncapped_sessions(engine):
+    """
+    A cap only cuts sessions short: uncensored sessions are the sessions of the uncapped run.
+    """
+
+    capped = generate_capped_sim(60_000)
+    capped.run_sims(n_jobs=1, engine=engine, progress=False)
+    uncapped = generate_capped_sim(None)
+    uncapped.run_sims(n_jobs=1, engine=engine, progress=False)
+
+    censored = capped.censored_sessions()
+    pd.testing.assert_frame_equal(capped.sim_results[~censored], uncapped.sim_results[~censored])
+    assert (uncapped.sim_results["num_crystals_spent"][censored] > 60_000).all()
+    assert not uncapped.censored_sessions().any()
+    assert ("censored", "P(censored)") not in set(
+        uncapped.summary()[["column", "statistic"]].itertuples(index=False, name=None)
+    )
+
+
+def test_crystal_cap_on_jit_and_stamp_sims_matches_numpy():
+    numpy_sim = generate_capped_sim(21_000, session_criterion="stamps_earned", criterion_value=40)
+    numpy_sim.run_sims(n_jobs=1, engine="numpy", progress=False)
+    jit_sim = generate_capped_sim(21_000, session_criterion="stamps_earned", criterion_value=40)
+    jit_sim.run_sims(n_jobs=1, engine="jit", progress=False)
+    stamp_sim = generate_capped_sim(21_000, session_criterion="stamps_earned", criterion_value=40)
+    stamp_sim.run_stamp_sims(n_jobs=1, progress=False)
+
+    pd.testing.assert_frame_equal(jit_sim.sim_results, numpy_sim.sim_results)
+    pd.testing.assert_frame_equal(stamp_sim.sim_results, numpy_sim.sim_results[stamp_sim.sim_results.columns])
+    assert stamp_sim.censored_sessions().any()
+
+
+def test_continue_capped_sims_matches_a_fresh_run():
+    continued = generate_capped_sim(90_000, criterion_value=1)
+    continued.run_sims(n_jobs=1, engine="numpy", progress=False)
+    continued.continue_sims(4, n_jobs=1, progress=False)
+
+    fresh = generate_capped_sim(90_000, criterion_value=4)
+    fresh.run_sims(n_jobs=1, engine="numpy", progress=False)
+
+    pd.testing.assert_frame_equal(continued.sim_results, fresh.sim_results)
+
+
+def test_censored_sessions_are_not_successes():
+    """
+    Sessions stopped by the crystal cap never reached their goal, so they should not count as reaching it within
+    the cap's budget.
+    """
+
+    gacha_sim = generate_capped_sim(60_000)
+    gacha_sim.run_sims(n_jobs=1, engine="numpy", progress=False)
+    reached = 100 * (1 - gacha_sim.censored_sessions().mean())
+
+    assert reached < 90
+    assert gacha_sim.return_value_probability("num_crystals_spent", 60_000) == round(reached, 1)
+    assert gacha_sim.success_probability(60_000) == round(reached, 1)
+
+    unreachable_sim = GachaSim(
+        session_criterion="overboost",
+        criterion_value=10,
+        target_weapon_type="featured",
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        seed_value=743,
+        num_simulations=2_000,
+        max_crystals_spent=30_000,
+    )
+    assert unreachable_sim.success_probability(30_000, n_jobs=1, progress=False) == 0.0
+
+
+def test_simulated_minimum_budget_within_the_crystal_cap():
+    """
+    Censored sessions should count as never reaching the goal, so the simulated budget matches the uncapped run's
+    below the cap, and targets beyond the share of uncensored sessions are out of reach.
+    """
+
+    capped = generate_capped_sim(60_000)
+    capped.run_sims(n_jobs=1, engine="numpy", progress=False)
+    uncapped = generate_capped_sim(None)
+    uncapped.run_sims(n_jobs=1, engine="numpy", progress=False)
+    reached = 1 - capped.censored_sessions().mean()
+
+    capped_budget = capped.minimum_budget(reached / 2, method="simulation", seed=1)
+    uncapped_budget = uncapped.minimum_budget(reached / 2, method="simulation", seed=1)
+    assert capped_budget["crystals"] == uncapped_budget["crystals"]
+    assert capped_budget["probability"] == pytest.approx(uncapped_budget["probability"])
+
+    with pytest.raises(ValueError):
+        capped.minimum_budget(min(reached + 0.05, 0.99), method="simulation")
+
+
+def test_exact_minimum_budget_within_the_crystal_cap():
+    """
+    The exact budget of a capped configuration should match the uncapped one when it fits under the cap, and
+    raise when it does not.
+    """
+
+    uncapped_budget = generate_capped_sim(None).minimum_budget(0.5)
+    capped_budget = generate_capped_sim(uncapped_budget["crystals"]).minimum_budget(0.5)
+    assert capped_budget == uncapped_budget
+
+    with pytest.raises(ValueError):
+        generate_capped_sim(uncapped_budget["crystals"] - 3_000).minimum_budget(0.5)
+
+
+def test_crystal_cap_must_fit_a_ten_draw():
+    with pytest.raises(ValueError):
+        generate_capped_sim(2_999).run_sims(n_jobs=1, engine="numpy", progress=False)
+
+
+def test_importance_sims_replace_the_previous_run_state():
+    """
+    Each run should clear the sampling report and importance tilts of the run before it, and be timed.
+    """
+
+    gacha_sim = generate_gacha_sim(2_000)
+    gacha_sim.run_sims(n_jobs=1, engine="numpy", sampling="antithetic", progress=False)
+    assert gacha_sim.sampling_report is not None
+
+    gacha_sim.run_importance_sims(five_star_tilt=2.0, n_jobs=1, progress=False)
+    assert gacha_sim.sampling_report is None
+    assert gacha_sim.run_seconds > 0
+    assert gacha_sim.importance_tilts == {"five_star_tilt": 2.0, "stamp_tilt": 0.0}
+
+    gacha_sim.run_sims(n_jobs=1, engine="numpy", progress=False)
+    assert gacha_sim.importance_tilts is None
+
+    gacha_sim.run_importance_sims(five_star_tilt=2.0, n_jobs=1, progress=False)
+    gacha_sim.run_population_sims({}, n_jobs=1, progress=False)
+    assert gacha_sim.importance_tilts is None
+
+    stamp_sim = generate_capped_sim(None, session_criterion="stamps_earned", criterion_value=40)
+    stamp_sim.run_importance_sims(five_star_tilt=2.0, n_jobs=1, progress=False)
+    stamp_sim.run_stamp_sims(n_jobs=1, progress=False)
+    assert stamp_sim.importance_tilts is None
+
+
+@pytest.mark.parametrize(
+    "engine, sampling",
+    [("reference", "antithetic"), ("jit", "stratified"), ("numpy", "latin_hypercube")],
+)
+def test_unsupported_sampling_is_rejected_up_front(engine, sampling, monkeypatch):
+    """
+    Unsupported sampling modes should raise before any chunk is submitted to a worker.
+    """
+
+    def fail(*args, **kwargs):
+        raise AssertionError("No chunk should be run.")
+
+    monkeypatch.setattr("ever_crisis_gacha_simulator.classes.gacha_sim.run_chunks", fail)
+
+    with pytest.raises(ValueError):
+        generate_gacha_sim(100).run_sims(n_jobs=1, engine=engine, sampling=sampling, progress=False)
+
+
+def test_multinomial_engine_supports_variance_reduced_sampling():
+    gacha_sim = generate_gacha_sim(2_048)
+    gacha_sim.run_sims(n_jobs=1, engine="multinomial", sampling="antithetic", progress=False)
+
+    assert gacha_sim.sampling_report is not None
+
+
+def test_importance_sims_keep_their_stream_but_cannot_be_traced():
+    """
+    Importance-sampled runs keep their key, but weighted sessions cannot be replayed, and runs of other tilts are
+    independent samples when merged.
+    """
+
+    gacha_sim = generate_gacha_sim(1_000)
+    gacha_sim.run_importance_sims(five_star_tilt=2.0, n_jobs=1, progress=False)
+    assert gacha_sim.session_stream["sampling"] == "importance"
+
+    with pytest.raises(ValueError):
+        gacha_sim.trace_sessions(num_traces=5)
+
+    other_sim = generate_gacha_sim(1_000)
+    other_sim.run_importance_sims(five_star_tilt=4.0, n_jobs=1, progress=False)
+    gacha_sim.merge_sims(other_sim)
+    assert len(gacha_sim.sim_results) == 2_000
+    assert gacha_sim.session_stream is None and gacha_sim.importance_tilts is None
+
+
+def test_results_do_not_depend_on_the_number_of_workers():
+    """
+    Chunk bounds shrink with more workers, but sessions only depend on their index.
+    """
+
+    serial = generate_capped_sim(None, num_simulations=12_000)
+    serial.run_sims(n_jobs=1, engine="numpy", executor="serial", progress=False)
+    threaded = generate_capped_sim(None, num_simulations=12_000)
+    threaded.run_sims(n_jobs=8, engine="numpy", executor="threads", progress=False)
+
+    pd.testing.assert_frame_equal(serial.sim_results, threaded.sim_results)
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ever_crisis_gacha_simulator.classes.compiled_banner import SESSION_DATA_COLUMNS
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.population import POPULATION_PARAMETERS, generate_population
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+from ever_crisis_gacha_simulator.constants import STAMP_VALUE_ROLL_THRESHOLDS
+
+
+def generate_gacha_sim(session_criterion="crystals_spent", criterion_value=30_000, num_simulations=4_000, **kwargs):
+    return GachaSim(
+        session_criterion=session_criterion,
+        criterion_value=criterion_value,
+        target_weapon_type="featured",
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        seed_value=743,
+        num_simulations=num_simulations,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("engine", ["numpy", "jit", "multinomial"])
+def test_uniform_population_matches_run_sims(engine):
+    """
+    A population whose sessions all share one configuration should be that configuration's run.
+    """
+
+    population_sim = generate_gacha_sim(starting_weapon_parts=50)
+    population_sim.run_population_sims({}, n_jobs=1, engine=engine, progress=False)
+    gacha_sim = generate_gacha_sim(starting_weapon_parts=50)
+    gacha_sim.run_sims(n_jobs=1, engine=engine, progress=False)
+
+    pd.testing.assert_frame_equal(population_sim.sim_results[SESSION_DATA_COLUMNS], gacha_sim.sim_results)
+    assert list(population_sim.sim_results.columns) == SESSION_DATA_COLUMNS + POPULATION_PARAMETERS
+    assert (population_sim.sim_results["starting_weapon_parts"] == 50).all()
+
+
+@pytest.mark.parametrize("engine", ["numpy", "jit"])
+@pytest.mark.parametrize(
+    "session_criterion, parameter, segment_values",
+    [
+        ("crystals_spent", "criterion_value", [15_000, 45_000]),
+        ("overboost", "criterion_value", [0, 2]),
+        ("overboost", "starting_weapon_parts", [0, 300]),
+    ],
+)
+def test_population_segments_match_their_own_runs(engine, session_criterion, parameter, segment_values):
+    """
+    Every session of a mixed population should be the same session as in a run of its own segment.
+    """
+
+    criterion_value = segment_values[0] if parameter == "criterion_value" else 1
+    population_sim = generate_gacha_sim(session_criterion=session_criterion, criterion_value=criterion_value)
+    population_sim.run_population_sims(
+        {parameter: np.tile(segment_values, 2_000)}, n_jobs=1, engine=engine, progress=False
+    )
+
+    for segment, value in enumerate(segment_values):
+        segment_sim = generate_gacha_sim(session_criterion=session_criterion, criterion_value=criterion_value)
+        segment_sim.metadata["criterion_value" if parameter == "criterion_value" else parameter] = value
+        segment_sim.run_sims(n_jobs=1, engine=engine, progress=False)
+
+        np.testing.assert_array_equal(
+            population_sim.sim_results[SESSION_DATA_COLUMNS].to_numpy()[segment::2],
+            segment_sim.sim_results.to_numpy()[segment::2],
+        )
+
+
+@pytest.mark.parametrize("session_criterion, criterion_value", [("stamps_earned", 30), ("crystals_spent", 30_000)])
+def test_starting_stamp_card_positions(session_criterion, criterion_value):
+    """
+    Sessions starting anywhere on the stamp cards should agree across engines and count only the stamps they
+    earn, and sessions starting on the EX card should miss the featured 5* guarantees of the earlier cards.
+    """
+
+    population = {
+        "starting_stamp_card": lambda rng, size: rng.integers(0, 4, size),
+        "starting_stamp_value": lambda rng, size: rng.integers(0, 12, size),
+    }
+    results = {}
+    for engine in ["numpy", "jit"]:
+        gacha_sim = generate_gacha_sim(session_criterion=session_criterion, criterion_value=criterion_value)
+        gacha_sim.run_population_sims(population, n_jobs=1, engine=engine, progress=False)
+        results[engine] = gacha_sim.sim_results
+
+    pd.testing.assert_frame_equal(results["numpy"], results["jit"])
+
+    sim_results = results["numpy"]
+    if session_criterion == "stamps_earned":
+        assert (sim_results["total_stamps_earned"] >= criterion_value).all()
+        assert (sim_results["total_stamps_earned"] < criterion_value + max(STAMP_VALUE_ROLL_THRESHOLDS)).all()
+
+    five_stars = sim_results.groupby("starting_stamp_card")["targeted_five_stars_drawn"].mean()
+    assert five_stars[3] < min(five_stars[0], five_stars[1], five_stars[2])
+
+
+def test_population_distributions_are_seeded():
+    population = {"starting_weapon_parts": lambda rng, size: rng.integers(0, 400, size)}
+
+    first = generate_population(population, generate_gacha_sim().metadata, num_stamp_cards=4)
+    second = generate_population(population, generate_gacha_sim().metadata, num_stamp_cards=4)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert first["starting_weapon_parts"].nunique() > 100
+
+
+@pytest.mark.parametrize(
+    "population",
+    [
+        {"budget": 30_000},
+        {"starting_stamp_card": 4},
+        {"starting_stamp_value": 12},
+        {"starting_weapon_parts": -1},
+        {"starting_weapon_parts": 0.5},
+        {"criterion_value": np.arange(3)},
+    ],
+)
+def test_invalid_populations(population):
+    with pytest.raises(ValueError):
+        generate_population(population, generate_gacha_sim().metadata, num_stamp_cards=4)
+
+
+def test_population_criterion_values_are_validated():
+    with pytest.raises(ValueError):
+        generate_gacha_sim().run_population_sims({"criterion_value": 2_000}, n_jobs=1, progress=False)
+
+
+def test_capped_population_censoring_uses_each_sessions_criterion():
+    gacha_sim = generate_gacha_sim(session_criterion="overboost", criterion_value=0, max_crystals_spent=30_000)
+    gacha_sim.run_population_sims({"criterion_value": np.tile([0, 5], 2_000)}, n_jobs=1, progress=False)
+
+    censored = gacha_sim.censored_sessions()
+    assert censored[1::2].mean() > censored[::2].mean()
@@ -0,0 +1,80 @@
+import logging
+import pytest
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.progress import (
+    LoggingProgress,
+    ProgressEvent,
+    TqdmProgress,
+    run_chunks,
+)
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+def square(value):
+    return value**2
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_run_chunks_reports_completion_per_chunk(n_jobs):
+    """
+    Results should come back in chunk order, with one event per completed chunk and a final finished event.
+    """
+
+    events = []
+    results = run_chunks(
+        square,
+        [{"value": value} for value in range(6)],
+        [10, 10, 10, 10, 10, 5],
+        n_jobs=n_jobs,
+        progress=events.append,
+    )
+
+    assert results == [0, 1, 4, 9, 16, 25]
+    assert [event.chunks_completed for event in events] == list(range(1, 7))
+    assert [event.finished for event in events] == [False] * 5 + [True]
+    assert events[-1].sessions_completed == events[-1].total_sessions == 55
+    assert events[-1].eta_seconds == 0
+    assert sum(status["sessions"] for status in events[-1].worker_status.values()) == 55
+
+
+def test_progress_event_throughput_and_eta():
+    event = ProgressEvent(
+        sessions_completed=250,
+        total_sessions=1_000,
+        chunks_completed=1,
+        total_chunks=4,
+        elapsed_seconds=5.0,
+        worker_status={},
+    )
+
+    assert event.sessions_per_second == 50
+    assert event.eta_seconds == 15
+    assert event.fraction_completed == 0.25
+
+
+@pytest.mark.parametrize("engine", ["reference", "numpy"])
+def test_run_sims_progress_callbacks(engine, caplog):
+    """
+    Progress callbacks should see every session of a run complete, for both the reference and compiled engines.
+    """
+
+    events = []
+    gacha_sim = GachaSim(
+        session_criterion="stamps_earned",
+        criterion_value=12,
+        target_weapon_type="featured",
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        seed_value=743,
+        num_simulations=1_200,
+    )
+
+    with caplog.at_level(logging.INFO, logger="ever_crisis_gacha_simulator"):
+        gacha_sim.run_sims(
+            n_jobs=1,
+            engine=engine,
+            progress=[events.append, LoggingProgress(), TqdmProgress(disable=True)],
+        )
+
+    assert len(gacha_sim.sim_results) == 1_200
+    assert events[-1].finished and events[-1].sessions_completed == 1_200
+    assert "1,200/1,200 sessions (100.0%)" in caplog.text
@@ -0,0 +1,195 @@
+import pytest
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.classes.run_catalog import RunCatalog
+from ever_crisis_gacha_simulator.sharding import generate_config_hash
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+def run_gacha_sim(
+    banner_info, criterion_value=21_000, engine="numpy", num_simulations=2_000, max_crystals_spent=None
+):
+    gacha_sim = GachaSim(
+        session_criterion="crystals_spent",
+        criterion_value=criterion_value,
+        target_weapon_type="featured",
+        banner_info=banner_info,
+        seed_value=743,
+        num_simulations=num_simulations,
+        max_crystals_spent=max_crystals_spent,
+    )
+    gacha_sim.run_sims(n_jobs=1, engine=engine, progress=False)
+
+    return gacha_sim
+
+
+@pytest.fixture()
+def test_run_catalog(tmp_path):
+    """
+    A `RunCatalog` in a temporary file, closed after each test.
+    """
+
+    with RunCatalog(tmp_path / "runs.sqlite") as run_catalog:
+        yield run_catalog
+
+
+def test_query_across_banners(test_run_catalog):
+    """
+    A statistic should be answered for every banner of a scenario from the catalog alone.
+    """
+
+    gacha_sims = {
+        banner_info["metadata"]["name"]: run_gacha_sim(banner_info)
+        for banner_info in [AERITH_LUCIA_EASTER_BANNER, ZACK_SEPHIROTH_LIMIT_BREAK_BANNER]
+    }
+    for gacha_sim in gacha_sims.values():
+        test_run_catalog.record(gacha_sim)
+    test_run_catalog.record(run_gacha_sim(AERITH_LUCIA_EASTER_BANNER, criterion_value=30_000))
+
+    results = test_run_catalog.query(
+        "P(OB >= 1)", session_criterion="crystals_spent", criterion_value=21_000
+    )
+
+    assert sorted(results["banner_name"]) == sorted(gacha_sims)
+    for banner_name, value in zip(results["banner_name"], results["value"]):
+        assert value == pytest.approx(
+            gacha_sims[banner_name].return_value_probability("targeted_weapon_parts", 400, decimals=10)
+        )
+    assert (results["sessions_per_second"] > 0).all()
+
+
+def test_latest_run_per_scenario(test_run_catalog):
+    test_run_catalog.record(run_gacha_sim(AERITH_LUCIA_EASTER_BANNER, num_simulations=1_000))
+    latest_run_id = test_run_catalog.record(run_gacha_sim(AERITH_LUCIA_EASTER_BANNER))
+
+    assert list(test_run_catalog.query("p50", column="targeted_weapon_parts")["run_id"]) == [latest_run_id]
+    assert len(test_run_catalog.query("p50", column="targeted_weapon_parts", latest_only=False)) == 2
+
+
+def test_capped_and_uncapped_runs_are_separate_scenarios(test_run_catalog):
+    """
+    A capped run and an uncapped run of the same scenario should both be kept by latest-only queries.
+    """
+
+    uncapped_id = test_run_catalog.record(run_gacha_sim(ZACK_SEPHIROTH_LIMIT_BREAK_BANNER))
+    capped_id = test_run_catalog.record(
+        run_gacha_sim(ZACK_SEPHIROTH_LIMIT_BREAK_BANNER, max_crystals_spent=12_000)
+    )
+
+    results = test_run_catalog.query("p50")
+    assert sorted(results["run_id"]) == [uncapped_id, capped_id]
+    assert test_run_catalog.runs(max_crystals_spent=None)["run_id"].tolist() == [uncapped_id]
+    assert test_run_catalog.runs(max_crystals_spent=12_000)["run_id"].tolist() == [capped_id]
+
+
+def test_catalogs_without_the_crystal_cap_column_are_upgraded(tmp_path):
+    path = tmp_path / "runs.sqlite"
+    with RunCatalog(path) as run_catalog:
+        run_catalog.connection.execute("ALTER TABLE runs DROP COLUMN max_crystals_spent")
+
+    with RunCatalog(path) as run_catalog:
+        run_id = run_catalog.record(run_gacha_sim(AERITH_LUCIA_EASTER_BANNER))
+        assert run_catalog.runs(max_crystals_spent=None)["run_id"].tolist() == [run_id]
+
+
+def test_importance_sampled_runs_have_their_own_cache_key(test_run_catalog):
+    """
+    Importance-sampled runs should not share a cache key with a reference run of the same seed, nor with
+    importance-sampled runs of other tilts.
+    """
+
+    def generate_gacha_sim():
+        return GachaSim(
+            session_criterion="crystals_spent",
+            criterion_value=21_000,
+            target_weapon_type="featured",
+            banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+            seed_value=743,
+            num_simulations=200,
+        )
+
+    reference_sim = generate_gacha_sim()
+    reference_sim.run_sims(n_jobs=1, engine="reference", progress=False)
+    reference_id = test_run_catalog.record(reference_sim)
+
+    importance_ids = []
+    for five_star_tilt in [2.0, 4.0]:
+        importance_sim = generate_gacha_sim()
+        importance_sim.run_importance_sims(five_star_tilt=five_star_tilt, n_jobs=1, progress=False)
+        importance_ids.append(test_run_catalog.record(importance_sim))
+
+    runs = test_run_catalog.runs().set_index("run_id")
+    assert runs["cache_key"].nunique() == 3
+    assert runs.loc[importance_ids, "sampling"].tolist() == ["importance", "importance"]
+    assert runs.loc[importance_ids, "engine"].tolist() == ["numpy", "numpy"]
+    assert test_run_catalog.lookup(reference_sim, engine="reference") == reference_id
+
+
+def test_unseeded_importance_runs_keep_their_key(test_run_catalog):
+    """
+    The cache key of an unseeded importance-sampled run should come from the key the run used.
+    """
+
+    gacha_sim = GachaSim(
+        session_criterion="crystals_spent",
+        criterion_value=21_000,
+        target_weapon_type="featured",
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        num_simulations=200,
+    )
+    gacha_sim.run_importance_sims(five_star_tilt=2.0, n_jobs=1, progress=False)
+    run_id = test_run_catalog.record(gacha_sim)
+
+    expected_key = generate_config_hash(
+        gacha_sim.metadata,
+        gacha_sim.session_stream["key"],
+        sampling=("importance", gacha_sim.importance_tilts),
+        engine="numpy",
+    )
+    runs = test_run_catalog.runs()
+    assert runs.loc[runs["run_id"] == run_id, "cache_key"].tolist() == [expected_key]
+    assert test_run_catalog.generate_run_row(gacha_sim)["cache_key"] == expected_key
+
+
+def test_lookup_finds_recorded_configuration(test_run_catalog):
+    gacha_sim = run_gacha_sim(AERITH_LUCIA_EASTER_BANNER, engine="jit")
+    run_id = test_run_catalog.record(gacha_sim)
+
+    assert test_run_catalog.lookup(gacha_sim, engine="numpy") == run_id
+    assert test_run_catalog.lookup(gacha_sim, engine="multinomial") is None
+    assert test_run_catalog.summary(run_id).equals(gacha_sim.summary())
+
+
+def test_reference_runs_are_recorded(test_run_catalog):
+    gacha_sim = run_gacha_sim(AERITH_LUCIA_EASTER_BANNER, engine="reference", num_simulations=20)
+    run_id = test_run_catalog.record(gacha_sim)
+
+    assert test_run_catalog.runs(engine="reference")["run_id"].tolist() == [run_id]
+    assert test_run_catalog.lookup(gacha_sim, engine="reference") == run_id
+
+
+def test_unknown_filters_raise(test_run_catalog):
+    with pytest.raises(ValueError):
+        test_run_catalog.runs(banner="Aerith")
+
+
+def test_update_an_extended_run(test_run_catalog):
+    """
+    An extended run should replace its recorded entry, and only runs of the same sessions may do so.
+    """
+
+    gacha_sim = run_gacha_sim(AERITH_LUCIA_EASTER_BANNER, num_simulations=1_000)
+    run_id = test_run_catalog.record(gacha_sim)
+
+    gacha_sim.add_sims(1_500, n_jobs=1, progress=False)
+    test_run_catalog.update(run_id, gacha_sim)
+
+    runs = test_run_catalog.runs()
+    assert list(runs["run_id"]) == [run_id]
+    assert runs["num_simulations"][0] == 2_500
+    assert test_run_catalog.lookup(run_gacha_sim(AERITH_LUCIA_EASTER_BANNER)) == run_id
+    assert test_run_catalog.summary(run_id).equals(test_run_catalog.summary(test_run_catalog.record(
+        run_gacha_sim(AERITH_LUCIA_EASTER_BANNER, num_simulations=2_500)
+    )))
+
+    with pytest.raises(ValueError):
+        test_run_catalog.update(run_id, run_gacha_sim(ZACK_SEPHIROTH_LIMIT_BREAK_BANNER))
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.sampling import (
+    FIRST_DRAW_LANE,
+    SAMPLING_GROUP_SIZES,
+    STAMP_LANE,
+    SessionUniforms,
+    estimate_variance_reduction,
+    generate_session_key,
+)
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+def test_antithetic_sessions_mirror_each_other():
+    """
+    Odd sessions should use the mirror image of their even partner's floats.
+    """
+
+    key, _ = generate_session_key(743)
+    session_uniforms = SessionUniforms(key, np.arange(10, 20), sampling="antithetic")
+    floats = session_uniforms.uniforms(
+        np.arange(10), 3, FIRST_DRAW_LANE + np.arange(10)
+    )
+
+    assert np.allclose(floats[0::2] + floats[1::2], 1)
+    assert floats.min() >= 0 and floats.max() < 1
+
+
+def test_stratified_stamp_floats_cover_every_stratum():
+    """
+    Within a stratified group, each session's stamp float should land in a different stratum.
+    """
+
+    key, _ = generate_session_key(743)
+    group_size = SAMPLING_GROUP_SIZES["stratified"]
+    session_uniforms = SessionUniforms(
+        key, np.arange(group_size, 3 * group_size), sampling="stratified"
+    )
+
+    for ten_draw_index in range(5):
+        floats = session_uniforms.uniforms(
+            np.arange(2 * group_size), ten_draw_index, STAMP_LANE
+        )
+        for group_floats in floats.reshape(2, group_size):
+            strata = np.sort((group_floats * group_size).astype(int))
+            assert strata.tolist() == list(range(group_size))
+
+
+def test_plain_sampling_has_no_variance_reduction():
+    """
+    Independent values should show a variance reduction factor close to 1, whichever groups are used.
+    """
+
+    values = np.random.default_rng(743).normal(size=64_000)
+
+    assert estimate_variance_reduction(
+        values, np.arange(64_000), "stratified"
+    ) == pytest.approx(1, abs=0.15)
+
+
+@pytest.mark.parametrize("sampling", ["antithetic", "stratified", "sobol"])
+def test_variance_reduced_sampling_is_unbiased(sampling):
+    """
+    Each sampling mode should report its variance reduction and give the same mean stamps as plain sampling.
+    """
+
+    if sampling == "sobol":
+        pytest.importorskip("scipy")
+
+    gacha_sim = GachaSim(
+        session_criterion="crystals_spent",
+        criterion_value=21_000,
+        target_weapon_type="featured",
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        seed_value=743,
+        num_simulations=8_192,
+    )
+    gacha_sim.run_sims(n_jobs=1, engine="numpy", sampling=sampling)
+
+    # 7 ten draws at an expected 1.818 stamps each
+    assert gacha_sim.sim_results["total_stamps_earned"].mean() == pytest.approx(
+        7 * 1.8178, abs=0.05
+    )
+    assert gacha_sim.sampling_report["variance_reduction"]["total_stamps_earned"] > 1
@@ -0,0 +1,84 @@
+import pytest
+from ever_crisis_gacha_simulator.classes.compiled_banner import CompiledBanner
+from ever_crisis_gacha_simulator.scheduling import (
+    MIN_SESSIONS_PER_CHUNK,
+    TEN_DRAWS_PER_CHUNK,
+    cost_balanced_chunk_size,
+    estimate_session_cost,
+    guided_chunk_bounds,
+)
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+@pytest.mark.parametrize(
+    "session_criterion, criterion_value, starting_weapon_parts, max_crystals_spent, expected",
+    [
+        ("crystals_spent", 30_000, 0, None, 10),
+        ("crystals_spent", 30_000, 0, 9_000, 3),
+        ("overboost", 0, 200, None, 0),
+        ("overboost", 0, 500, None, 0),
+        ("overboost", 10, 0, 60_000, 20),
+    ],
+)
+def test_estimate_session_cost(session_criterion, criterion_value, starting_weapon_parts, max_crystals_spent, expected):
+    compiled_banner = CompiledBanner(ZACK_SEPHIROTH_LIMIT_BREAK_BANNER, "featured")
+
+    assert estimate_session_cost(
+        compiled_banner,
+        session_criterion,
+        criterion_value,
+        starting_weapon_parts=starting_weapon_parts,
+        max_crystals_spent=max_crystals_spent,
+    ) == expected
+
+
+def test_wishlisted_overboost_costs_more():
+    featured, wishlisted = (
+        estimate_session_cost(CompiledBanner(ZACK_SEPHIROTH_LIMIT_BREAK_BANNER, target), "overboost", 6)
+        for target in ["featured", "wishlisted"]
+    )
+
+    assert wishlisted > featured > 0
+
+
+@pytest.mark.parametrize(
+    "session_cost, expected",
+    [
+        (0, 10_000),
+        (5, 10_000),
+        (TEN_DRAWS_PER_CHUNK / 2_000, 2_000),
+        (TEN_DRAWS_PER_CHUNK, MIN_SESSIONS_PER_CHUNK),
+    ],
+)
+def test_cost_balanced_chunk_size(session_cost, expected):
+    assert cost_balanced_chunk_size(session_cost, 10_000) == expected
+
+
+@pytest.mark.parametrize(
+    "session_start, session_stop, num_workers, max_chunk_size",
+    [(0, 100_000, 4, 10_000), (7_000, 12_001, 1, 10_000), (0, 300, 8, 10_000), (0, 50_000, 2, 1_000)],
+)
+def test_guided_chunk_bounds(session_start, session_stop, num_workers, max_chunk_size):
+    """
+    Chunks should cover the sessions in order, within the size limits, and never grow.
+    """
+
+    chunk_bounds = guided_chunk_bounds(session_start, session_stop, num_workers, max_chunk_size)
+
+    starts = [chunk_start for chunk_start, _ in chunk_bounds]
+    stops = [chunk_stop for _, chunk_stop in chunk_bounds]
+    assert starts == [session_start] + stops[:-1]
+    assert stops[-1] == session_stop
+
+    sizes = [chunk_stop - chunk_start for chunk_start, chunk_stop in chunk_bounds]
+    assert sizes == sorted(sizes, reverse=True)
+    assert all(size <= max_chunk_size for size in sizes)
+    assert all(size >= MIN_SESSIONS_PER_CHUNK for size in sizes[:-1])
+
+
+def test_guided_chunks_shrink_towards_the_end():
+    sizes = [stop - start for start, stop in guided_chunk_bounds(0, 100_000, 4, 10_000)]
+
+    assert sizes[0] == 10_000
+    assert sizes[-2] == MIN_SESSIONS_PER_CHUNK
+    assert guided_chunk_bounds(5, 5, 4, 10_000) == []
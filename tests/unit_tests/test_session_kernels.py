@@ -0,0 +1,219 @@
+import numpy as np
+import pytest
+from ever_crisis_gacha_simulator.classes.compiled_banner import (
+    CompiledBanner,
+    SESSION_DATA_COLUMNS,
+)
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.session_kernels import (
+    NUMBA_AVAILABLE,
+    generate_session_key,
+    simulate_sessions,
+    simulate_weighted_sessions,
+)
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+from ever_crisis_gacha_simulator.constants import *
+
+
+@pytest.fixture()
+def test_compiled_banner():
+    """
+    A `CompiledBanner` object to re-use across tests for the session kernels.
+    """
+
+    return CompiledBanner(
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        target_weapon_type="featured",
+    )
+
+
+@pytest.mark.parametrize(
+    "session_criterion, criterion_value",
+    [("crystals_spent", 21_000), ("overboost", 2), ("stamps_earned", 30)],
+)
+@pytest.mark.parametrize("engine", ["numpy", "multinomial"])
+def test_session_criteria_are_met(
+    test_compiled_banner, session_criterion, criterion_value, engine
+):
+    """
+    Every simulated session should stop exactly where its criterion is first met.
+    """
+
+    key, _ = generate_session_key(743)
+
+    data = simulate_sessions(
+        compiled_banner=test_compiled_banner,
+        session_criterion=session_criterion,
+        criterion_value=criterion_value,
+        starting_weapon_parts=0,
+        session_start=0,
+        session_stop=500,
+        key=key,
+        engine=engine,
+    )
+
+    if session_criterion == "crystals_spent":
+        assert all(data[:, 2] == 21_000)
+    elif session_criterion == "overboost":
+        assert all(data[:, 0] >= (criterion_value + 1) * WEAPON_PARTS_PER_OVERBOOST)
+    else:
+        assert all(data[:, 1] >= criterion_value)
+        assert all(data[:, 1] - 12 < criterion_value)
+
+    # Each ten draw produces exactly ten pull results
+    assert all(data[:, 3:].sum(axis=1) == 10 * data[:, 2] / TEN_DRAW_CRYSTAL_COST)
+
+
+@pytest.mark.parametrize("engine", ["numpy", "multinomial"])
+def test_sessions_do_not_depend_on_chunking(test_compiled_banner, engine):
+    """
+    A session's results should only depend on the key and its index, not on which chunk simulated it.
+    """
+
+    key, _ = generate_session_key(743)
+    kwargs = {
+        "compiled_banner": test_compiled_banner,
+        "session_criterion": "overboost",
+        "criterion_value": 1,
+        "starting_weapon_parts": 0,
+        "key": key,
+        "engine": engine,
+    }
+
+    whole = simulate_sessions(session_start=0, session_stop=300, **kwargs)
+    pieces = np.concatenate(
+        [
+            simulate_sessions(session_start=0, session_stop=120, **kwargs),
+            simulate_sessions(session_start=120, session_stop=300, **kwargs),
+        ]
+    )
+
+    assert np.array_equal(whole, pieces)
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="Numba is not installed")
+def test_jit_engine_matches_numpy_engine(test_compiled_banner):
+    """
+    The Numba kernel should reproduce the NumPy engine exactly.
+    """
+
+    key, _ = generate_session_key(743)
+    kwargs = {
+        "compiled_banner": test_compiled_banner,
+        "session_criterion": "overboost",
+        "criterion_value": 3,
+        "starting_weapon_parts": 35,
+        "session_start": 1_000,
+        "session_stop": 1_500,
+        "key": key,
+    }
+
+    assert np.array_equal(
+        simulate_sessions(engine="numpy", **kwargs),
+        simulate_sessions(engine="jit", **kwargs),
+    )
+
+
+def test_multinomial_engine_matches_numpy_engine_in_distribution(test_compiled_banner):
+    """
+    Sampling whole ten draws from the cached distributions should give the same mean outcome counts as
+    sampling every draw separately.
+    """
+
+    key, _ = generate_session_key(743)
+    kwargs = {
+        "compiled_banner": test_compiled_banner,
+        "session_criterion": "crystals_spent",
+        "criterion_value": 60_000,
+        "starting_weapon_parts": 0,
+        "session_start": 0,
+        "session_stop": 20_000,
+        "key": key,
+    }
+
+    numpy_data = simulate_sessions(engine="numpy", **kwargs)
+    multinomial_data = simulate_sessions(engine="multinomial", **kwargs)
+
+    standard_errors = np.sqrt(
+        (numpy_data.var(axis=0) + multinomial_data.var(axis=0)) / 20_000
+    )
+    differences = np.abs(numpy_data.mean(axis=0) - multinomial_data.mean(axis=0))
+
+    assert (differences <= 4 * standard_errors).all()
+
+
+def test_run_sims_compiled_engine_is_reproducible():
+    """
+    Seeded `run_sims` calls on a compiled engine should return identical results with the reference columns.
+    """
+
+    gacha_sim = GachaSim(
+        session_criterion="crystals_spent",
+        criterion_value=30_000,
+        target_weapon_type="wishlisted",
+        banner_info=AERITH_LUCIA_EASTER_BANNER,
+        seed_value=1337,
+        num_simulations=1_000,
+    )
+
+    gacha_sim.run_sims(n_jobs=1, engine="numpy")
+    first_results = gacha_sim.sim_results.copy()
+    gacha_sim.run_sims(n_jobs=1, engine="numpy")
+
+    assert first_results.columns.tolist() == SESSION_DATA_COLUMNS
+    assert len(first_results) == 1_000
+    assert first_results.equals(gacha_sim.sim_results)
+
+
+def test_untilted_importance_sampling_has_unit_weights(test_compiled_banner):
+    """
+    Without any tilt, importance sampling should weight every session by exactly 1.
+    """
+
+    key, _ = generate_session_key(743)
+
+    _, likelihood_ratios = simulate_weighted_sessions(
+        compiled_banner=test_compiled_banner,
+        session_criterion="crystals_spent",
+        criterion_value=15_000,
+        starting_weapon_parts=0,
+        session_start=0,
+        session_stop=200,
+        key=key,
+    )
+
+    assert np.allclose(likelihood_ratios, 1)
+
+
+def test_importance_sampling_matches_plain_sampling(test_compiled_banner):
+    """
+    A tilted, weighted estimate of P(at least 600 weapon parts after 21,000 crystals) should agree with
+    the plain Monte Carlo estimate.
+    """
+
+    key, _ = generate_session_key(743)
+    kwargs = {
+        "compiled_banner": test_compiled_banner,
+        "session_criterion": "crystals_spent",
+        "criterion_value": 21_000,
+        "starting_weapon_parts": 0,
+        "session_start": 0,
+        "key": key,
+    }
+
+    plain_data = simulate_sessions(session_stop=40_000, **kwargs)
+    plain_estimate = np.mean(plain_data[:, 0] >= 600)
+
+    tilted_data, likelihood_ratios = simulate_weighted_sessions(
+        session_stop=10_000, five_star_tilt=4, stamp_tilt=0.2, **kwargs
+    )
+    weighted_event = likelihood_ratios * (tilted_data[:, 0] >= 600)
+    tilted_estimate = weighted_event.mean()
+
+    standard_error = np.sqrt(
+        plain_estimate * (1 - plain_estimate) / 40_000
+        + weighted_event.var() / 10_000
+    )
+
+    assert likelihood_ratios.mean() == pytest.approx(1, abs=0.1)
+    assert abs(tilted_estimate - plain_estimate) < 4 * standard_error
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.classes.partial_result import PartialResult
+from ever_crisis_gacha_simulator.classes.compiled_banner import SESSION_DATA_COLUMNS
+from ever_crisis_gacha_simulator.sharding import (
+    merge_partial_results,
+    run_local_cluster,
+    run_shard,
+)
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+@pytest.fixture
+def gacha_sim():
+    gacha_sim = GachaSim(
+        session_criterion="crystals_spent",
+        criterion_value=21_000,
+        target_weapon_type="featured",
+        banner_info=CLOUD_GLENN_LIMIT_BREAK_BANNER,
+        seed_value=743,
+        num_simulations=5_000,
+    )
+    gacha_sim.run_sims(n_jobs=1, engine="numpy")
+
+    return gacha_sim
+
+
+@pytest.mark.parametrize("num_shards", [1, 3, 7])
+def test_merged_shards_match_single_machine_run(gacha_sim, num_shards):
+    """
+    Shards merged in any order should reproduce the single-machine sessions and their summary exactly.
+    """
+
+    shard_results = [
+        run_shard(shard_spec) for shard_spec in gacha_sim.generate_shard_specs(num_shards)
+    ]
+    merged = merge_partial_results(shard_results[::-1])
+
+    data = gacha_sim.sim_results.to_numpy()
+    single_machine = PartialResult.from_data(merged.config_hash, 0, len(data), data)
+
+    assert merged.is_complete(5_000)
+    assert np.array_equal(merged.sums, single_machine.sums)
+    assert np.array_equal(merged.sums_of_squares, single_machine.sums_of_squares)
+    for column in SESSION_DATA_COLUMNS:
+        for merged_array, single_array in zip(
+            merged.count_tables[column], single_machine.count_tables[column]
+        ):
+            assert np.array_equal(merged_array, single_array)
+
+    assert merged.variance("targeted_weapon_parts") == pytest.approx(
+        gacha_sim.sim_results["targeted_weapon_parts"].var()
+    )
+
+    sharded_sim = GachaSim(**{**gacha_sim.metadata})
+    sharded_sim.load_partial_result(merged)
+    assert sharded_sim.sim_results.equals(gacha_sim.sim_results)
+
+
+def test_merge_rejects_overlapping_and_foreign_results(gacha_sim):
+    """
+    Partial results should only merge when they share a configuration and cover disjoint sessions.
+    """
+
+    shard_spec = gacha_sim.generate_shard_specs(2)[0]
+    partial_result = run_shard(shard_spec)
+
+    with pytest.raises(ValueError):
+        partial_result.merge(partial_result)
+
+    other_seed = GachaSim(**{**gacha_sim.metadata, "seed_value": 744})
+    with pytest.raises(ValueError):
+        partial_result.merge(run_shard(other_seed.generate_shard_specs(2)[1]))
+
+
+def test_partial_results_survive_save_and_load(gacha_sim, tmp_path):
+    partial_result = run_shard(gacha_sim.generate_shard_specs(2)[1])
+    partial_result.save(tmp_path / "shard.npz")
+    loaded = PartialResult.load(tmp_path / "shard.npz")
+
+    assert loaded.config_hash == partial_result.config_hash
+    assert loaded.session_ranges == partial_result.session_ranges
+    assert loaded.to_dataframe().equals(partial_result.to_dataframe())
+
+
+def test_local_cluster_matches_single_machine_run(gacha_sim, tmp_path):
+    """
+    Worker processes sharing a task directory should produce the single-machine result.
+    """
+
+    merged = run_local_cluster(
+        gacha_sim.generate_shard_specs(6), tmp_path, num_workers=3, timeout=120
+    )
+
+    sharded_sim = GachaSim(**{**gacha_sim.metadata})
+    sharded_sim.load_partial_result(merged)
+
+    assert sharded_sim.sim_results.equals(gacha_sim.sim_results)
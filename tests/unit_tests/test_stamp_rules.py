@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+from ever_crisis_gacha_simulator.classes.compiled_banner import CompiledBanner, OUTCOME_NAMES
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.exact_solver import exact_parts_distributions
+from ever_crisis_gacha_simulator.stamp_rules import (
+    pool_category_probabilities,
+    split_outcome_name,
+    validate_rule_specs,
+)
+from ever_crisis_gacha_simulator.validation import compare_distributions
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+from ever_crisis_gacha_simulator.constants import *
+
+
+# A banner whose stamp cards use the rules that no released banner has used yet
+NEW_RULES_BANNER = {
+    "metadata": {
+        **AERITH_LUCIA_EASTER_BANNER["metadata"],
+        "name": "New Rules Banner",
+    },
+    "stamp_cards_list": {
+        "page_one": [
+            {"position": 4, "rule": "guaranteed_featured_four_star_draw"},
+            {"position": 8, "rule": "guaranteed_featured_four_star_draw"},
+        ],
+        "page_two": [
+            {"position": 6, "rule": "choose_one_five_star_draw"},
+        ],
+        "page_ex": [
+            {"position": 6, "rule": "guaranteed_four_star_draw"},
+            {"position": 12, "rule": "choose_one_five_star_draw"},
+        ],
+    },
+}
+
+
+@pytest.mark.parametrize("banner_info", [ZACK_FF9_CROSSOVER_BANNER, AERITH_LUCIA_EASTER_BANNER])
+@pytest.mark.parametrize("target_weapon_type", ["featured", "wishlisted"])
+def test_specs_reproduce_the_float_ranges_of_the_original_rules(banner_info, target_weapon_type):
+    """
+    The compiled specs of the original rules should match the float ranges their draws were defined by.
+    """
+
+    compiled_banner = CompiledBanner(banner_info, target_weapon_type)
+    rates = compiled_banner.target_weapon_rates_dict
+    five_star = OVERALL_RARITY_RATES_DICT["five_star"]
+    featured = target_weapon_type == "featured"
+
+    expected = {
+        "guaranteed_featured_five_star_draw": (
+            compiled_banner.outcome_probabilities(0, rates["five_star"])
+            if featured
+            else compiled_banner.outcome_probabilities(rates["five_star"], five_star)
+        ),
+        "guaranteed_five_star_draw": compiled_banner.outcome_probabilities(0, five_star),
+        "guaranteed_four_star_draw": compiled_banner.outcome_probabilities(0, 1, guaranteed_four_star=True),
+        "guaranteed_not_desired_five_star_draw": (
+            compiled_banner.outcome_probabilities(rates["five_star"], 2 * rates["five_star"])
+            if featured
+            else compiled_banner.outcome_probabilities(rates["five_star"], five_star)
+        ),
+    }
+
+    for rule, probabilities in expected.items():
+        assert np.allclose(compiled_banner.rule_outcome_probabilities(rule), probabilities, atol=1e-15)
+
+
+@pytest.mark.parametrize(
+    "pool, target_weapon_type, num_featured_weapons, expected",
+    [
+        ("featured", "featured", 2, {"targeted": 1.0}),
+        ("featured", "wishlisted", 2, {"nontargeted": 1.0}),
+        ("random_featured", "featured", 2, {"targeted": 0.5, "nontargeted_featured": 0.5}),
+        ("random_featured", "featured", 1, {"targeted": 1.0}),
+        ("other_featured", "featured", 1, {"nontargeted": 1.0}),
+        ("chosen", "wishlisted", 1, {"targeted": 1.0}),
+    ],
+)
+def test_pool_category_probabilities(pool, target_weapon_type, num_featured_weapons, expected):
+    assert pool_category_probabilities(pool, target_weapon_type, num_featured_weapons) == expected
+
+
+def test_every_outcome_name_splits_into_a_category_and_rarity():
+    assert [split_outcome_name(outcome) for outcome in OUTCOME_NAMES[:4]] == [
+        ("targeted", "five_star"),
+        ("targeted", "four_star"),
+        ("targeted", "three_star"),
+        ("nontargeted_featured", "five_star"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "rule_spec",
+    [
+        {"rarity": "six_star", "pool": "any"},
+        {"rarity": "five_star", "pool": "everything"},
+        {"rarity": "five_star"},
+    ],
+)
+def test_invalid_rule_specs(rule_spec):
+    validate_rule_specs()
+
+    with pytest.raises(ValueError):
+        validate_rule_specs({"new_rule": rule_spec})
+
+
+def test_new_rules_run_on_every_engine():
+    """
+    A banner built from new rules should run on the reference and compiled engines with the same distribution,
+    and the exact solver should agree with its simulations.
+    """
+
+    sims = {}
+    for engine, num_simulations in [("reference", 1_000), ("numpy", 20_000), ("multinomial", 20_000)]:
+        sims[engine] = GachaSim(
+            session_criterion="crystals_spent",
+            criterion_value=30_000,
+            target_weapon_type="featured",
+            banner_info=NEW_RULES_BANNER,
+            seed_value=743,
+            num_simulations=num_simulations,
+        )
+        sims[engine].run_sims(n_jobs=1, engine=engine, progress=False)
+
+    for engine in ["numpy", "multinomial"]:
+        assert compare_distributions(sims["reference"].sim_results, sims[engine].sim_results)["passed"].all()
+
+    # Every session reaches the first card's two guaranteed featured 4* draws within 30,000 crystals
+    assert (sims["numpy"].sim_results["targeted_four_stars_drawn"] >= 2).all()
+
+    distribution = exact_parts_distributions(
+        CompiledBanner(NEW_RULES_BANNER, "featured"), 10, max_weapon_parts=1_000
+    )[-1]
+    simulated = np.bincount(
+        np.minimum(sims["numpy"].sim_results["targeted_weapon_parts"], 1_000), minlength=1_001
+    ) / 20_000
+    assert np.abs(np.cumsum(distribution) - np.cumsum(simulated)).max() < 0.02
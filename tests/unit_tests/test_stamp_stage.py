@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from ever_crisis_gacha_simulator.classes.compiled_banner import (
+    CompiledBanner,
+    decode_rule_multiset_codes,
+)
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.sampling import SessionUniforms, generate_session_key
+from ever_crisis_gacha_simulator.stamp_stage import (
+    sample_stamp_block,
+    ten_draw_rule_codes,
+)
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+@pytest.fixture()
+def test_compiled_banner():
+    """
+    A `CompiledBanner` object to re-use across tests for the stamp stage.
+    """
+
+    return CompiledBanner(
+        banner_info=CLOUD_GLENN_LIMIT_BREAK_BANNER,
+        target_weapon_type="featured",
+    )
+
+
+def test_batch_rules_match_stamp_transitions(test_compiled_banner):
+    """
+    Rules computed up front from cumulative stamps should match stepping `stamp_transition()` one ten draw at a
+    time, including long sequences that repeat the EX card.
+    """
+
+    key, _ = generate_session_key(743)
+    session_uniforms = SessionUniforms(key, np.arange(2_000))
+    stamp_values, _ = sample_stamp_block(
+        test_compiled_banner, session_uniforms, np.arange(2_000), 0, 60
+    )
+
+    batch_rule_counts = decode_rule_multiset_codes(
+        ten_draw_rule_codes(test_compiled_banner, np.zeros(2_000, dtype=np.int64), stamp_values)
+    )
+
+    card_indices = np.zeros(2_000, dtype=np.int64)
+    card_values = np.zeros(2_000, dtype=np.int64)
+    for ten_draw_index in range(60):
+        rule_counts, card_indices, card_values = test_compiled_banner.stamp_transition(
+            card_indices, card_values, stamp_values[:, ten_draw_index]
+        )
+        assert np.array_equal(batch_rule_counts[:, ten_draw_index], rule_counts)
+
+
+@pytest.mark.parametrize("criterion_value", [0, 12, 41, 120])
+def test_stamp_sims_match_full_sessions(criterion_value):
+    """
+    Stamp-only sessions should reproduce the stamp and crystal columns of full sessions with the same seed.
+    """
+
+    kwargs = {
+        "session_criterion": "stamps_earned",
+        "criterion_value": criterion_value,
+        "target_weapon_type": "wishlisted",
+        "banner_info": CLOUD_GLENN_LIMIT_BREAK_BANNER,
+        "seed_value": 743,
+        "num_simulations": 3_000,
+    }
+
+    full_sim = GachaSim(**kwargs)
+    full_sim.run_sims(n_jobs=1, engine="numpy", progress=False)
+    stamp_sim = GachaSim(**kwargs)
+    stamp_sim.run_stamp_sims(n_jobs=1, progress=False)
+
+    assert stamp_sim.sim_results.equals(
+        full_sim.sim_results[["total_stamps_earned", "num_crystals_spent"]]
+    )
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from ever_crisis_gacha_simulator.classes.compiled_banner import CompiledBanner
+from ever_crisis_gacha_simulator.classes.state_outcome_cache import StateOutcomeCache
+from ever_crisis_gacha_simulator.exact_solver import exact_parts_distributions
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+@pytest.fixture(scope="module")
+def test_state_outcome_cache():
+    """
+    A `StateOutcomeCache` on the Zack/Sephiroth banner, shared across tests to keep its solver runs.
+    """
+
+    return StateOutcomeCache(ZACK_SEPHIROTH_LIMIT_BREAK_BANNER, "featured")
+
+
+def test_cache_matches_exact_solver_from_banner_start(test_state_outcome_cache):
+    """
+    From the start of the banner, the cache should give the exact solver's probabilities.
+    """
+
+    distributions = exact_parts_distributions(
+        CompiledBanner(ZACK_SEPHIROTH_LIMIT_BREAK_BANNER, "featured"), 20, 1_200, starting_weapon_parts=100
+    )
+
+    for overboost in range(6):
+        expected = distributions[20, (overboost + 1) * 200 :].sum()
+        assert test_state_outcome_cache.probability(0, 0, 100, 60_000, overboost) == pytest.approx(expected)
+
+
+def test_cache_matches_simulated_mid_banner_state(test_state_outcome_cache):
+    """
+    The exact odds of a mid-banner state should agree with simulated sessions starting from it.
+    """
+
+    probabilities = test_state_outcome_cache.overboost_probabilities("page_two", 7, 450, 15_000)
+    gacha_sim = test_state_outcome_cache.simulate(
+        "page_two", 7, 450, 15_000, num_simulations=20_000, seed_value=17, n_jobs=1
+    )
+    simulated_overboosts = gacha_sim.sim_results["targeted_weapon_parts"] // 200 - 1
+
+    for overboost in range(6):
+        simulated = (simulated_overboosts >= overboost).mean()
+        standard_error = np.sqrt(probabilities[overboost] * (1 - probabilities[overboost]) / 20_000)
+        assert abs(simulated - probabilities[overboost]) <= 4 * standard_error + 1e-9
+
+    assert (gacha_sim.sim_results["num_crystals_spent"] == 15_000).all()
+
+
+def test_cache_is_memoized(test_state_outcome_cache):
+    """
+    Repeated questions on a card state should reuse its solver, and repeated simulations the same run.
+    """
+
+    test_state_outcome_cache.probability("page_ex", 3, 0, 30_000, 2)
+    solver = test_state_outcome_cache.solvers[3 * 12 + 3]
+    num_ten_draws = solver.num_ten_draws
+
+    test_state_outcome_cache.probability("page_ex", 3, 700, 9_000, 4)
+    assert test_state_outcome_cache.solvers[3 * 12 + 3] is solver
+    assert solver.num_ten_draws == num_ten_draws
+
+    first_sim = test_state_outcome_cache.simulate(1, 7, 450, 6_000, num_simulations=1_000, n_jobs=1)
+    assert test_state_outcome_cache.simulate("page_two", 7, 450, 6_000, num_simulations=1_000, n_jobs=1) is first_sim
+
+
+def test_stamp_card_names_and_indices_agree(test_state_outcome_cache):
+    """
+    A stamp card given by its name should be the stamp card at its index.
+    """
+
+    np.testing.assert_array_equal(
+        test_state_outcome_cache.overboost_probabilities("page_two", 7, 450, 15_000),
+        test_state_outcome_cache.overboost_probabilities(1, 7, 450, 15_000),
+    )
+
+
+def test_weapon_parts_held_reach_goals(test_state_outcome_cache):
+    """
+    Overboost levels already reached with the weapon parts held should be certain, even without crystals.
+    """
+
+    probabilities = test_state_outcome_cache.overboost_probabilities(0, 0, 450, 0)
+
+    np.testing.assert_array_equal(probabilities[:2], [1.0, 1.0])
+    assert probabilities[2:].sum() == 0
+
+
+@pytest.mark.parametrize(
+    "state",
+    [("page_four", 0, 0, 3_000), (4, 0, 0, 3_000), (0, 12, 0, 3_000), (0, 0, -1, 3_000), (0, 0, 0, -3_000)],
+)
+def test_invalid_states(test_state_outcome_cache, state):
+    """
+    States outside the banner's stamp cards, or with negative weapon parts or crystals, should raise a ValueError.
+    """
+
+    with pytest.raises(ValueError):
+        test_state_outcome_cache.overboost_probabilities(*state)
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.summaries import (
+    parts_to_overboost,
+    summarize_sim_results,
+)
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+@pytest.mark.parametrize(
+    "weapon_parts, expected",
+    [(0, -1), (199, -1), (200, 0), (525, 1), (2_200, 10)],
+)
+def test_parts_to_overboost(weapon_parts, expected):
+    assert parts_to_overboost(weapon_parts) == expected
+    assert parts_to_overboost(np.array([weapon_parts]))[0] == expected
+
+
+def test_summary_matches_row_wise_statistics():
+    """
+    Every statistic of the summary table should match computing it directly over the rows.
+    """
+
+    gacha_sim = GachaSim(
+        session_criterion="crystals_spent",
+        criterion_value=30_000,
+        target_weapon_type="featured",
+        banner_info=AERITH_LUCIA_EASTER_BANNER,
+        seed_value=743,
+        num_simulations=5_000,
+    )
+    gacha_sim.run_sims(n_jobs=1, engine="numpy", progress=False)
+    sim_results = gacha_sim.sim_results
+
+    summary = gacha_sim.summary().set_index(["column", "statistic"])["value"]
+    overboost = parts_to_overboost(sim_results["targeted_weapon_parts"])
+
+    for column in sim_results.columns:
+        assert summary[column, "mean"] == pytest.approx(sim_results[column].mean())
+        assert summary[column, "std"] == pytest.approx(sim_results[column].std(ddof=0))
+        assert summary[column, "max"] == sim_results[column].max()
+        for percentile in [5, 25, 50, 75, 95]:
+            assert summary[column, f"p{percentile}"] == np.percentile(
+                sim_results[column], percentile, method="inverted_cdf"
+            )
+
+    assert summary["overboost", "p50"] == np.percentile(overboost, 50, method="inverted_cdf")
+    for level in range(11):
+        assert summary["overboost", f"P(OB >= {level})"] == pytest.approx(
+            gacha_sim.return_value_probability(
+                "targeted_weapon_parts", 200 * (level + 1), decimals=10
+            )
+        )
+
+
+def test_summary_weights_importance_sampled_results():
+    sim_results = pd.DataFrame(
+        {
+            "targeted_weapon_parts": [200, 400, 600, 800],
+            "likelihood_ratio": [0.5, 0.5, 2.0, 1.0],
+        }
+    )
+
+    summary = summarize_sim_results(sim_results, percentiles=[50]).set_index(
+        ["column", "statistic"]
+    )["value"]
+
+    assert "likelihood_ratio" not in summary.index.get_level_values("column")
+    assert summary["targeted_weapon_parts", "mean"] == pytest.approx(
+        (100 + 200 + 1_200 + 800) / 4
+    )
+    assert summary["targeted_weapon_parts", "p50"] == 600
+    assert summary["overboost", "P(OB >= 2)"] == pytest.approx(75)
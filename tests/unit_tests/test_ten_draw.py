@@ -310,6 +310,8 @@ def special_rule_acceptable_outputs_dict():
             "nontargeted_featured_five_star",
             "nontargeted_five_star",
         ],
+        "guaranteed_featured_four_star_draw": ["targeted_four_star"],
+        "choose_one_five_star_draw": ["targeted_five_star"],
     }
 
     for rule in stamp_card_rule_enum:
@@ -757,3 +759,41 @@ def test_draws_for_special_rules_not_desired_five_star_draw(
         non_featured_five_star_percent_rate=non_featured_five_star_percent_rate,
         special_rule_acceptable_outputs_dict=special_rule_acceptable_outputs_dict,
     )
+
+
+def test_draws_for_special_rules_featured_four_star_draw(
+    non_featured_five_star_percent_rate,
+    special_rule_test_inputs_df,
+    special_rule_acceptable_outputs_dict,
+):
+    """
+    Tests that, over a number of draws (given RNG), special draws for the 'guaranteed_featured_four_star_draw' rule are producing valid output.
+    """
+
+    special_rule = "guaranteed_featured_four_star_draw"
+
+    run_parameterized_special_rules_test(
+        special_rule=special_rule,
+        special_rule_test_inputs_df=special_rule_test_inputs_df,
+        non_featured_five_star_percent_rate=non_featured_five_star_percent_rate,
+        special_rule_acceptable_outputs_dict=special_rule_acceptable_outputs_dict,
+    )
+
+
+def test_draws_for_special_rules_choose_one_five_star_draw(
+    non_featured_five_star_percent_rate,
+    special_rule_test_inputs_df,
+    special_rule_acceptable_outputs_dict,
+):
+    """
+    Tests that, over a number of draws (given RNG), special draws for the 'choose_one_five_star_draw' rule are producing valid output.
+    """
+
+    special_rule = "choose_one_five_star_draw"
+
+    run_parameterized_special_rules_test(
+        special_rule=special_rule,
+        special_rule_test_inputs_df=special_rule_test_inputs_df,
+        non_featured_five_star_percent_rate=non_featured_five_star_percent_rate,
+        special_rule_acceptable_outputs_dict=special_rule_acceptable_outputs_dict,
+    )
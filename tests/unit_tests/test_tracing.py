@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from ever_crisis_gacha_simulator.classes.gacha_sim import GachaSim
+from ever_crisis_gacha_simulator.tracing import (
+    TRACE_COLUMNS,
+    TRACE_RECORD_BYTES,
+    trace_to_dataframe,
+)
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+@pytest.fixture()
+def test_gacha_sim():
+    """
+    A `GachaSim` object to re-use across tests for tracing.
+    """
+
+    return GachaSim(
+        session_criterion="overboost",
+        criterion_value=2,
+        target_weapon_type="featured",
+        banner_info=ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        seed_value=743,
+        num_simulations=5_000,
+    )
+
+
+@pytest.mark.parametrize("engine", ["numpy", "multinomial"])
+def test_traces_replay_the_run(test_gacha_sim, engine):
+    """
+    Every traced session should add up to the session data of the run it was replayed from.
+    """
+
+    test_gacha_sim.run_sims(n_jobs=1, engine=engine, progress=False)
+    traces = test_gacha_sim.trace_sessions(num_traces=25, seed=743)
+
+    assert len(traces) == 25
+    for session_index, trace in traces.items():
+        session = test_gacha_sim.sim_results.iloc[session_index]
+        outcome_counts = [(trace[:, -10:] == outcome).sum() for outcome in range(9)]
+
+        assert trace.dtype == np.uint8 and trace.shape[1] == TRACE_RECORD_BYTES
+        assert len(trace) * 3_000 == session["num_crystals_spent"]
+        assert trace[:, 0].sum() == session["total_stamps_earned"]
+        np.testing.assert_array_equal(outcome_counts, session.iloc[3:].to_numpy())
+        np.testing.assert_array_equal(
+            12 * trace[:, 1].astype(int) + trace[:, 2], np.cumsum(trace[:, 0])
+        )
+
+
+def test_trace_selection_respects_predicate_and_budget(test_gacha_sim):
+    test_gacha_sim.run_sims(n_jobs=1, engine="numpy", progress=False)
+    sim_results = test_gacha_sim.sim_results
+    threshold = sim_results["num_crystals_spent"].quantile(0.99)
+
+    traces = test_gacha_sim.trace_sessions(
+        num_traces=1_000,
+        predicate=lambda df: df["num_crystals_spent"] >= threshold,
+        max_bytes=5_000,
+        seed=743,
+    )
+
+    assert traces
+    assert sum(trace.nbytes for trace in traces.values()) <= 5_000
+    assert (sim_results["num_crystals_spent"].iloc[list(traces)] >= threshold).all()
+
+
+def test_trace_to_dataframe(test_gacha_sim):
+    test_gacha_sim.run_sims(n_jobs=1, engine="numpy", progress=False)
+    trace = next(iter(test_gacha_sim.trace_sessions(num_traces=1, seed=743).values()))
+
+    trace_df = trace_to_dataframe(trace)
+
+    assert list(trace_df.columns) == TRACE_COLUMNS
+    assert set(trace_df["draw_1_outcome"].cat.categories) >= {"targeted_five_star"}
+
+
+def test_tracing_requires_a_compiled_run(test_gacha_sim):
+    test_gacha_sim.metadata["num_simulations"] = 10
+    test_gacha_sim.run_sims(n_jobs=1, engine="reference", progress=False)
+
+    with pytest.raises(ValueError):
+        test_gacha_sim.trace_sessions()
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from ever_crisis_gacha_simulator.validation import (
+    chi_square_goodness_of_fit,
+    chi_square_p_value,
+    compare_distributions,
+    exact_distribution,
+    kolmogorov_smirnov_two_sample,
+    run_engine,
+    validate_engine,
+)
+from ever_crisis_gacha_simulator.banner_info_and_stamp_cards import *
+
+
+# Small configurations, so the reference engine finishes quickly
+TEST_CONFIGS = {
+    "aerith_9k_featured": {
+        "session_criterion": "crystals_spent",
+        "criterion_value": 9_000,
+        "target_weapon_type": "featured",
+        "banner_info": AERITH_LUCIA_EASTER_BANNER,
+    },
+    "zack_ob0_wishlisted": {
+        "session_criterion": "overboost",
+        "criterion_value": 0,
+        "target_weapon_type": "wishlisted",
+        "banner_info": ZACK_SEPHIROTH_LIMIT_BREAK_BANNER,
+        "starting_weapon_parts": 150,
+    },
+}
+
+
+@pytest.mark.parametrize(
+    "statistic, degrees_of_freedom, expected",
+    [(0.0, 4, 1.0), (2.0, 2, np.exp(-1)), (3.841458820694124, 1, 0.05), (18.307038053275146, 10, 0.05)],
+)
+def test_chi_square_p_value(statistic, degrees_of_freedom, expected):
+    assert chi_square_p_value(statistic, degrees_of_freedom) == pytest.approx(expected)
+
+
+def test_kolmogorov_smirnov_two_sample():
+    rng = np.random.default_rng(743)
+
+    assert kolmogorov_smirnov_two_sample(rng.normal(size=2_000), rng.normal(size=1_000))["p_value"] > 1e-3
+    assert kolmogorov_smirnov_two_sample(rng.normal(size=2_000), rng.normal(0.3, size=1_000))["p_value"] < 1e-6
+
+
+@pytest.mark.parametrize("engine", ["numpy", "multinomial"])
+def test_engines_pass_validation(engine):
+    """
+    The compiled engines should match the reference engine and the exact solver at reduced sizes.
+    """
+
+    validation = validate_engine(
+        engine, configs=TEST_CONFIGS, num_simulations=3_000, reference_num_simulations=500
+    )
+    tests = validation["tests"]
+
+    assert tests["passed"].all(), tests[~tests["passed"]]
+    assert set(tests["test"]) == {"chi_square", "ks", "exact"}
+    assert len(validation["timings"]) == 2 * len(TEST_CONFIGS)
+    assert (validation["timings"]["sessions_per_second"] > 0).all()
+
+
+def test_validation_detects_a_different_distribution():
+    """
+    A run of the wrong target weapon type should fail the distribution and exact tests.
+    """
+
+    featured_sim, _ = run_engine(
+        {**TEST_CONFIGS["aerith_9k_featured"], "target_weapon_type": "wishlisted"}, "numpy", 5_000, 743
+    )
+    reference_sim, _ = run_engine(TEST_CONFIGS["aerith_9k_featured"], "numpy", 5_000, 744)
+
+    comparison = compare_distributions(reference_sim.sim_results, featured_sim.sim_results)
+    column, support, probabilities = exact_distribution(reference_sim.metadata)
+
+    assert not comparison.set_index(["column", "test"])["passed"]["targeted_weapon_parts"].any()
+    assert chi_square_goodness_of_fit(
+        featured_sim.sim_results[column].to_numpy(), support, probabilities
+    )["p_value"] < 1e-6